@@ -0,0 +1,72 @@
+"""
+Memory benchmark: bytes per customer record, before and after ``__slots__``.
+
+The "before" layout is a dict-backed replica of the original customer class,
+which stored ``env``, ``restaurant`` and ``config`` on every instance.
+
+Usage:
+    python -m benchmarks.customer_memory [--customers N]
+"""
+
+import argparse
+import tracemalloc
+from typing import Callable, List
+
+import simpy
+
+from src.config import Config
+from src.customer import InHouseCustomer
+from src.restaurant import Restaurant
+
+
+class DictBackedCustomer:
+    """Replica of the original dict-backed customer layout."""
+
+    def __init__(self, env, id, restaurant, arrival_time, config):
+        self.env = env
+        self.id = id
+        self.restaurant = restaurant
+        self.arrival_time = arrival_time
+        self.config = config
+        self.order_time = None
+        self.cook_time = None
+        self.service_time = None
+
+
+def bytes_per_customer(factory: Callable[[int], object], customers: int) -> float:
+    """Measure the traced allocation per customer built by ``factory``."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    records: List[object] = [factory(i) for i in range(customers)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return (after - before) / customers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", "-n", type=int, default=100_000)
+    args = parser.parse_args()
+
+    env = simpy.Environment()
+    config = Config()
+    restaurant = Restaurant(env, config)
+
+    def dict_backed(i: int) -> object:
+        return DictBackedCustomer(env, i, restaurant, i * 0.5, config)
+
+    def slotted(i: int) -> object:
+        return InHouseCustomer(env, i, restaurant, i * 0.5, config)
+
+    before = bytes_per_customer(dict_backed, args.customers)
+    after = bytes_per_customer(slotted, args.customers)
+
+    print(f"Customers allocated: {args.customers:,}")
+    print(f"  Dict-backed customer: {before:7.1f} bytes/customer")
+    print(f"  Slotted customer:     {after:7.1f} bytes/customer")
+    print(f"  Saving:               {(1 - after / before) * 100:6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Scaling benchmark: simulator throughput and memory along each workload axis.
+
+Each axis is varied on its own from a base point (a 480 minute shift, a
+customer every 5 minutes, one replication, one worker): the simulated
+duration up to a month, the interarrival time down to 0.05 minutes, the
+replication count and the worker count. Every point runs in a fresh process,
+so its peak RSS is its own, and its time is the best of a few repeats.
+
+Results are compared with a JSON baseline, and a point whose customers or
+events per second drop, or whose peak RSS grows, by more than the tolerance
+is flagged as a regression (exit status 1). Timings only compare on the same
+machine, so record a baseline with ``--save`` before starting performance
+work and check against it afterwards.
+
+Usage:
+    python -m benchmarks.scaling [--quick] [--axis AXIS ...] [--repeats N]
+        [--tolerance FRACTION] [--baseline PATH] [--save]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.config import RunConfig
+from src.profiling import peak_memory_bytes
+from src.simulation import SimulationRunner
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "scaling.json")
+DEFAULT_TOLERANCE = 0.25
+
+MONTH = 30 * 24 * 60
+
+# Values per axis; the first value of each is the base point
+AXES: Dict[str, Sequence[float]] = {
+    "duration": (480, 2880, 10080, MONTH),
+    "interarrival_time": (5, 1, 0.5, 0.1, 0.05),
+    "replications": (1, 10, 50),
+    "workers": (1, 2, 4),
+}
+QUICK_AXES: Dict[str, Sequence[float]] = {
+    "duration": (480, 2880),
+    "interarrival_time": (5, 0.5),
+    "replications": (1, 10),
+    "workers": (1, 2),
+}
+
+# Replications run by every point of the worker axis
+WORKER_AXIS_REPLICATIONS = 20
+
+# Short points are repeated until they have run for at least this long
+MIN_SECONDS = 0.5
+
+# Higher is better for the throughputs, lower for memory
+THROUGHPUT_KEYS = ("customers_per_second", "events_per_second")
+MEMORY_KEYS = ("peak_rss",)
+
+
+def run_point(axis: str, value: float, repeats: int) -> Dict[str, Any]:
+    """
+    Time one point of an axis (in the calling process) and measure its memory.
+
+    The point is run at least ``repeats`` times, and for at least
+    ``MIN_SECONDS`` in all, on the same seed; the fastest run counts. There
+    is no warm-up deletion, so every customer served counts.
+    """
+    duration = int(value) if axis == "duration" else AXES["duration"][0]
+    interarrival = (
+        value if axis == "interarrival_time" else AXES["interarrival_time"][0]
+    )
+    replications = int(value) if axis == "replications" else 1
+    workers = int(value) if axis == "workers" else 1
+    if axis == "workers":
+        replications = WORKER_AXIS_REPLICATIONS
+
+    config = RunConfig(
+        sim_duration=duration, interarrival_time=interarrival, warm_up_time=0
+    )
+    runner = SimulationRunner(config)
+    best = float("inf")
+    runs = 0
+    total = 0.0
+    while runs < repeats or total < MIN_SECONDS:
+        start = time.perf_counter()
+        if replications == 1:
+            all_metrics = [runner.run_simulation(seed=1)[1]]
+        else:
+            all_metrics = runner.run_multiple_simulations(
+                replications, workers=workers, seed=1
+            )
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        runs += 1
+
+    customers = sum(m["total_customers_served"] for m in all_metrics)
+    events = sum(m["scheduled_events"] for m in all_metrics)
+    return {
+        "axis": axis,
+        "value": value,
+        "seconds": best,
+        "customers": customers,
+        "customers_per_second": customers / best,
+        "events_per_second": events / best,
+        # Worker processes are children; report whichever peaked higher
+        "peak_rss": max(peak_memory_bytes(), peak_memory_bytes(children=True)),
+    }
+
+
+def run_isolated(axis: str, value: float, repeats: int) -> Dict[str, Any]:
+    """Run a point in a fresh process, so the peak RSS is the point's own."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_point, axis, value, repeats).result()
+
+
+def run_suite(axes: Dict[str, Sequence[float]], repeats: int) -> List[Dict[str, Any]]:
+    """Run every point of the given axes, printing each as it finishes."""
+    results = []
+    for axis, values in axes.items():
+        for value in values:
+            result = run_isolated(axis, value, repeats)
+            label = f"{axis}={value:g}"
+            print(
+                f"  {label:<24} {result['seconds']:8.3f} s  "
+                f"{result['customers_per_second']:>10,.0f} customers/s  "
+                f"{result['events_per_second']:>10,.0f} events/s  "
+                f"{result['peak_rss'] / 2**20:7.1f} MiB"
+            )
+            results.append(result)
+    return results
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Return a description of every regression against the baseline.
+
+    Points missing from the baseline are not compared.
+    """
+    reference = {(b["axis"], b["value"]): b for b in baseline}
+    regressions = []
+    for result in results:
+        base = reference.get((result["axis"], result["value"]))
+        if base is None:
+            continue
+        point = f"{result['axis']}={result['value']:g}"
+        for key in THROUGHPUT_KEYS:
+            if result[key] < base[key] * (1 - tolerance):
+                regressions.append(
+                    f"{point}: {key} {result[key]:,.0f} < baseline {base[key]:,.0f}"
+                )
+        for key in MEMORY_KEYS:
+            if result[key] > base[key] * (1 + tolerance):
+                regressions.append(
+                    f"{point}: {key} {result[key]:,} > baseline {base[key]:,}"
+                )
+    return regressions
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """Load a baseline file (None if there is none)."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path} is not a version {BASELINE_VERSION} baseline")
+    return baseline
+
+
+def save_baseline(path: str, results: List[Dict[str, Any]], repeats: int) -> None:
+    """Write the results as the new baseline."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    baseline = {
+        "version": BASELINE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeats": repeats,
+        "results": results,
+    }
+    with open(path, "w") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2)
+        baseline_file.write("\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--quick", action="store_true", help="Run two values per axis only"
+    )
+    parser.add_argument(
+        "--axis",
+        action="append",
+        choices=list(AXES),
+        help="Axis to run (repeatable; default: all)",
+    )
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save", action="store_true", help="Write the results as the new baseline"
+    )
+    args = parser.parse_args()
+
+    axes = QUICK_AXES if args.quick else AXES
+    if args.axis:
+        axes = {axis: axes[axis] for axis in args.axis}
+
+    print(f"Scaling benchmark (best of {args.repeats}):")
+    results = run_suite(axes, args.repeats)
+
+    if args.save:
+        save_baseline(args.baseline, results, args.repeats)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save to create one")
+        return
+    if baseline["platform"] != platform.platform():
+        print(
+            f"Note: the baseline was recorded on {baseline['platform']}; "
+            "re-record it with --save on this machine for a fair comparison"
+        )
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%} of the baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"No regressions beyond {args.tolerance:.0%} of the baseline")
+
+
+if __name__ == "__main__":
+    main()
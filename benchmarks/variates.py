@@ -0,0 +1,70 @@
+"""
+Throughput benchmark: block-prefetched NumPy variates against scalar draws.
+
+Compares drawing variates one at a time with ``random.uniform`` and
+``random.expovariate`` (the original hot-path calls) against the block
+supplies, then times a whole simulation run in each mode.
+
+Usage:
+    python -m benchmarks.variates [--draws N] [--duration MINUTES]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from src.config import Config
+from src.random_streams import RandomStreams
+from src.simulation import SimulationRunner
+from src.variates import Variates
+
+
+def draws_per_second(draw: Callable[[], float], draws: int) -> float:
+    """Time ``draws`` calls of ``draw``."""
+    start = time.perf_counter()
+    for _ in range(draws):
+        draw()
+    return draws / (time.perf_counter() - start)
+
+
+def run_seconds(config: Config, duration: int) -> float:
+    """Time one seeded simulation run."""
+    start = time.perf_counter()
+    SimulationRunner(config).run_simulation(duration=duration, seed=1)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--draws", "-n", type=int, default=1_000_000)
+    parser.add_argument("--duration", "-d", type=int, default=480 * 60)
+    args = parser.parse_args()
+
+    config = Config()
+    rng = random.Random(1)
+    block = Variates(RandomStreams(1), config)
+
+    print(f"Variate draws ({args.draws:,} per supply):")
+    for label, scalar, supply in [
+        ("uniform", lambda: rng.uniform(3, 7), block.cook_time),
+        ("exponential", lambda: rng.expovariate(0.2), block.interarrival),
+    ]:
+        scalar_rate = draws_per_second(scalar, args.draws)
+        block_rate = draws_per_second(supply, args.draws)
+        print(
+            f"  {label:<12} scalar {scalar_rate / 1e6:6.2f} M/s, "
+            f"block {block_rate / 1e6:6.2f} M/s "
+            f"({block_rate / scalar_rate:.2f}x)"
+        )
+
+    scalar_config = Config()
+    scalar_config.variate_block_size = 0
+    scalar_time = run_seconds(scalar_config, args.duration)
+    block_time = run_seconds(config, args.duration)
+    print(f"Simulation run ({args.duration} minutes):")
+    print(f"  scalar {scalar_time:.3f} s, block {block_time:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
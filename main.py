@@ -6,11 +6,30 @@ with configurable parameters.
 """
 
 import argparse
+import os
 import sys
 import unittest
+from contextlib import ExitStack
 
-from src.config import Config
-from src.simulation import SimulationRunner
+import numpy as np
+
+from src.analytic import AnalyticEstimator, timed_estimate
+from src.cache import ResultCache
+from src.campaign import DEFAULT_CAMPAIGN_DIR
+from src.config import WARM_UP_METHODS, Config
+from src.optimize import StaffingOptimizer
+from src.service import DEFAULT_HOST, DEFAULT_PORT, SimulationServer, SimulationService
+from src.simulation import ENGINES, MIN_BATCHES, SimulationRunner
+from src.sweep import (
+    OUTPUT_FORMATS,
+    SWEEP_METRICS,
+    ParameterSweep,
+    RowWriter,
+    output_format_for,
+    parse_axis,
+)
+from src.timeseries import DEFAULT_CAPACITY
+from src.trace import TraceRecorder
 
 
 def run_tests():
@@ -33,9 +52,8 @@ def run_tests():
         return False
 
 
-def run_simulation(args):
-    """Run the restaurant simulation with specified parameters."""
-    # Create configuration
+def build_config(args):
+    """Build a configuration from the shared command line arguments."""
     config = Config()
 
     # Override config with command line arguments
@@ -47,18 +65,216 @@ def run_simulation(args):
         config.kitchen_servers = args.kitchen_servers
     if args.counter_servers:
         config.counter_servers = args.counter_servers
-    if args.runs:
+    if getattr(args, "runs", None):
         config.num_runs = args.runs
+    if args.warm_up is not None:
+        config.warm_up_time = args.warm_up
+    config.warm_up_method = args.warm_up_method
+    config.admission_control = args.admission_control
+    if args.patience is not None:
+        config.patience = args.patience
+
+    return config
+
+
+def build_cache(args):
+    """Open the result cache named on the command line, if any."""
+    if not args.cache:
+        return None
+    return ResultCache(args.cache, max_bytes=int(args.cache_size * 1024 * 1024))
+
+
+def run_estimate(args):
+    """Print the analytic estimate, optionally validated by simulation."""
+    config = build_config(args)
+    estimator = AnalyticEstimator(config)
+
+    estimate, elapsed = timed_estimate(config)
+    estimator.print_estimate(estimate, elapsed)
+
+    if args.validate:
+        rows = estimator.validate(args.runs, seed=args.seed, workers=args.workers)
+        estimator.print_validation(rows)
+
+
+def run_sweep(args):
+    """Run a parameter sweep and stream one row per grid point."""
+    axes = dict(parse_axis(spec) for spec in args.param)
+    sweep = ParameterSweep(
+        axes,
+        build_config(args),
+        num_runs=args.runs,
+        metrics=args.metric or SWEEP_METRICS,
+    )
+    output_format = args.format or output_format_for(args.output)
+
+    with ExitStack() as stack:
+        if args.output == "-":
+            stream = sys.stdout
+        else:
+            stream = stack.enter_context(open(args.output, "w", newline=""))
+        writer = RowWriter(stream, output_format)
+        rows = 0
+        cache = build_cache(args)
+        for row in sweep.run(
+            workers=args.workers, seed=args.seed, engine=args.engine, cache=cache
+        ):
+            writer.write(row)
+            rows += 1
+
+    # Keep stdout clean when the rows go there
+    report = sys.stderr if args.output == "-" else sys.stdout
+    if args.output != "-":
+        print(f"Wrote {rows} grid points to {args.output}", file=report)
+    if cache is not None:
+        stats = cache.stats()
+        print(
+            f"Cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['evictions']} evictions",
+            file=report,
+        )
+
+
+def run_optimize(args):
+    """Search for the cheapest staffing that keeps waits under the limit."""
+    staff_ranges = dict(
+        parse_axis(f"{key}={values}")
+        for key, values in [
+            ("kitchen_servers", args.kitchen),
+            ("counter_servers", args.counter),
+            ("driver_capacity", args.drivers),
+        ]
+    )
+    optimizer = StaffingOptimizer(
+        staff_ranges,
+        {
+            "kitchen_servers": args.kitchen_cost,
+            "counter_servers": args.counter_cost,
+            "driver_capacity": args.driver_cost,
+        },
+        args.max_wait,
+        build_config(args),
+        metric=args.metric,
+        confidence=args.confidence,
+        initial_runs=args.initial_runs,
+        max_runs=args.max_runs,
+    )
+    optimizer.optimize(
+        workers=args.workers,
+        seed=args.seed,
+        engine=args.engine,
+        cache=build_cache(args),
+        verbose=True,
+    )
+
+
+def run_serve(args):
+    """Answer simulation requests over HTTP until interrupted."""
+    service = SimulationService(workers=args.workers, cache=build_cache(args))
+    server = SimulationServer(service, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"Serving simulations on http://{host}:{port} with {args.workers} workers")
+    print("POST /simulate, GET /health; press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def check_simulation_args(parser, args):
+    """Reject option combinations the simulation would fail on."""
+    if args.target_halfwidth is not None and args.target_halfwidth <= 0:
+        parser.error("--target-halfwidth must be positive")
+    if args.max_runs < 1:
+        parser.error("--max-runs must be at least 1")
+    if args.batch_means is not None:
+        if args.engine != "simpy":
+            parser.error("--batch-means runs on the simpy engine")
+        if args.batch_means < MIN_BATCHES:
+            parser.error(f"--batch-means needs at least {MIN_BATCHES} batches")
+
+
+def run_simulation(args):
+    """Run the restaurant simulation with specified parameters."""
+    config = build_config(args)
 
     # Create and run simulation
-    runner = SimulationRunner(config)
+    runner = SimulationRunner(config, engine=args.engine, cache=build_cache(args))
 
-    if args.runs and args.runs > 1:
-        # Run multiple simulations
-        runner.run_multiple_simulations(args.runs, verbose=True)
+    if args.profile or args.cprofile or args.tracemalloc:
+        # One in-process run, measuring where the time and events go
+        runner.profile_simulation(
+            args.duration,
+            seed=args.seed,
+            cprofile_path=args.cprofile,
+            tracemalloc_path=args.tracemalloc,
+            verbose=True,
+        )
+    elif args.batch_means is not None:
+        # One long run split into batches after a single warm-up
+        runner.run_batch_means(args.batch_means, seed=args.seed, verbose=True)
+    elif args.target_halfwidth is not None:
+        # Run until the confidence interval is tight enough
+        runner.run_multiple_simulations(
+            verbose=True,
+            workers=args.workers,
+            seed=args.seed,
+            target_half_width=args.target_halfwidth,
+            metric=args.metric,
+            max_runs=args.max_runs,
+            trace_dir=args.trace,
+        )
+    elif args.campaign:
+        # Log every finished run, skipping those logged by an earlier start
+        runner.run_campaign(
+            args.campaign,
+            args.runs,
+            verbose=True,
+            workers=args.workers,
+            seed=args.seed,
+            directory=args.campaign_dir,
+        )
+    elif (args.runs and args.runs > 1) or args.engine == "vectorized":
+        # Run multiple simulations (the vectorized engine always runs a batch)
+        runner.run_multiple_simulations(
+            args.runs,
+            verbose=True,
+            workers=args.workers,
+            seed=args.seed,
+            trace_dir=args.trace,
+        )
     else:
         # Run single simulation
-        runner.run_simulation(args.duration, verbose=True)
+        capacity = DEFAULT_CAPACITY if args.time_series else 0
+        with ExitStack() as stack:
+            trace = None
+            if args.trace:
+                trace = stack.enter_context(TraceRecorder(args.trace, run_number=1))
+            restaurant, _ = runner.run_simulation(
+                args.duration,
+                verbose=True,
+                seed=args.seed,
+                trace=trace,
+                time_series_capacity=capacity,
+            )
+        if args.time_series:
+            save_time_series(args.time_series, restaurant.get_time_series())
+
+
+def save_time_series(path, series):
+    """Save per-station time series arrays as ``<station>_<array>`` in an .npz."""
+    np.savez(
+        path,
+        **{
+            f"{station}_{name}": values
+            for station, arrays in series.items()
+            for name, values in arrays.items()
+        },
+    )
+    print(f"Time series for {', '.join(series)} saved to {path}")
 
 
 def main():
@@ -73,36 +289,97 @@ def main():
     # Test command
     subparsers.add_parser("test", help="Run the test suite")
 
-    # Simulation command
-    sim_parser = subparsers.add_parser("simulate", help="Run the restaurant simulation")
-    sim_parser.add_argument(
+    # Configuration options shared by the simulate and estimate commands
+    config_parser = argparse.ArgumentParser(add_help=False)
+    config_parser.add_argument(
         "--duration",
         "-d",
         type=int,
         default=480,
         help="Simulation duration in minutes (default: 480)",
     )
-    sim_parser.add_argument(
+    config_parser.add_argument(
         "--arrival-rate",
         "-a",
         type=float,
         default=5.0,
         help="Average customer arrival interval in minutes (default: 5.0)",
     )
-    sim_parser.add_argument(
+    config_parser.add_argument(
         "--kitchen-servers",
         "-k",
         type=int,
         default=2,
         help="Number of kitchen servers (default: 2)",
     )
-    sim_parser.add_argument(
+    config_parser.add_argument(
         "--counter-servers",
         "-c",
         type=int,
         default=1,
         help="Number of counter servers (default: 1)",
     )
+    config_parser.add_argument(
+        "--warm-up",
+        type=float,
+        default=None,
+        help=f"Minutes discarded at the start of each run (default: "
+        f"{Config.warm_up_time})",
+    )
+    config_parser.add_argument(
+        "--warm-up-method",
+        choices=WARM_UP_METHODS,
+        default=Config.warm_up_method,
+        help="Delete a fixed warm-up or pick the cut-off per run with MSER-5 "
+        f"(default: {Config.warm_up_method})",
+    )
+    config_parser.add_argument(
+        "--admission-control",
+        action="store_true",
+        help="Turn customers away when the kitchen or counter queue is full",
+    )
+    config_parser.add_argument(
+        "--patience",
+        type=float,
+        default=None,
+        help="Minutes a customer waits in any one queue before leaving "
+        "(default: unlimited)",
+    )
+    config_parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=1,
+        help="Number of worker processes for multiple runs (default: 1)",
+    )
+    config_parser.add_argument(
+        "--seed",
+        "-s",
+        type=int,
+        default=None,
+        help="Random seed for reproducible runs (default: random)",
+    )
+
+    # Result cache options shared by the simulate and sweep commands
+    cache_parser = argparse.ArgumentParser(add_help=False)
+    cache_parser.add_argument(
+        "--cache",
+        default=None,
+        help="Directory of a result cache to reuse seeded replications from",
+    )
+    cache_parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=256,
+        help="Result cache size limit in MiB (default: 256)",
+    )
+
+    # Simulation command
+    sim_parser = subparsers.add_parser(
+        "simulate",
+        parents=[config_parser, cache_parser],
+        help="Run the restaurant simulation",
+    )
     sim_parser.add_argument(
         "--runs",
         "-r",
@@ -110,6 +387,245 @@ def main():
         default=1,
         help="Number of simulation runs (default: 1)",
     )
+    sim_parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="simpy",
+        help="Replication engine (default: simpy)",
+    )
+    sim_parser.add_argument(
+        "--trace",
+        default=None,
+        help="Directory to write a columnar customer trace to (one per run)",
+    )
+    sim_parser.add_argument(
+        "--time-series",
+        default=None,
+        metavar="PATH",
+        help="Save per-station queue and in-system time series of a single "
+        "run to a NumPy .npz file",
+    )
+    sim_parser.add_argument(
+        "--campaign",
+        default=None,
+        metavar="ID",
+        help="Log each finished run under this campaign ID and, if restarted, "
+        "resume from the log",
+    )
+    sim_parser.add_argument(
+        "--campaign-dir",
+        default=DEFAULT_CAMPAIGN_DIR,
+        help=f"Directory of campaign logs (default: {DEFAULT_CAMPAIGN_DIR})",
+    )
+    sim_parser.add_argument(
+        "--target-halfwidth",
+        type=float,
+        default=None,
+        help="Run until the 95%% CI half-width of --metric is at most this",
+    )
+    sim_parser.add_argument(
+        "--metric",
+        default="average_wait_time",
+        help="Metric for --target-halfwidth (default: average_wait_time)",
+    )
+    sim_parser.add_argument(
+        "--max-runs",
+        type=int,
+        default=1000,
+        help="Run cap for --target-halfwidth (default: 1000)",
+    )
+    sim_parser.add_argument(
+        "--batch-means",
+        type=int,
+        default=None,
+        metavar="BATCHES",
+        help="Estimate steady state from one long run split into this many "
+        "batches of --duration minus the warm-up",
+    )
+    sim_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile a single run: wall-clock time, events per second and "
+        "per customer, time per customer stage and peak memory",
+    )
+    sim_parser.add_argument(
+        "--cprofile",
+        default=None,
+        metavar="PATH",
+        help="Profile a single run and dump cProfile statistics to PATH",
+    )
+    sim_parser.add_argument(
+        "--tracemalloc",
+        default=None,
+        metavar="PATH",
+        help="Profile a single run and dump a tracemalloc snapshot to PATH",
+    )
+
+    # Analytic estimate command
+    estimate_parser = subparsers.add_parser(
+        "estimate",
+        parents=[config_parser],
+        help="Estimate performance instantly with queueing approximations",
+    )
+    estimate_parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Compare the estimate against simulation runs",
+    )
+    estimate_parser.add_argument(
+        "--runs",
+        "-r",
+        type=int,
+        default=20,
+        help="Number of simulation runs for --validate (default: 20)",
+    )
+
+    # Parameter sweep command
+    sweep_parser = subparsers.add_parser(
+        "sweep",
+        parents=[config_parser, cache_parser],
+        help="Run replications over a grid of configurations",
+    )
+    sweep_parser.add_argument(
+        "--param",
+        "-p",
+        action="append",
+        required=True,
+        help=(
+            "Config key and values to sweep, as key=1,2,4 or key=start:stop[:step] "
+            "(repeat for a grid)"
+        ),
+    )
+    sweep_parser.add_argument(
+        "--runs",
+        "-r",
+        type=int,
+        default=10,
+        help="Replications per grid point (default: 10)",
+    )
+    sweep_parser.add_argument(
+        "--metric",
+        action="append",
+        default=None,
+        help="Metric to aggregate (repeatable; default: the main metrics)",
+    )
+    sweep_parser.add_argument(
+        "--output",
+        "-o",
+        default="-",
+        help="File to stream rows to, '-' for stdout (default: -)",
+    )
+    sweep_parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=None,
+        help="Output format (default: from the file name, csv otherwise)",
+    )
+    sweep_parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="simpy",
+        help="Replication engine (default: simpy)",
+    )
+
+    # Staffing optimization command
+    optimize_parser = subparsers.add_parser(
+        "optimize",
+        parents=[config_parser, cache_parser],
+        help="Find the cheapest staffing that keeps waits under a limit",
+    )
+    optimize_parser.add_argument(
+        "--max-wait",
+        type=float,
+        required=True,
+        help="Limit on the mean of --metric, in minutes",
+    )
+    optimize_parser.add_argument(
+        "--kitchen",
+        default="1:4",
+        help="Kitchen servers to try, as a list or start:stop (default: 1:4)",
+    )
+    optimize_parser.add_argument(
+        "--counter",
+        default="1:3",
+        help="Counter servers to try, as a list or start:stop (default: 1:3)",
+    )
+    optimize_parser.add_argument(
+        "--drivers",
+        default="10",
+        help="Driver capacities to try, as a list or start:stop (default: 10)",
+    )
+    optimize_parser.add_argument(
+        "--kitchen-cost",
+        type=float,
+        default=1.0,
+        help="Cost per kitchen server (default: 1.0)",
+    )
+    optimize_parser.add_argument(
+        "--counter-cost",
+        type=float,
+        default=1.0,
+        help="Cost per counter server (default: 1.0)",
+    )
+    optimize_parser.add_argument(
+        "--driver-cost",
+        type=float,
+        default=0.1,
+        help="Cost per driver (default: 0.1)",
+    )
+    optimize_parser.add_argument(
+        "--metric",
+        default="average_wait_time",
+        help="Metric the limit applies to (default: average_wait_time)",
+    )
+    optimize_parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence needed to call a candidate (default: 0.95)",
+    )
+    optimize_parser.add_argument(
+        "--initial-runs",
+        type=int,
+        default=10,
+        help="Pilot replications per candidate (default: 10)",
+    )
+    optimize_parser.add_argument(
+        "--max-runs",
+        type=int,
+        default=200,
+        help="Replication cap per candidate (default: 200)",
+    )
+    optimize_parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="simpy",
+        help="Replication engine (default: simpy)",
+    )
+
+    # Simulation service command
+    serve_parser = subparsers.add_parser(
+        "serve",
+        parents=[cache_parser],
+        help="Answer simulation requests over HTTP with a warm worker pool",
+    )
+    serve_parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Address to listen on (default: {DEFAULT_HOST})",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on, 0 for any free port (default: {DEFAULT_PORT})",
+    )
+    serve_parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes kept warm (default: number of CPUs)",
+    )
 
     # Parse arguments
     args = parser.parse_args()
@@ -119,7 +635,16 @@ def main():
         success = run_tests()
         sys.exit(0 if success else 1)
     elif args.command == "simulate":
+        check_simulation_args(sim_parser, args)
         run_simulation(args)
+    elif args.command == "estimate":
+        run_estimate(args)
+    elif args.command == "sweep":
+        run_sweep(args)
+    elif args.command == "optimize":
+        run_optimize(args)
+    elif args.command == "serve":
+        run_serve(args)
     else:
         # Default behavior - run a single simulation
         print("Restaurant Simulation")
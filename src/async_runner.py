@@ -0,0 +1,244 @@
+"""
+Asyncio counterparts of the simulation runner's entry points.
+
+``SimulationRunner`` blocks the calling thread for the whole run, which
+stalls an event loop. ``AsyncSimulationRunner`` offloads every replication to
+a bounded executor (a process pool by default) and awaits it, so the loop
+keeps serving other work::
+
+    async with AsyncSimulationRunner(config, max_workers=4) as runner:
+        async with aclosing(runner.iter_replications(100, seed=1)) as results:
+            async for metrics in results:
+                ...  # show progress, or break to stop early
+
+At most ``max_concurrency`` replications are handed to the executor at a
+time across all calls on the runner, so a large study does not flood the
+executor's queue and can be cancelled cheaply: cancelling the awaiting task
+(or leaving the iterator) cancels the replications that have not started.
+Replications already running in a worker process finish in the background
+and their results are discarded.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Set, Union
+
+from .cache import ResultCache, result_key
+from .config import ConfigLike, run_config
+from .random_streams import RandomStreams
+from .simulation import ReplicationTask, SimulationRunner, _run_replication
+
+Metrics = Dict[str, Union[int, float]]
+
+
+def _run_single(
+    config: ConfigLike, fused_journeys: bool, duration: int, seed: Optional[int]
+) -> Metrics:
+    """
+    Run one simulation in a worker, as ``SimulationRunner.run_simulation`` does.
+
+    Defined at module level so it can be pickled to worker processes.
+    """
+    runner = SimulationRunner(config, fused_journeys)
+    return runner.run_simulation(duration, seed=seed)[1]
+
+
+class AsyncSimulationRunner:
+    """
+    Runs simulations on a bounded executor without blocking the event loop.
+
+    Attributes:
+        runner (SimulationRunner): Runner whose config, journeys and cache are
+            used
+        max_workers (int): Worker processes of the default executor
+        max_concurrency (int): Replications handed to the executor at a time
+    """
+
+    def __init__(
+        self,
+        config: Optional[Union[ConfigLike, SimulationRunner]] = None,
+        max_workers: int = 1,
+        max_concurrency: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Initialize the runner; the worker pool starts on first use.
+
+        Args:
+            config: Simulation configuration, or a ``SimulationRunner`` to take
+                the configuration, journey mode and result cache from
+            max_workers: Worker processes of the default executor
+            max_concurrency: Replications handed to the executor at a time
+                (defaults to ``max_workers``)
+            executor: Executor to run on instead of a process pool (it is not
+                shut down by ``close``)
+        """
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        max_concurrency = max_concurrency or max_workers
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}"
+            )
+        if isinstance(config, SimulationRunner):
+            self.runner = config
+        else:
+            self.runner = SimulationRunner(config)
+        if self.runner.engine != "simpy":
+            raise ValueError("the async runner supports the simpy engine only")
+
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def cache(self) -> Optional[ResultCache]:
+        """Result cache of the wrapped runner."""
+        return self.runner.cache
+
+    async def __aenter__(self) -> "AsyncSimulationRunner":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Shut the worker pool down once its running replications finish."""
+        if self._owns_executor and self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def run_simulation(
+        self, duration: Optional[int] = None, seed: Optional[int] = None
+    ) -> Metrics:
+        """
+        Run a single simulation, like ``SimulationRunner.run_simulation``.
+
+        The run happens in a worker, so only its metrics come back, not the
+        restaurant.
+
+        Args:
+            duration: Simulation duration in minutes (uses config default if None)
+            seed: Master seed for the run's random streams (random if None)
+
+        Returns:
+            Metrics dictionary of the run
+        """
+        config = run_config(self.runner.config)
+        duration = duration or config.sim_duration
+        # As in the blocking runner, only seeded runs go through the cache
+        key = None
+        if seed is not None:
+            key = result_key(
+                config,
+                RandomStreams(seed).seed,
+                False,
+                "simpy",
+                duration,
+                self.runner.fused_journeys,
+            )
+        return await self._cached(
+            key, _run_single, config, self.runner.fused_journeys, duration, seed
+        )
+
+    async def run_multiple_simulations(
+        self, num_runs: Optional[int] = None, seed: Optional[int] = None
+    ) -> List[Metrics]:
+        """
+        Run several replications, like ``SimulationRunner.run_multiple_simulations``.
+
+        Args:
+            num_runs: Number of simulation runs (uses config default if None)
+            seed: Master seed for the runs (a random one is drawn if None)
+
+        Returns:
+            List of metrics dictionaries from each run, ordered by run number
+            (equal to the blocking runner's for the same seed)
+        """
+        all_metrics = [
+            metrics async for metrics in self.iter_replications(num_runs, seed)
+        ]
+        return sorted(all_metrics, key=lambda metrics: metrics["run_number"])
+
+    async def iter_replications(
+        self, num_runs: Optional[int] = None, seed: Optional[int] = None
+    ) -> AsyncGenerator[Metrics, None]:
+        """
+        Yield the metrics of each replication as soon as it completes.
+
+        Results come in completion order; their ``run_number`` tells which
+        run they belong to. Leaving the iterator early (best with
+        ``contextlib.aclosing``) cancels the replications not yet started.
+
+        Args:
+            num_runs: Number of simulation runs (uses config default if None)
+            seed: Master seed for the runs (a random one is drawn if None)
+        """
+        config = run_config(self.runner.config)
+        num_runs = num_runs or config.num_runs
+        # Draw the master seed up front so every replication spawns from it
+        seed = RandomStreams(seed).seed
+        tasks = iter(
+            ReplicationTask(
+                config, seed, run_number, fused_journeys=self.runner.fused_journeys
+            )
+            for run_number in range(1, num_runs + 1)
+        )
+
+        pending: Set["asyncio.Task[Metrics]"] = set()
+        try:
+            # Keep a window of replications going rather than one task per run
+            for task in tasks:
+                pending.add(asyncio.ensure_future(self._replicate(task)))
+                if len(pending) >= self.max_concurrency:
+                    break
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in tasks:
+                    pending.add(asyncio.ensure_future(self._replicate(task)))
+                    if len(pending) >= self.max_concurrency:
+                        break
+                for finished in sorted(done, key=lambda f: f.result()["run_number"]):
+                    yield finished.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _replicate(self, task: ReplicationTask) -> Metrics:
+        """Run one replication in the executor, through the result cache."""
+        streams = RandomStreams(task.seed).spawn(task.run_number)
+        key = result_key(
+            task.config,
+            streams.seed,
+            task.antithetic,
+            "simpy",
+            fused_journeys=task.fused_journeys,
+        )
+        return await self._cached(key, _run_replication, task)
+
+    async def _cached(
+        self, key: Optional[str], function: Callable[..., Metrics], *args: Any
+    ) -> Metrics:
+        """Return a cached result, or compute it in the executor and cache it."""
+        if key is not None and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        async with self._slots:
+            metrics = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), function, *args
+            )
+        if key is not None and self.cache is not None:
+            self.cache.put(key, metrics)
+        return metrics
+
+    def _get_executor(self) -> Executor:
+        """Return the executor, starting the default process pool if needed."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        return self._executor
@@ -0,0 +1,194 @@
+"""
+Content-addressed on-disk cache of per-replication metrics.
+
+Each replication's metrics are stored as a small JSON file named by a SHA-256
+hash of everything that determines the result: the configuration values, the
+run length, the seed of the replication's random streams, antithetic mode,
+the engine and the model version. Repeating a study or a sweep with some
+points unchanged then only simulates the replications that are new.
+
+The cache is bounded in size and evicts the least recently used entries; a
+hit refreshes the entry's modification time, which doubles as its last-use
+time, so the order survives between processes.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .config import config_values
+
+# Bump whenever a model change alters simulated results, invalidating old entries
+MODEL_VERSION = 5
+
+# Config keys that do not affect a single replication's result
+IGNORED_KEYS = ("num_runs",)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def result_key(
+    config: Any,
+    stream_seed: int,
+    antithetic: bool = False,
+    engine: str = "simpy",
+    duration: Optional[int] = None,
+    fused_journeys: bool = True,
+) -> str:
+    """
+    Return the cache key of one replication.
+
+    Args:
+        config: Configuration the replication runs with
+        stream_seed: Seed of the replication's random streams
+        antithetic: Whether the replication draws antithetic variates
+        engine: Engine that simulates the replication
+        duration: Run length if it overrides the configured one
+        fused_journeys: Whether each customer runs as one SimPy process (the
+            staged journeys schedule different events, so their metrics
+            differ)
+    """
+    values = config_values(config)
+    for key in IGNORED_KEYS:
+        values.pop(key, None)
+    if duration is not None:
+        values["sim_duration"] = duration
+
+    identity = {
+        "config": values,
+        "seed": stream_seed,
+        "antithetic": antithetic,
+        "engine": engine,
+        "fused_journeys": fused_journeys,
+        "model_version": MODEL_VERSION,
+    }
+    encoded = json.dumps(identity, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of replication metrics in a directory.
+
+    Attributes:
+        path (str): The cache directory
+        max_bytes (int): Size above which least recently used entries go
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that found nothing
+        evictions (int): Entries removed to stay within ``max_bytes``
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Open a cache directory, creating it if needed.
+
+        Args:
+            path: The cache directory
+            max_bytes: Size above which least recently used entries go
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(path, exist_ok=True)
+        entries = []
+        for directory, _, files in os.walk(path):
+            for name in files:
+                if name.endswith(".json"):
+                    status = os.stat(os.path.join(directory, name))
+                    entries.append((status.st_mtime, name[:-5], status.st_size))
+        # key -> size in bytes, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict(
+            (key, size) for _, key, size in sorted(entries)
+        )
+        self._size = sum(self._index.values())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached entries."""
+        return self._size
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached metrics for ``key``, or None on a miss."""
+        if key not in self._index:
+            self.misses += 1
+            return None
+        try:
+            with open(self._entry_path(key)) as entry:
+                metrics = json.load(entry)
+            os.utime(self._entry_path(key))
+        except (OSError, ValueError):
+            # Removed or corrupted behind our back
+            self._forget(key)
+            self.misses += 1
+            return None
+
+        self._index.move_to_end(key)
+        self.hits += 1
+        return metrics
+
+    def put(self, key: str, metrics: Dict[str, Any]) -> None:
+        """Store the metrics of one replication, evicting if over the limit."""
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+        # Write to a temporary file first so readers never see half an entry
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(entry_path), suffix=".tmp"
+        )
+        with os.fdopen(descriptor, "w") as entry:
+            json.dump(metrics, entry)
+        os.replace(temporary_path, entry_path)
+
+        self._forget(key)
+        self._index[key] = os.path.getsize(entry_path)
+        self._size += self._index[key]
+        self._evict(keep=key)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for key in list(self._index):
+            self._remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters and size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "size_bytes": self._size,
+        }
+
+    def _evict(self, keep: str) -> None:
+        """Remove least recently used entries until within the size limit."""
+        for key in list(self._index):
+            if self._size <= self.max_bytes:
+                break
+            if key != keep:
+                self._remove(key)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        try:
+            os.remove(self._entry_path(key))
+        except FileNotFoundError:
+            pass
+        self._forget(key)
+
+    def _forget(self, key: str) -> None:
+        self._size -= self._index.pop(key, 0)
+
+    def _entry_path(self, key: str) -> str:
+        # Two-character fan-out keeps directories small
+        return os.path.join(self.path, key[:2], f"{key}.json")
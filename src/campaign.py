@@ -0,0 +1,209 @@
+"""
+Durable, append-only logs of replication campaigns.
+
+A long study keeps its results in memory until the last replication is done,
+so a crash loses all of it. A campaign instead appends every finished
+replication's metrics, with the config hash, seed and run number, to a JSON
+Lines file named after the campaign ID, and forces each line to disk before
+going on. Started again with the same ID, the campaign reads the log back and
+only runs the replications missing from it; since every replication draws
+from its own substreams, the final results are identical to an uninterrupted
+run.
+
+The first line of the log is a header recording what the campaign runs. A
+restart whose config, seed, engine, journey mode or model version differs
+is refused rather than mixing results of two studies. A last line cut short
+by a crash is dropped and overwritten. Only one process may run a campaign
+at a time.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, Optional, Union
+
+from .cache import IGNORED_KEYS, MODEL_VERSION
+from .config import DEFAULT_CONFIG, RunConfig
+from .random_streams import RandomStreams
+
+DEFAULT_CAMPAIGN_DIR = "campaigns"
+
+# Campaign IDs name files, so they are kept to portable file name characters
+CAMPAIGN_ID_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+# Header fields that must match for a campaign to be resumed
+IDENTITY_KEYS = ("config_hash", "seed", "engine", "fused_journeys", "model_version")
+
+Metrics = Dict[str, Union[int, float]]
+
+
+def config_hash(config: RunConfig) -> str:
+    """SHA-256 of the settings that determine a replication's result."""
+    # Settings such as the run count are reset to their defaults, not hashed
+    ignored = {key: getattr(DEFAULT_CONFIG, key) for key in IGNORED_KEYS}
+    return config.replace(**ignored).digest()
+
+
+def campaign_path(directory: str, campaign_id: str) -> str:
+    """Path of a campaign's log file."""
+    if not CAMPAIGN_ID_PATTERN.fullmatch(campaign_id):
+        raise ValueError(
+            f"invalid campaign ID {campaign_id!r}; use letters, digits, '.', "
+            "'_' and '-'"
+        )
+    return os.path.join(directory, f"{campaign_id}.jsonl")
+
+
+class CampaignLog:
+    """
+    Append-only log of the replications a campaign has finished.
+
+    Attributes:
+        path (str): Log file
+        campaign_id (str): Name of the campaign
+        seed (Optional[int]): Master seed of the campaign, known once opened
+        completed (Dict[int, Metrics]): Metrics logged so far, by run number
+    """
+
+    def __init__(self, directory: str, campaign_id: str) -> None:
+        """
+        Name the log; nothing is read or written until ``open``.
+
+        Args:
+            directory: Directory holding campaign logs
+            campaign_id: Name of the campaign
+        """
+        self.path = campaign_path(directory, campaign_id)
+        self.campaign_id = campaign_id
+        self.seed: Optional[int] = None
+        self.completed: Dict[int, Metrics] = {}
+        self._config_hash: Optional[str] = None
+        self._file: Any = None
+
+    def __enter__(self) -> "CampaignLog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def open(
+        self,
+        config: RunConfig,
+        seed: Optional[int] = None,
+        engine: str = "simpy",
+        fused_journeys: bool = True,
+    ) -> None:
+        """
+        Create the log, or read back the replications of an earlier start.
+
+        Args:
+            config: Configuration the campaign runs with
+            seed: Master seed (when resuming, None takes the logged one; a
+                new campaign draws a random one)
+            engine: Engine simulating the replications
+            fused_journeys: Whether each customer runs as one SimPy process
+
+        Raises:
+            ValueError: If the log belongs to a different study or is corrupt
+        """
+        header: Dict[str, Any] = {
+            "campaign": self.campaign_id,
+            "config_hash": config_hash(config),
+            "seed": seed,
+            "engine": engine,
+            "fused_journeys": fused_journeys,
+            "model_version": MODEL_VERSION,
+            "config": config.as_dict(),
+        }
+        logged = self._resume(header) if os.path.exists(self.path) else None
+        if logged is not None:
+            header = logged
+        else:
+            header["seed"] = RandomStreams(seed).seed
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self.path, "w")
+            self._write(header)
+            self._sync_directory()
+        self.seed = header["seed"]
+        self._config_hash = header["config_hash"]
+
+    def append(self, metrics: Metrics) -> None:
+        """
+        Log a finished replication and force it to disk.
+
+        Args:
+            metrics: Metrics of the replication, including its ``run_number``
+        """
+        if self._file is None:
+            raise ValueError("the campaign log is not open")
+        run_number = int(metrics["run_number"])
+        self._write(
+            {
+                "config_hash": self._config_hash,
+                "seed": self.seed,
+                "run_number": run_number,
+                "metrics": metrics,
+            }
+        )
+        self.completed.setdefault(run_number, metrics)
+
+    def close(self) -> None:
+        """Close the log file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _resume(self, header: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Read an existing log and reopen it to append.
+
+        Returns:
+            The logged header, or None if the log was cut short before its
+            header was complete (the campaign then starts afresh)
+        """
+        with open(self.path, "rb") as log_file:
+            lines = log_file.read().split(b"\n")
+        # Anything after the last newline is a record cut short by a crash
+        tail = lines.pop()
+        if not lines:
+            return None
+        records = [json.loads(line) for line in lines]
+
+        logged = records[0]
+        for key in IDENTITY_KEYS:
+            if header[key] is None:
+                continue
+            if logged.get(key) != header[key]:
+                raise ValueError(
+                    f"campaign {self.campaign_id!r} was started with a different "
+                    f"{key} ({logged.get(key)!r}); use a new campaign ID"
+                )
+        for record in records[1:]:
+            if record["config_hash"] != logged["config_hash"]:
+                raise ValueError(f"{self.path} holds results of another config")
+            # The first result logged for a run wins; later ones are repeats
+            self.completed.setdefault(record["run_number"], record["metrics"])
+
+        self._file = open(self.path, "r+")
+        if tail:
+            self._file.truncate(os.path.getsize(self.path) - len(tail))
+        self._file.seek(0, os.SEEK_END)
+        return logged
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Append one line and wait until it is on disk."""
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _sync_directory(self) -> None:
+        """Make the new log's directory entry durable too (POSIX only)."""
+        if not hasattr(os, "O_DIRECTORY"):  # pragma: no cover - Windows
+            return
+        descriptor = os.open(
+            os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY | os.O_DIRECTORY
+        )
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
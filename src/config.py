@@ -1,57 +1,98 @@
-from typing import Any, Dict, List
+import dataclasses
+import hashlib
+import json
+import logging
+import math
+from typing import Any, Dict, Union, cast
 
+from src.variates import config_distributions
 
-class Config:
+logger = logging.getLogger(__name__)
+
+# Warm-up deletion: a fixed cut-off (warm_up_time) or MSER-5 chosen per run
+WARM_UP_METHODS = ("fixed", "mser5")
+
+# Settings that must be positive, at least 1, or at least 0
+POSITIVE_KEYS = (
+    "interarrival_time",
+    "kitchen_service_time",
+    "counter_service_time",
+    "mean_order_time",
+    "mean_cook_time",
+    "mean_service_time",
+    "sim_duration",
+    "patience",
+)
+COUNT_KEYS = ("kitchen_servers", "counter_servers", "driver_capacity", "num_runs")
+NON_NEGATIVE_KEYS = (
+    "kitchen_queue_size",
+    "counter_queue_size",
+    "warm_up_time",
+    "variate_block_size",
+)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RunConfig:
     """
-    Configuration settings for the fast food restaurant simulation.
+    Immutable, validated configuration of a simulation run.
+
+    Frozen and slotted, so it is hashable, cheap to pickle to worker processes
+    and safe to share between concurrent runs. Variants are derived with
+    ``replace()``; ``digest()`` is a hash that is stable across processes.
 
     Attributes:
-        interarrival_time (int): The average interarrival time for customers.
-        kitchen_service_time (int): The average service time for customers at the kitchen station.
-        counter_service_time (int): The average service time for customers at the counter station.
+        interarrival_time (float): The average interarrival time for customers.
+        kitchen_service_time (float): The average service time for customers at the kitchen station.
+        counter_service_time (float): The average service time for customers at the counter station.
         kitchen_servers (int): The number of servers at the kitchen station.
         counter_servers (int): The number of servers at the counter station.
         kitchen_queue_size (int): The maximum queue size at the kitchen station.
         counter_queue_size (int): The maximum queue size at the counter station.
-        warm_up_time (int): The warm-up time for the simulation.
+        admission_control (bool): Whether customers balk at any full queue they would join.
+        patience (float): Minutes a customer waits in any one queue before reneging.
+        warm_up_time (float): The warm-up time for the simulation.
+        warm_up_method (str): How the warm-up is deleted ("fixed" or "mser5").
         sim_duration (int): The duration of the simulation.
         num_runs (int): The number of simulation runs to perform.
-        kitchen_wait_times (List[int]): List of kitchen wait times for each simulation run.
-        kitchen_queue_lengths (List[int]): List of kitchen queue lengths for each simulation run.
-        counter_wait_times (List[int]): List of counter wait times for each simulation run.
-        counter_queue_lengths (List[int]): List of counter queue lengths for each simulation run.
         mean_order_time (float): The average time it takes a customer to place an order.
         mean_cook_time (float): The average time it takes to cook a customer's food.
-        mean_serve_time (float): The average time it takes to serve a customer's food.
+        mean_service_time (float): The average time it takes to serve a customer's food.
         driver_capacity (int): The number of external drivers available.
+        interarrival_distribution (str): Distribution of interarrival times.
+        order_time_distribution (str): Distribution of order-taking times.
+        cook_time_distribution (str): Distribution of cooking times.
+        service_time_distribution (str): Distribution of serving times.
+        variate_block_size (int): Variates generated per NumPy block (0 draws one at a time).
     """
 
     # Interarrival time for customers
-    interarrival_time: int = 5
+    interarrival_time: float = 5
 
     # Mean service times for each station (in minutes)
-    kitchen_service_time: int = 3
-    counter_service_time: int = 1
+    kitchen_service_time: float = 3
+    counter_service_time: float = 1
 
     # Number of servers at each station
     kitchen_servers: int = 2
     counter_servers: int = 1
 
-    # Maximum queue size for each station
+    # Maximum queue size for each station, enforced with admission control
+    # whenever a customer joins the station's queue (the counter limit bounds
+    # both the order taker and the server)
     kitchen_queue_size: int = 5
     counter_queue_size: int = 3
+    admission_control: bool = False
+
+    # Minutes a customer waits in each queue before leaving (inf: never)
+    patience: float = math.inf
 
     # Simulation run metrics
-    warm_up_time: int = 60
+    warm_up_time: float = 60
+    warm_up_method: str = "fixed"  # or "mser5" to pick the cut-off per run
     sim_duration: int = 480
     num_runs: int = 50
 
-    # Placeholders to track wait times and queue lengths
-    kitchen_wait_times: List[float] = []
-    kitchen_queue_lengths: List[int] = []
-    counter_wait_times: List[float] = []
-    counter_queue_lengths: List[int] = []
-
     # Mean times for each step of customer service
     mean_order_time: float = 2
     mean_cook_time: float = 5
@@ -60,24 +101,199 @@ class Config:
     # Number of external drivers available
     driver_capacity: int = 10  # Adjust as needed
 
+    # Distributions as "name" or "name:sd" (uniform, exponential, lognormal, gamma)
+    interarrival_distribution: str = "exponential"
+    order_time_distribution: str = "uniform"
+    cook_time_distribution: str = "uniform"
+    service_time_distribution: str = "uniform"
+
+    # Random variates generated per NumPy block
+    variate_block_size: int = 1024
+
+    def __post_init__(self) -> None:
+        """
+        Validate the values.
+
+        Raises:
+            ValueError: If a value has the wrong type or is out of range, or a
+                distribution is invalid
+        """
+        for field in dataclasses.fields(self):
+            value = getattr(self, field.name)
+            kind = cast(type, field.type)
+            # Numbers may be given as int or float; bool is not taken as one
+            expected = (int, float) if kind in (int, float) else kind
+            if not isinstance(value, expected) or (
+                isinstance(value, bool) and kind is not bool
+            ):
+                raise ValueError(
+                    f"{field.name} must be a {kind.__name__}, got {value!r}"
+                )
+        for key in POSITIVE_KEYS:
+            if not getattr(self, key) > 0:
+                raise ValueError(f"{key} must be positive, got {getattr(self, key)}")
+        for key in COUNT_KEYS:
+            value = getattr(self, key)
+            if value < 1 or not math.isfinite(value) or value != int(value):
+                raise ValueError(f"{key} must be a whole number >= 1, got {value}")
+        for key in NON_NEGATIVE_KEYS:
+            if getattr(self, key) < 0:
+                raise ValueError(
+                    f"{key} must not be negative, got {getattr(self, key)}"
+                )
+        if self.warm_up_method not in WARM_UP_METHODS:
+            raise ValueError(
+                f"unknown warm-up method {self.warm_up_method!r}, "
+                f"expected one of {WARM_UP_METHODS}"
+            )
+        config_distributions(self)
+
+    def replace(self, **changes: Any) -> "RunConfig":
+        """
+        Return a validated copy with some values changed.
+
+        Raises:
+            ValueError: If a key is unknown or a new value is invalid
+        """
+        unknown = set(changes) - set(CONFIG_KEYS)
+        if unknown:
+            raise ValueError(f"unknown config keys {sorted(unknown)}")
+        return dataclasses.replace(self, **changes)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the configuration values as a dictionary."""
+        return {key: getattr(self, key) for key in CONFIG_KEYS}
+
+    def digest(self) -> str:
+        """SHA-256 of the values, the same in every process and session."""
+        encoded = json.dumps(self.as_dict(), sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+
+CONFIG_KEYS = tuple(field.name for field in dataclasses.fields(RunConfig))
+
+DEFAULT_CONFIG = RunConfig()
+
+
+class Config:
+    """
+    Mutable configuration for scripts and the command line, over ``RunConfig``.
+
+    Settings read the ``RunConfig`` defaults until they are assigned, on the
+    class or on an instance. Values are validated when the config is frozen
+    with ``freeze()``, which the runner does before every run, so runs never
+    see a config change under them. The settings are the ``RunConfig``
+    fields, one for one.
+    """
+
+    interarrival_time: float = DEFAULT_CONFIG.interarrival_time
+    kitchen_service_time: float = DEFAULT_CONFIG.kitchen_service_time
+    counter_service_time: float = DEFAULT_CONFIG.counter_service_time
+    kitchen_servers: int = DEFAULT_CONFIG.kitchen_servers
+    counter_servers: int = DEFAULT_CONFIG.counter_servers
+    kitchen_queue_size: int = DEFAULT_CONFIG.kitchen_queue_size
+    counter_queue_size: int = DEFAULT_CONFIG.counter_queue_size
+    admission_control: bool = DEFAULT_CONFIG.admission_control
+    patience: float = DEFAULT_CONFIG.patience
+    warm_up_time: float = DEFAULT_CONFIG.warm_up_time
+    warm_up_method: str = DEFAULT_CONFIG.warm_up_method
+    sim_duration: int = DEFAULT_CONFIG.sim_duration
+    num_runs: int = DEFAULT_CONFIG.num_runs
+    mean_order_time: float = DEFAULT_CONFIG.mean_order_time
+    mean_cook_time: float = DEFAULT_CONFIG.mean_cook_time
+    mean_service_time: float = DEFAULT_CONFIG.mean_service_time
+    driver_capacity: int = DEFAULT_CONFIG.driver_capacity
+    interarrival_distribution: str = DEFAULT_CONFIG.interarrival_distribution
+    order_time_distribution: str = DEFAULT_CONFIG.order_time_distribution
+    cook_time_distribution: str = DEFAULT_CONFIG.cook_time_distribution
+    service_time_distribution: str = DEFAULT_CONFIG.service_time_distribution
+    variate_block_size: int = DEFAULT_CONFIG.variate_block_size
+
+    def __init__(self, **values: Any) -> None:
+        """
+        Create a config, optionally overriding some settings.
+
+        Args:
+            values: Settings to override, by ``RunConfig`` field name
+        """
+        for key, value in values.items():
+            setattr(self, key, value)
+
     @classmethod
     def get_config(cls) -> Dict[str, Any]:
         """
         Returns the configuration values as a dictionary.
         """
-        return {
-            "interarrival_time": cls.interarrival_time,
-            "kitchen_service_time": cls.kitchen_service_time,
-            "counter_service_time": cls.counter_service_time,
-            "kitchen_servers": cls.kitchen_servers,
-            "counter_servers": cls.counter_servers,
-            "kitchen_queue_size": cls.kitchen_queue_size,
-            "counter_queue_size": cls.counter_queue_size,
-            "warm_up_time": cls.warm_up_time,
-            "sim_duration": cls.sim_duration,
-            "num_runs": cls.num_runs,
-            "mean_order_time": cls.mean_order_time,
-            "mean_cook_time": cls.mean_cook_time,
-            "mean_service_time": cls.mean_service_time,
-            "driver_capacity": cls.driver_capacity,
-        }
+        return {key: getattr(cls, key) for key in CONFIG_KEYS}
+
+    def freeze(self) -> RunConfig:
+        """
+        Returns the current values as a validated ``RunConfig``.
+
+        Raises:
+            ValueError: If a setting is unknown or a value is invalid
+        """
+        unknown = set(vars(self)) - set(CONFIG_KEYS)
+        if unknown:
+            raise ValueError(f"unknown config keys {sorted(unknown)}")
+        return RunConfig(**config_values(self))
+
+
+# Anything the simulation accepts as a configuration
+ConfigLike = Union[Config, RunConfig]
+
+
+def config_values(config: Any) -> Dict[str, Any]:
+    """
+    Returns the configuration values of a config object as a dictionary.
+
+    Unlike ``Config.get_config()`` this reads the object itself, so values
+    overridden on an instance are included; keys the object lacks fall back
+    to the ``Config`` defaults.
+    """
+    return {
+        key: getattr(config, key, default)
+        for key, default in Config.get_config().items()
+    }
+
+
+def run_config(config: Any) -> RunConfig:
+    """
+    Returns a config as a validated ``RunConfig`` (itself if it already is one).
+
+    Raises:
+        ValueError: If a value is invalid
+    """
+    if isinstance(config, RunConfig):
+        return config
+    if isinstance(config, Config):
+        return config.freeze()
+    return RunConfig(**config_values(config))
+
+
+def fixed_warm_up(config: Any, duration: float) -> float:
+    """
+    Returns the fixed warm-up cut-off of a run (0 when MSER-5 picks it).
+
+    A run no longer than the warm-up keeps everything, with a warning.
+
+    Raises:
+        ValueError: If the warm-up method is unknown or the warm-up is negative
+    """
+    method = config.warm_up_method
+    if method not in WARM_UP_METHODS:
+        raise ValueError(
+            f"unknown warm-up method {method!r}, expected one of {WARM_UP_METHODS}"
+        )
+    if method == "mser5":
+        return 0.0
+    warm_up = config.warm_up_time
+    if warm_up < 0:
+        raise ValueError(f"warm_up_time must not be negative, got {warm_up}")
+    if warm_up >= duration:
+        logger.warning(
+            f"run of {duration} minutes is within the {warm_up} minute warm-up; "
+            "no observations are deleted"
+        )
+        return 0.0
+    return warm_up
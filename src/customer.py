@@ -1,18 +1,27 @@
-import random
+import math
 from abc import ABC, abstractmethod
 from typing import Generator, Optional
 
 import simpy
 
-from src.config import Config
+from src.config import ConfigLike
 from src.driver import Driver
-from src.restaurant import Restaurant
+from src.restaurant import BALKED, RENEGED, Restaurant
+
+# Share of arriving customers who eat in (the rest order through the food app)
+INHOUSE_PROBABILITY = 0.7
 
 
 class Customer(ABC):
     """
     Abstract base class representing a customer in a restaurant simulation.
 
+    All random durations are drawn from the restaurant's ``variates`` so that
+    a seeded run is reproducible and each stage has its own random stream.
+
+    Customers are compact ``__slots__`` records: the environment and config
+    are shared through the restaurant rather than stored on every customer.
+
     Attributes:
     -----------
     env : simpy.Environment
@@ -23,30 +32,56 @@ class Customer(ABC):
         The restaurant the customer is ordering from.
     arrival_time : float
         The time the customer arrived at the restaurant.
-    config : Config
+    config : ConfigLike
         The configuration object for the simulation.
+    customer_type : str
+        Class-level label used to break metrics down by customer type.
 
     Methods:
     --------
-    place_order() Generator[simpy.events.Event, None, None]:
+    admit() -> bool:
+        Checks the queues on arrival; a customer facing a full queue balks.
+    queues_full() -> bool:
+        Whether a queue the customer would join on arrival is full.
+    has_room(resource, limit) -> bool:
+        Checks a queue before joining it; a customer facing a full queue balks.
+    queue_for(request) Generator[simpy.events.Event, None, bool]:
+        Waits for a request, reneging once the patience runs out.
+    place_order() Generator[simpy.events.Event, None, bool]:
         Sends an order request to the restaurant's order taker.
-    wait_for_food() Generator[simpy.events.Event, None, None]:
+    wait_for_food() Generator[simpy.events.Event, None, bool]:
         Sends a request for food to the cook and waits for it to be prepared.
     leave() -> None:
         Records the customer's departure from the restaurant and adds them to the restaurant's metrics.
+    journey() Generator[simpy.events.Event, None, None]:
+        Runs the customer's whole lifecycle as a single process.
     """
 
+    __slots__ = (
+        "id",
+        "restaurant",
+        "arrival_time",
+        "order_time",
+        "cook_time",
+        "service_time",
+    )
+
+    customer_type = "customer"
+
     def __init__(
         self,
         env: simpy.Environment,
         id: int,
         restaurant: "Restaurant",
         arrival_time: float,
-        config: Config,
+        config: ConfigLike,
     ):
         """
         Initializes a new instance of the Customer class.
 
+        ``env`` and ``config`` must be the restaurant's own; they are accepted
+        for compatibility and read back through the restaurant.
+
         Parameters:
         -----------
         env : simpy.Environment
@@ -57,40 +92,125 @@ class Customer(ABC):
             The restaurant the customer is ordering from.
         arrival_time : float
             The time the customer arrived at the restaurant.
-        config : Config
+        config : ConfigLike
             The configuration object for the simulation.
+
+        Raises:
+        -------
+        ValueError
+            If ``env`` or ``config`` is not the restaurant's.
         """
-        self.env = env
+        if env is not restaurant.env or config is not restaurant.config:
+            raise ValueError("customer env and config must be the restaurant's")
+
         self.id = id
         self.restaurant = restaurant
         self.arrival_time = arrival_time
-        self.config = config
 
         self.order_time: Optional[float] = None
         self.cook_time: Optional[float] = None
         self.service_time: Optional[float] = None
 
+    @property
+    def env(self) -> simpy.Environment:
+        """The simulation environment, shared through the restaurant."""
+        return self.restaurant.env
+
+    @property
+    def config(self) -> ConfigLike:
+        """The simulation configuration, shared through the restaurant."""
+        return self.restaurant.config
+
+    def admit(self) -> bool:
+        """
+        Checks the queues on arrival when admission control is on.
+
+        A customer who finds a queue full balks: they leave at once and are
+        counted as lost.
+
+        Returns:
+        --------
+        bool
+            Whether the customer was admitted.
+        """
+        if self.config.admission_control and self.queues_full():
+            self.restaurant.metrics.add_lost(self, BALKED, self.env.now)
+            return False
+        return True
+
     @abstractmethod
-    def place_order(self) -> Generator[simpy.events.Event, None, None]:
+    def queues_full(self) -> bool:
+        """
+        Abstract method telling whether a queue the customer would join on arrival is full.
+        """
+        pass
+
+    def has_room(self, resource: simpy.Resource, limit: int) -> bool:
+        """
+        Checks a queue before joining it when admission control is on.
+
+        Every queue is checked as the customer joins it, not only on arrival,
+        so no queue grows past its limit. A customer who finds it full balks
+        and is counted as lost.
+
+        Returns:
+        --------
+        bool
+            Whether the customer may join the queue.
+        """
+        if self.config.admission_control and len(resource.queue) >= limit:
+            self.restaurant.metrics.add_lost(self, BALKED, self.env.now)
+            return False
+        return True
+
+    def queue_for(
+        self, request: simpy.Event
+    ) -> Generator[simpy.events.Event, None, bool]:
+        """
+        Waits for a request, reneging once the configured patience runs out.
+
+        Patience applies afresh to every queue the customer waits in. A
+        customer who reneges is counted as lost; leaving the ``with`` block
+        of the request withdraws it from the queue.
+
+        Returns:
+        --------
+        bool
+            Whether the request was granted.
+        """
+        patience = self.config.patience
+        if math.isinf(patience):
+            yield request
+            return True
+        yield request | self.env.timeout(patience)
+        if request.triggered:
+            return True
+        self.restaurant.metrics.add_lost(self, RENEGED, self.env.now)
+        return False
+
+    @abstractmethod
+    def place_order(self) -> Generator[simpy.events.Event, None, bool]:
         """
         Abstract method for placing an order with the restaurant's order taker.
 
         Returns:
         --------
-        Generator[simpy.events.Event, None, None]:
-            A SimPy event representing the order request.
+        Generator[simpy.events.Event, None, bool]:
+            Process returning whether the order was placed (False if the
+            customer reneged).
         """
         pass
 
     @abstractmethod
-    def wait_for_food(self) -> Generator[simpy.events.Event, None, None]:
+    def wait_for_food(self) -> Generator[simpy.events.Event, None, bool]:
         """
         Abstract method for sending a request for food to the cook and waiting for it to be prepared.
 
         Returns:
         --------
-        simpy.events.Event:
-            A SimPy event representing the food request.
+        Generator[simpy.events.Event, None, bool]:
+            Process returning whether the food was cooked (False if the
+            customer balked or reneged).
         """
         pass
 
@@ -101,6 +221,16 @@ class Customer(ABC):
         """
         pass
 
+    @abstractmethod
+    def journey(self) -> Generator[simpy.events.Event, None, None]:
+        """
+        Abstract method for running the customer's whole lifecycle.
+
+        Stages are delegated to with ``yield from`` rather than started as
+        separate processes, so one SimPy process serves the whole journey.
+        """
+        pass
+
 
 class InHouseCustomer(Customer):
     """
@@ -116,7 +246,7 @@ class InHouseCustomer(Customer):
         The restaurant the customer is ordering from.
     arrival_time : float
         The time the customer arrived at the restaurant.
-    config : Config
+    config : ConfigLike
         The configuration object for the simulation.
     order_time : Optional[float]
         The time the customer placed their order.
@@ -127,103 +257,138 @@ class InHouseCustomer(Customer):
 
     Methods:
     --------
-    place_order() Generator[simpy.events.Event, None, None]
+    queues_full() -> bool
+        Whether the order taker's or the kitchen's queue is full.
+    place_order() Generator[simpy.events.Event, None, bool]
         Places an order with the restaurant's order taker.
-    wait_for_food() Generator[simpy.events.Event, None, None]
+    wait_for_food() Generator[simpy.events.Event, None, bool]
         Waits for the cook to prepare the customer's food.
-    receive_food() Generator[simpy.events.Event, None, None]
+    receive_food() Generator[simpy.events.Event, None, bool]
         Serves the food to the customer.
     leave() -> None
         Adds the customer to the restaurant's metrics.
+    journey() Generator[simpy.events.Event, None, None]
+        Runs the whole lifecycle as a single process.
     """
 
+    __slots__ = ()
+
+    customer_type = "inhouse"
+
     def __init__(
         self,
         env: simpy.Environment,
         id: int,
         restaurant: "Restaurant",
         arrival_time: float,
-        config: Config,
+        config: ConfigLike,
     ):
         super().__init__(env, id, restaurant, arrival_time, config)
 
-    def place_order(self) -> Generator[simpy.events.Event, None, None]:
+    def queues_full(self) -> bool:
+        """
+        Whether the order taker's queue or the kitchen's queue is full.
+
+        A packed kitchen turns in-house customers away on arrival too, rather
+        than after they have queued to order.
+        """
+        return (
+            len(self.restaurant.order_taker.queue) >= self.config.counter_queue_size
+            or len(self.restaurant.cook.queue) >= self.config.kitchen_queue_size
+        )
+
+    def place_order(self) -> Generator[simpy.events.Event, None, bool]:
         """
         Places an order with the restaurant's order taker.
 
         Returns:
         --------
-        order : Generator[simpy.events.Event, None, None]
-            The event that gets triggered when the order is taken by the restaurant's order taker.
+        order : Generator[simpy.events.Event, None, bool]
+            Process returning whether the order was taken (False if the
+            customer reneged while queueing).
         """
         # Send an order request to the restaurant's order taker
         order_taker = self.restaurant.order_taker
+        if not self.has_room(order_taker, self.config.counter_queue_size):
+            return False
         with order_taker.request() as order:
-            yield order
+            if not (yield from self.queue_for(order)):
+                return False
 
             # Record the time the order was placed
             self.order_time = self.env.now
 
             # Wait for the order to be taken
-            yield self.env.timeout(
-                random.uniform(
-                    self.config.mean_order_time - 2, self.config.mean_order_time + 2
-                )
-            )
+            yield self.env.timeout(self.restaurant.variates.order_time())
+        return True
 
-    def wait_for_food(self) -> Generator[simpy.events.Event, None, None]:
+    def wait_for_food(self) -> Generator[simpy.events.Event, None, bool]:
         """
         Waits for the cook to prepare the customer's food.
 
         Returns:
         --------
-        food : Generator[simpy.events.Event, None, None]
-            The event that gets triggered when the cook finishes preparing the customer's food.
+        food : Generator[simpy.events.Event, None, bool]
+            Process returning whether the food was cooked (False if the
+            customer balked at or reneged from the kitchen's queue).
         """
         # Send a request for food to the cook
         cook = self.restaurant.cook
+        if not self.has_room(cook, self.config.kitchen_queue_size):
+            return False
         with cook.request() as food:
-            yield food
+            if not (yield from self.queue_for(food)):
+                return False
 
             # Record the time the cook started cooking the customer's food
             self.cook_time = self.env.now
 
             # Wait for the cook to prepare the food
-            yield self.env.timeout(
-                random.uniform(
-                    self.config.mean_cook_time - 2, self.config.mean_cook_time + 2
-                )
-            )
+            yield self.env.timeout(self.restaurant.variates.cook_time())
+        return True
 
-    def receive_food(self) -> Generator[simpy.events.Event, None, None]:
+    def receive_food(self) -> Generator[simpy.events.Event, None, bool]:
         """
         Serves the food to the customer.
 
         Returns:
         --------
-        serve : Generator[simpy.events.Event, None, None]
-            The event that gets triggered when the customer is served their food.
+        serve : Generator[simpy.events.Event, None, bool]
+            Process returning whether the customer was served (False if they
+            balked at or reneged from the counter's queue).
         """
         server = self.restaurant.server
+        if not self.has_room(server, self.config.counter_queue_size):
+            return False
         with server.request() as req:
-            yield req
+            if not (yield from self.queue_for(req)):
+                return False
 
             # Serve the food to the customer
-            yield self.env.timeout(
-                random.uniform(
-                    self.config.mean_service_time - 2, self.config.mean_service_time + 2
-                )
-            )
+            yield self.env.timeout(self.restaurant.variates.service_time())
 
             # Record the time the customer received their food
             self.service_time = self.env.now
+        return True
 
     def leave(self) -> None:
         """
         Adds the customer to the restaurant's metrics.
         """
         # Add the customer to the restaurant's metrics
-        self.restaurant.metrics.add_customer(self)
+        self.restaurant.metrics.add_customer(self, self.env.now)
+
+    def journey(self) -> Generator[simpy.events.Event, None, None]:
+        """
+        Orders, waits for the food, is served and leaves, in one process.
+        """
+        if not self.admit() or not (yield from self.place_order()):
+            return
+        if not (yield from self.wait_for_food()):
+            return
+        if not (yield from self.receive_food()):
+            return
+        self.leave()
 
 
 class FoodAppCustomer(Customer):
@@ -235,23 +400,33 @@ class FoodAppCustomer(Customer):
         id (int): The unique identifier for the customer.
         restaurant (MockRestaurant): The restaurant from which the customer is ordering.
         arrival_time (float): The time at which the customer arrives at the restaurant.
-        config (Config): The configuration object for the simulation.
+        config (ConfigLike): The configuration object for the simulation.
         pickup_time (Optional[float]): The scheduled time for the driver to pick up their food.
+        pickup_delay (int): Minutes between the food being ready and the pickup.
 
     Methods:
+        queues_full(): Whether the kitchen's queue is full.
         place_order(): Sends an order request direct to the cook.
         wait_for_food(): Sends a request for food to the kitchen and waits for the food to be prepared.
         schedule_pickup(pickup_time: float): Schedules a pickup event for when the food is ready.
         leave(): Adds the customer to the restaurant's metrics.
+        journey(): Runs the whole lifecycle as a single process.
     """
 
+    __slots__ = ("driver", "pickup_time")
+
+    customer_type = "foodapp"
+
+    # Minutes between the food being ready and the driver collecting it
+    pickup_delay = 5
+
     def __init__(
         self,
         env: simpy.Environment,
         id: int,
         restaurant: "Restaurant",
         arrival_time: float,
-        config: Config,
+        config: ConfigLike,
         driver: Driver,
     ):
         """
@@ -262,55 +437,72 @@ class FoodAppCustomer(Customer):
             id (int): The unique identifier for the customer.
             restaurant (MockRestaurant): The restaurant from which the customer is ordering.
             arrival_time (float): The time at which the driver arrives at the restaurant.
-            config (Config): The configuration object for the simulation.
+            config (ConfigLike): The configuration object for the simulation.
             driver (Driver): The driver from the Food App Delivery
         """
         super().__init__(env, id, restaurant, arrival_time, config)
         self.driver = driver
         self.pickup_time: Optional[float] = None
 
+    def queues_full(self) -> bool:
+        """
+        Whether the kitchen's queue is full.
+        """
+        return len(self.restaurant.cook.queue) >= self.config.kitchen_queue_size
+
     def place_order(self):
         """
         Sends an order request to the kitchen cook.
+
+        Returns whether the order was taken (False if the customer reneged).
         """
         cook = self.restaurant.cook
+        if not self.has_room(cook, self.config.kitchen_queue_size):
+            return False
         with cook.request() as order:
-            yield order
+            if not (yield from self.queue_for(order)):
+                return False
 
             # Record the time the order was placed
             self.order_time = self.env.now
 
             # Wait for the order to be taken
-            yield self.env.timeout(
-                random.uniform(
-                    self.config.mean_order_time - 2, self.config.mean_order_time + 2
-                )
-            )
+            yield self.env.timeout(self.restaurant.variates.order_time())
+        return True
 
     def wait_for_food(self):
         """
         Sends a request for food to the kitchen and waits for the food to be prepared.
+
+        Returns whether the food was cooked (False if the customer balked or
+        reneged).
         """
         # Send a request for food to the cook
         cook = self.restaurant.cook
+        if not self.has_room(cook, self.config.kitchen_queue_size):
+            return False
         with cook.request() as food:
-            yield food
+            if not (yield from self.queue_for(food)):
+                return False
 
             # Record the time the cook started cooking the customer's food
             self.cook_time = self.env.now
 
             # Wait for the cook to prepare the food
-            yield self.env.timeout(
-                random.uniform(
-                    self.config.mean_cook_time - 2, self.config.mean_cook_time + 2
-                )
-            )
+            yield self.env.timeout(self.restaurant.variates.cook_time())
+        return True
 
     def schedule_pickup(self, pickup_time: float):
+        """
+        Books a driver and holds them until the pickup time.
+
+        If the food is not being cooked yet, waits for the cook start time
+        with a single timeout rather than polling.
+        """
         self.pickup_time = pickup_time
 
-        while self.env.now < self.cook_time:
-            yield self.env.timeout(1)
+        if self.env.now < self.cook_time:
+            yield self.env.timeout(self.cook_time - self.env.now)
 
         with self.driver.request() as req:  # "with" handles release automatically
             yield req
@@ -321,4 +513,15 @@ class FoodAppCustomer(Customer):
         """
         Adds the customer to the restaurant's metrics.
         """
-        self.restaurant.metrics.add_customer(self)
+        self.restaurant.metrics.add_customer(self, self.env.now)
+
+    def journey(self):
+        """
+        Orders, waits for the food, has it picked up and leaves, in one process.
+        """
+        if not self.admit() or not (yield from self.place_order()):
+            return
+        if not (yield from self.wait_for_food()):
+            return
+        yield from self.schedule_pickup(self.env.now + self.pickup_delay)
+        self.leave()
@@ -1,9 +1,10 @@
 import simpy
 
-from src.config import Config
+from src.config import ConfigLike
+from src.instrumentation import MonitoredResource
 
 
-class Driver(simpy.Resource):
-    def __init__(self, env: simpy.Environment, config: Config):
-        super().__init__(env, capacity=config.driver_capacity)
+class Driver(MonitoredResource):
+    def __init__(self, env: simpy.Environment, config: ConfigLike):
+        super().__init__(env, capacity=config.driver_capacity, name="driver")
         self.config = config
@@ -0,0 +1,162 @@
+"""
+Instrumented SimPy building blocks for measuring simulation cost and resource use.
+"""
+
+import bisect
+from array import array
+from typing import Any, Dict, Optional
+
+import simpy
+
+from .timeseries import DEFAULT_BUCKET_WIDTH, DEFAULT_CAPACITY, TimeSeries
+
+
+class CountingEnvironment(simpy.Environment):
+    """
+    SimPy environment that counts every event it schedules.
+
+    Attributes:
+        events_scheduled (int): Number of events put on the event queue
+    """
+
+    def __init__(self, initial_time: float = 0) -> None:
+        super().__init__(initial_time)
+        self.events_scheduled: int = 0
+
+    def schedule(
+        self, event: Any, priority: Any = simpy.core.NORMAL, delay: Any = 0
+    ) -> None:
+        """Schedule an event, counting it."""
+        self.events_scheduled += 1
+        super().schedule(event, priority, delay)
+
+
+class MonitoredResource(simpy.Resource):
+    """
+    SimPy resource keeping time-weighted integrals of its busy servers and queue.
+
+    The integrals are advanced whenever a request or release changes the
+    state, so monitoring costs O(1) per event and nothing grows with the run.
+    ``checkpoint()`` saves the integrals at the current time, so statistics
+    can later be taken from a checkpoint on (used when the warm-up cut-off is
+    only chosen after the run). ``track()`` additionally records the queue
+    length and the number in the system as a bounded ``TimeSeries``.
+
+    Attributes:
+        name (str): Name the statistics are reported under
+        time_series (Optional[TimeSeries]): Queue and in-system series, if tracked
+        busy_time (float): Integral of busy servers since monitoring started
+        queue_time (float): Integral of the queue length since monitoring started
+        max_queue (int): Longest queue since monitoring started
+    """
+
+    def __init__(self, env: simpy.Environment, capacity: int = 1, name: str = ""):
+        super().__init__(env, capacity)
+        self.name = name
+        self.time_series: Optional[TimeSeries] = None
+        self.reset_monitor()
+
+    def track(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        bucket_width: float = DEFAULT_BUCKET_WIDTH,
+    ) -> TimeSeries:
+        """
+        Start recording the queue length and number in the system over time.
+
+        Args:
+            capacity: Maximum number of buckets kept
+            bucket_width: Initial bucket width in simulation time
+
+        Returns:
+            The series, which keeps recording through metric resets
+        """
+        self.time_series = TimeSeries(
+            ("queue", "in_system"), capacity, bucket_width, self._env.now
+        )
+        self.time_series.record(
+            self._env.now, len(self.queue), self.count + len(self.queue)
+        )
+        return self.time_series
+
+    def reset_monitor(self) -> None:
+        """Restart the integrals at the current time."""
+        self.start_time = self._env.now
+        self.busy_time = 0.0
+        self.queue_time = 0.0
+        self.max_queue = len(self.queue)
+        self._last_time = self._env.now
+        self._busy = self.count
+        self._queued = len(self.queue)
+        # Checkpoints: time, integrals, and the longest queue since the last one
+        self._checkpoint_times = array("d")
+        self._checkpoint_busy = array("d")
+        self._checkpoint_queue = array("d")
+        self._segment_max = array("q")
+        self._current_max = self._queued
+
+    def checkpoint(self) -> None:
+        """Save the integrals at the current time."""
+        self._advance()
+        self._checkpoint_times.append(self._last_time)
+        self._checkpoint_busy.append(self.busy_time)
+        self._checkpoint_queue.append(self.queue_time)
+        self._segment_max.append(self._current_max)
+        self._current_max = self._queued
+
+    def statistics(self, since: Optional[float] = None) -> Dict[str, float]:
+        """
+        Return the integrals up to now.
+
+        Args:
+            since: Checkpoint time to measure from (start of monitoring if None)
+
+        Returns:
+            Dictionary with ``busy_time``, ``queue_time`` and ``max_queue``
+        """
+        now = self._env.now
+        elapsed = now - self._last_time
+        busy_time = self.busy_time + elapsed * self._busy
+        queue_time = self.queue_time + elapsed * self._queued
+        if since is None or since <= self.start_time:
+            return {
+                "busy_time": busy_time,
+                "queue_time": queue_time,
+                "max_queue": self.max_queue,
+            }
+
+        index = bisect.bisect_left(self._checkpoint_times, since)
+        if index == len(self._checkpoint_times):
+            raise ValueError(f"no checkpoint at or after {since}")
+        return {
+            "busy_time": busy_time - self._checkpoint_busy[index],
+            "queue_time": queue_time - self._checkpoint_queue[index],
+            "max_queue": max([*self._segment_max[index + 1 :], self._current_max]),
+        }
+
+    def _trigger_put(self, get_event: Any) -> None:
+        super()._trigger_put(get_event)
+        self._advance()
+
+    def _trigger_get(self, put_event: Any) -> None:
+        super()._trigger_get(put_event)
+        self._advance()
+
+    def _advance(self) -> None:
+        """Integrate the state held since the last change up to now."""
+        now = self._env.now
+        elapsed = now - self._last_time
+        if elapsed:
+            self.busy_time += elapsed * self._busy
+            self.queue_time += elapsed * self._queued
+            self._last_time = now
+        if self.time_series is not None and (
+            self._busy != self.count or self._queued != len(self.queue)
+        ):
+            self.time_series.record(now, len(self.queue), self.count + len(self.queue))
+        self._busy = self.count
+        self._queued = len(self.queue)
+        if self._queued > self.max_queue:
+            self.max_queue = self._queued
+        if self._queued > self._current_max:
+            self._current_max = self._queued
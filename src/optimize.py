@@ -0,0 +1,271 @@
+"""
+Staffing optimisation: the cheapest staffing that keeps waits under a limit.
+
+Candidate staffings (kitchen servers, counter servers, drivers) are checked in
+order of cost. Each candidate gets a small pilot batch of replications and
+then further batches only until its confidence interval lies entirely below
+or above the wait limit (sequential feasibility screening), so clearly
+infeasible candidates are dropped after the pilot and candidates more
+expensive than the first feasible one are never simulated at all. All
+candidates share the master seed, so they are compared on common random
+numbers.
+"""
+
+import itertools
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Dict, List, Optional, Sequence
+
+from .cache import ResultCache
+from .config import Config, ConfigLike
+from .estimation import confidence_interval
+from .random_streams import RandomStreams
+from .simulation import ReplicationTask, SimulationRunner
+from .sweep import point_config
+
+logger = logging.getLogger(__name__)
+
+STAFF_KEYS = ("kitchen_servers", "counter_servers", "driver_capacity")
+
+# Candidate outcomes
+FEASIBLE = "feasible"
+INFEASIBLE = "infeasible"
+UNDECIDED = "undecided"
+NOT_RUN = "not run"
+
+
+class StaffingOptimizer:
+    """
+    Finds the cheapest staffing whose mean wait stays under a limit.
+
+    Attributes:
+        base_config (ConfigLike): Values for everything but the staffing
+        staff_ranges (Dict[str, List[int]]): Candidate values per staff key
+        costs (Dict[str, float]): Cost per unit of each staff key
+        max_wait (float): Limit on the mean of ``metric``
+        metric (str): Metrics key the limit applies to
+        confidence (float): Confidence needed to call a candidate (in)feasible
+        initial_runs (int): Pilot replications per candidate
+        max_runs (int): Replication cap per candidate
+    """
+
+    def __init__(
+        self,
+        staff_ranges: Dict[str, Sequence[int]],
+        costs: Dict[str, float],
+        max_wait: float,
+        base_config: Optional[ConfigLike] = None,
+        metric: str = "average_wait_time",
+        confidence: float = 0.95,
+        initial_runs: int = 10,
+        max_runs: int = 200,
+    ) -> None:
+        """
+        Initialize the optimizer.
+
+        Args:
+            staff_ranges: Candidate values per staff key (``STAFF_KEYS``)
+            costs: Cost per unit of each staff key
+            max_wait: Limit on the mean of ``metric``
+            base_config: Values for everything but the staffing
+            metric: Metrics key the limit applies to
+            confidence: Confidence needed to call a candidate (in)feasible
+            initial_runs: Pilot replications per candidate (at least 2)
+            max_runs: Replication cap per candidate
+        """
+        unknown = set(staff_ranges) - set(STAFF_KEYS)
+        if unknown:
+            raise ValueError(f"unknown staff keys {sorted(unknown)}")
+        if initial_runs < 2 or max_runs < initial_runs:
+            raise ValueError("need 2 <= initial_runs <= max_runs")
+
+        self.base_config: ConfigLike = base_config or Config()
+        self.staff_ranges = {
+            key: list(staff_ranges.get(key, [getattr(self.base_config, key)]))
+            for key in STAFF_KEYS
+        }
+        self.costs = {key: costs.get(key, 0.0) for key in STAFF_KEYS}
+        self.max_wait = max_wait
+        self.metric = metric
+        self.confidence = confidence
+        self.initial_runs = initial_runs
+        self.max_runs = max_runs
+
+    def candidates(self) -> List[Dict[str, Any]]:
+        """All staffings, cheapest first (ties broken by fewer staff)."""
+        staffings = [
+            dict(zip(STAFF_KEYS, values))
+            for values in itertools.product(*self.staff_ranges.values())
+        ]
+        return sorted(
+            staffings,
+            key=lambda staffing: (self.cost(staffing), tuple(staffing.values())),
+        )
+
+    def cost(self, staffing: Dict[str, Any]) -> float:
+        """Staff cost of a staffing."""
+        return sum(self.costs[key] * staffing[key] for key in STAFF_KEYS)
+
+    def optimize(
+        self,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        engine: str = "simpy",
+        cache: Optional[ResultCache] = None,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Search the candidates in cost order for the cheapest feasible one.
+
+        Among candidates of the same cost as the first feasible one, the one
+        with the lowest mean wait is chosen. A candidate that reaches
+        ``max_runs`` undecided is judged by its point estimate.
+
+        Args:
+            workers: Number of worker processes (1 runs everything in-process)
+            seed: Master seed shared by all candidates (random if None)
+            engine: Replication engine, as for ``SimulationRunner``
+            cache: Result cache for the replications
+            verbose: Whether to print the search result
+
+        Returns:
+            Dictionary with the chosen staffing (None if nothing is feasible),
+            every candidate's outcome, and the replications used compared
+            with a fixed-budget search giving every candidate as many
+            replications as the most demanding screened candidate needed
+            (``max_runs`` is only a cap, so it would overstate the savings)
+        """
+        seed = RandomStreams(seed).seed
+        runner = SimulationRunner(self.base_config, engine=engine, cache=cache)
+        candidates = self.candidates()
+        outcomes = [
+            {
+                **staffing,
+                "cost": self.cost(staffing),
+                "status": NOT_RUN,
+                "feasible": False,
+                "runs": 0,
+            }
+            for staffing in candidates
+        ]
+
+        best: Optional[Dict[str, Any]] = None
+        with ExitStack() as stack:
+            executor = None
+            if workers > 1 and engine == "simpy":
+                executor = stack.enter_context(ProcessPoolExecutor(workers))
+
+            for outcome in outcomes:
+                if best is not None and outcome["cost"] > best["cost"]:
+                    break
+                self._screen(outcome, runner, seed, workers, executor)
+                logger.info(
+                    f"{_staffing_label(outcome)}: {outcome['status']} after "
+                    f"{outcome['runs']} runs ({outcome['mean']:.2f} "
+                    f"± {outcome['half_width']:.2f})"
+                )
+                if outcome["feasible"] and (
+                    best is None or outcome["mean"] < best["mean"]
+                ):
+                    best = outcome
+
+        replications = sum(outcome["runs"] for outcome in outcomes)
+        # The smallest fixed budget that would have called every screened candidate
+        budget = max(outcome["runs"] for outcome in outcomes)
+        brute_force = len(outcomes) * budget
+        result = {
+            "best": best,
+            "max_wait": self.max_wait,
+            "metric": self.metric,
+            "seed": seed,
+            "candidates": outcomes,
+            "replications": replications,
+            "brute_force_budget": budget,
+            "brute_force_replications": brute_force,
+            "savings": 1 - replications / brute_force,
+        }
+        if verbose:
+            self._print_result(result)
+        return result
+
+    def _screen(
+        self,
+        outcome: Dict[str, Any],
+        runner: SimulationRunner,
+        seed: int,
+        workers: int,
+        executor: Any,
+    ) -> None:
+        """Run batches for one candidate until it is called either way."""
+        config = point_config(
+            self.base_config, {key: outcome[key] for key in STAFF_KEYS}
+        )
+        values: List[float] = []
+        batch_size = self.initial_runs
+
+        while True:
+            tasks = [
+                ReplicationTask(
+                    config, seed, run_number, fused_journeys=runner.fused_journeys
+                )
+                for run_number in range(len(values) + 1, len(values) + batch_size + 1)
+            ]
+            for metrics in runner.iter_replications(tasks, workers, executor):
+                if self.metric not in metrics:
+                    raise ValueError(f"unknown metric {self.metric!r}")
+                values.append(float(metrics[self.metric]))
+
+            mean, half_width = confidence_interval(values, self.confidence)
+            outcome.update(runs=len(values), mean=mean, half_width=half_width)
+            if mean + half_width < self.max_wait:
+                outcome.update(status=FEASIBLE, feasible=True)
+                return
+            if mean - half_width > self.max_wait:
+                outcome.update(status=INFEASIBLE, feasible=False)
+                return
+            if len(values) >= self.max_runs:
+                outcome.update(status=UNDECIDED, feasible=mean <= self.max_wait)
+                return
+
+            # Runs expected to shrink the half-width below the gap to the limit
+            gap = max(abs(mean - self.max_wait), 1e-9)
+            needed = math.ceil(len(values) * (half_width / gap) ** 2)
+            batch_size = min(
+                max(needed - len(values), workers, 1), self.max_runs - len(values)
+            )
+
+    def _print_result(self, result: Dict[str, Any]) -> None:
+        """Print the chosen staffing and the compute spent."""
+        print("\n" + "=" * 60)
+        print(f"STAFFING OPTIMIZATION ({result['metric']} <= {result['max_wait']})")
+        print("=" * 60)
+        for outcome in result["candidates"]:
+            if outcome["runs"]:
+                print(
+                    f"  {_staffing_label(outcome)} cost {outcome['cost']:g}: "
+                    f"{outcome['status']} ({outcome['mean']:.2f} "
+                    f"± {outcome['half_width']:.2f}, {outcome['runs']} runs)"
+                )
+        print()
+        best = result["best"]
+        if best is None:
+            print("No candidate meets the limit")
+        else:
+            print(f"Cheapest feasible: {_staffing_label(best)} (cost {best['cost']:g})")
+        print(
+            f"Replications: {result['replications']} "
+            f"(fixed budget of {result['brute_force_budget']} per candidate: "
+            f"{result['brute_force_replications']}, "
+            f"{result['savings'] * 100:.0f}% saved)"
+        )
+        print("=" * 60)
+
+
+def _staffing_label(staffing: Dict[str, Any]) -> str:
+    return (
+        f"kitchen={staffing['kitchen_servers']} "
+        f"counter={staffing['counter_servers']} "
+        f"drivers={staffing['driver_capacity']}"
+    )
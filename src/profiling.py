@@ -0,0 +1,203 @@
+"""
+Profiling instruments: where a simulation run spends its events and its time.
+
+``ProfilingEnvironment`` counts scheduled events by kind (timeouts, resource
+requests and releases, process starts and ends, conditions). ``StageTimer``
+measures the time spent inside generator methods such as the customer
+generator and the customer stages; while ``instrument()`` is active the
+methods are wrapped on their classes, so the model itself carries no
+profiling code and unprofiled runs pay nothing. Only calls made on the
+instrumenting thread are timed, so runs on other threads (a thread pool or
+the service's request threads) pass through the wrappers untouched, and one
+instrumentation is active at a time. Time is charged exclusively:
+a stage delegated to with ``yield from`` is not counted again in the journey
+that delegates to it.
+"""
+
+import functools
+import inspect
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, Iterator, List, Sequence, Tuple, Type
+
+import simpy
+from simpy.resources.base import Get, Put
+
+from .instrumentation import CountingEnvironment
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# Event kinds, checked in order against the scheduled event's class
+EVENT_KINDS: Tuple[Tuple[Type[simpy.Event], str], ...] = (
+    (simpy.events.Timeout, "timeout"),
+    (Put, "request"),
+    (Get, "release"),
+    (simpy.events.Initialize, "process_start"),
+    (simpy.events.Process, "process_end"),
+    (simpy.events.Condition, "condition"),
+)
+OTHER_EVENTS = "other"
+
+# Held while methods are wrapped, so concurrent instrumentations cannot
+# restore each other's wrappers
+_INSTRUMENT_LOCK = threading.Lock()
+
+
+def event_kind(event_type: type) -> str:
+    """Return the kind an event class is counted under."""
+    for base, kind in EVENT_KINDS:
+        if issubclass(event_type, base):
+            return kind
+    return OTHER_EVENTS
+
+
+class ProfilingEnvironment(CountingEnvironment):
+    """
+    Counting environment that also counts the scheduled events by kind.
+
+    Attributes:
+        event_counts (Dict[str, int]): Events scheduled per kind
+    """
+
+    def __init__(self, initial_time: float = 0) -> None:
+        super().__init__(initial_time)
+        self.event_counts: Dict[str, int] = {
+            kind: 0 for kind in [kind for _, kind in EVENT_KINDS] + [OTHER_EVENTS]
+        }
+        self._kinds: Dict[type, str] = {}
+
+    def schedule(
+        self, event: Any, priority: Any = simpy.core.NORMAL, delay: Any = 0
+    ) -> None:
+        """Schedule an event, counting it by kind."""
+        event_type = type(event)
+        kind = self._kinds.get(event_type)
+        if kind is None:
+            kind = self._kinds[event_type] = event_kind(event_type)
+        self.event_counts[kind] += 1
+        super().schedule(event, priority, delay)
+
+
+class StageTimer:
+    """
+    Exclusive wall-clock time and resumptions of timed generators.
+
+    Attributes:
+        seconds (Dict[str, float]): Time spent inside each generator, excluding
+            the timed generators it delegated to
+        resumes (Dict[str, int]): Times each generator was resumed
+        calls (Dict[str, int]): Generators started per name
+    """
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = {}
+        self.resumes: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+        # Time spent in nested timed generators, one entry per active resume
+        self._children: List[float] = []
+
+    def timed(
+        self, name: str, generator: Generator[Any, Any, Any]
+    ) -> Generator[Any, Any, Any]:
+        """
+        Wrap a generator so that the time spent resuming it is charged to ``name``.
+
+        Values, exceptions and the return value pass through unchanged, so
+        the wrapper can stand in for the generator in ``yield from`` and in
+        ``env.process``.
+        """
+        self.calls[name] = self.calls.get(name, 0) + 1
+        value: Any = None
+        error: Any = None
+        while True:
+            self._children.append(0.0)
+            start = time.perf_counter()
+            try:
+                if error is None:
+                    event = generator.send(value)
+                else:
+                    event = generator.throw(error)
+            except StopIteration as stop:
+                self._charge(name, start)
+                return stop.value
+            except BaseException:
+                self._charge(name, start)
+                raise
+            self._charge(name, start)
+            try:
+                value, error = (yield event), None
+            except BaseException as exception:
+                value, error = None, exception
+
+    def _charge(self, name: str, start: float) -> None:
+        """Charge one resumption, passing its full time up to the parent."""
+        elapsed = time.perf_counter() - start
+        children = self._children.pop()
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - children
+        self.resumes[name] = self.resumes.get(name, 0) + 1
+        if self._children:
+            self._children[-1] += elapsed
+
+    @contextmanager
+    def instrument(self, targets: Sequence[Tuple[type, str]]) -> Iterator[None]:
+        """
+        Time the given generator methods while the context is active.
+
+        Each method is replaced on its class by a wrapper timing it under
+        ``"<Class>.<method>"``, and restored on exit. Calls from other
+        threads are not timed; another thread instrumenting meanwhile waits
+        until this context exits.
+
+        Args:
+            targets: ``(class, method name)`` pairs of generator methods
+        """
+        originals = []
+        owner = threading.get_ident()
+        with _INSTRUMENT_LOCK:
+            try:
+                for cls, name in targets:
+                    original = cls.__dict__.get(name)
+                    method = getattr(cls, name)
+                    if not inspect.isgeneratorfunction(method):
+                        raise ValueError(f"{cls.__name__}.{name} is not a generator")
+                    originals.append((cls, name, original))
+                    label = f"{cls.__name__}.{name}"
+                    setattr(cls, name, self._wrap(label, method, owner))
+                yield
+            finally:
+                for cls, name, original in reversed(originals):
+                    if original is None:
+                        delattr(cls, name)
+                    else:
+                        setattr(cls, name, original)
+
+    def _wrap(self, label: str, method: Any, owner: int) -> Any:
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Generator[Any, Any, Any]:
+            generator = method(*args, **kwargs)
+            if threading.get_ident() != owner:
+                return generator
+            return self.timed(label, generator)
+
+        return wrapper
+
+
+def peak_memory_bytes(children: bool = False) -> int:
+    """
+    Peak resident memory so far (0 where not available).
+
+    Args:
+        children: Report the largest waited-for child process (such as a
+            finished worker pool) instead of this process
+    """
+    if resource is None:  # pragma: no cover - not available on Windows
+        return 0
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # Reported in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,113 @@
+"""
+Seedable random number streams for reproducible simulation runs.
+
+A master seed spawns one substream family per replication, and each family
+holds a separate generator for every stochastic source in the model, so that
+runs are reproducible no matter which process executes them. Running two
+configurations on the same family gives common random numbers, and the
+antithetic twin of a family drives a negatively correlated partner run.
+"""
+
+import hashlib
+import random
+from typing import Dict, Optional
+
+# Names of the stochastic sources in the restaurant model
+ARRIVAL = "arrival"
+CUSTOMER_TYPE = "customer_type"
+ORDER = "order"
+COOK = "cook"
+SERVICE = "service"
+
+STREAM_NAMES = (ARRIVAL, CUSTOMER_TYPE, ORDER, COOK, SERVICE)
+
+
+def derive_seed(*parts: object) -> int:
+    """
+    Derive a 64-bit seed from the given parts.
+
+    SHA-256 is used rather than ``hash()`` so the result is stable across
+    processes, platforms and Python versions.
+    """
+    key = "/".join(str(part) for part in parts).encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
+
+
+class AntitheticRandom(random.Random):
+    """
+    Random generator returning ``1 - U`` for every uniform ``U`` drawn by the
+    generator with the same seed.
+
+    ``uniform`` and ``expovariate`` are inverse transforms of ``random()``, so
+    their variates are antithetic to those of the plain generator as well.
+    """
+
+    def random(self) -> float:
+        u = super().random()
+        # Keep the result in [0, 1) as expovariate() takes log(1 - u)
+        return 1.0 - u if u > 0.0 else 0.0
+
+
+class RandomStreams:
+    """
+    A family of independent random streams derived from a single master seed.
+
+    Attributes:
+        seed (int): The master seed every stream in the family is derived from
+        antithetic (bool): Whether the streams return antithetic variates
+    """
+
+    def __init__(self, seed: Optional[int] = None, antithetic: bool = False) -> None:
+        """
+        Initialize the stream family.
+
+        Args:
+            seed: Master seed (a random one is drawn from the OS if None)
+            antithetic: Whether to draw antithetic variates ``1 - U``
+        """
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**64)
+        self.seed: int = seed
+        self.antithetic: bool = antithetic
+        self._streams: Dict[str, random.Random] = {}
+
+    def spawn(self, run_number: int) -> "RandomStreams":
+        """Return the independent substream family for a replication."""
+        return RandomStreams(derive_seed(self.seed, "run", run_number), self.antithetic)
+
+    def antithetic_twin(self) -> "RandomStreams":
+        """Return the family drawing the antithetic variates of this one."""
+        return RandomStreams(self.seed, not self.antithetic)
+
+    def stream(self, name: str) -> random.Random:
+        """Return the generator for the named stochastic source."""
+        rng = self._streams.get(name)
+        if rng is None:
+            generator = AntitheticRandom if self.antithetic else random.Random
+            rng = self._streams[name] = generator(derive_seed(self.seed, name))
+        return rng
+
+    @property
+    def arrival(self) -> random.Random:
+        """Stream for customer interarrival times."""
+        return self.stream(ARRIVAL)
+
+    @property
+    def customer_type(self) -> random.Random:
+        """Stream for choosing between in-house and food app customers."""
+        return self.stream(CUSTOMER_TYPE)
+
+    @property
+    def order(self) -> random.Random:
+        """Stream for order-taking times."""
+        return self.stream(ORDER)
+
+    @property
+    def cook(self) -> random.Random:
+        """Stream for cooking times."""
+        return self.stream(COOK)
+
+    @property
+    def service(self) -> random.Random:
+        """Stream for serving times."""
+        return self.stream(SERVICE)
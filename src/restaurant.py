@@ -1,69 +1,252 @@
-from typing import Any, Dict, List, Union
+import math
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import simpy
 
-from src.config import Config
+from src.config import ConfigLike
+from src.estimation import RunningStatistic, mser_truncation
+from src.instrumentation import MonitoredResource
+from src.random_streams import RandomStreams
+from src.trace import TraceRecorder
+from src.variates import Variates
+
+# Ways a customer is lost: turned away by a full queue, or tired of waiting
+BALKED = "balked"
+RENEGED = "reneged"
+LOSS_REASONS = (BALKED, RENEGED)
 
 
 class Metrics:
     """
     Tracks customer metrics and performance data for the restaurant simulation.
 
+    Summaries are kept in constant-memory online accumulators updated as each
+    customer leaves, so memory does not grow with the number of customers.
+    Keeping the customer objects themselves is opt-in.
+
+    For warm-up deletion the departures can also be recorded as a compact
+    series (departure time, type and wait of each customer), from which the
+    summaries are rebuilt once a truncation point has been chosen.
+
     Attributes:
-        customers (List): List of customers who have completed their journey
+        keep_customers (bool): Whether finished customers are kept in ``customers``
+        customers (List): Customers who have completed their journey, if kept
+        customer_count (int): Number of customers who have completed their journey
+        type_counts (Dict[str, int]): Completed customers per customer type
+        wait_time (RunningStatistic): Arrival-to-service times of served customers
+        lost_counts (Dict[str, Dict[str, int]]): Lost customers per type, by
+            reason (``BALKED`` or ``RENEGED``)
+        trace (Optional[TraceRecorder]): Columnar trace finished customers are
+            appended to, if any
+        record_series (bool): Whether departures are recorded as a series
+        monitors (Sequence[MonitoredResource]): Resources checkpointed at each
+            recorded departure, so their statistics can follow a truncation
     """
 
-    def __init__(self) -> None:
-        self.customers: List[Any] = []
+    def __init__(
+        self,
+        keep_customers: bool = False,
+        trace: Optional[TraceRecorder] = None,
+        record_series: bool = False,
+        monitors: Sequence[MonitoredResource] = (),
+    ) -> None:
+        self.keep_customers = keep_customers
+        self.trace = trace
+        self.record_series = record_series
+        self.monitors = monitors
+        self.reset()
 
-    def add_customer(self, customer: Any) -> None:
+    def add_customer(
+        self, customer: Any, departure_time: Optional[float] = None
+    ) -> None:
         """
         Add a customer to the metrics tracking.
 
         Args:
             customer: The customer object to track
+            departure_time: When the customer left (needed for the series)
+        """
+        customer_type = getattr(customer, "customer_type", "customer")
+        service_time = getattr(customer, "service_time", None)
+        arrival_time = getattr(customer, "arrival_time", None)
+        wait = None
+        if service_time is not None and arrival_time is not None:
+            wait = service_time - arrival_time
+        self._count(customer_type, wait)
+
+        if self.record_series and departure_time is not None:
+            self._departure_times.append(departure_time)
+            self._departure_types.append(self._series_type(customer_type))
+            self._departure_waits.append(math.nan if wait is None else wait)
+            for monitor in self.monitors:
+                monitor.checkpoint()
+
+        if self.keep_customers:
+            self.customers.append(customer)
+        if self.trace is not None:
+            self.trace.record(customer)
+
+    def add_lost(
+        self, customer: Any, reason: str, time: Optional[float] = None
+    ) -> None:
+        """
+        Count a customer who left without being served.
+
+        Args:
+            customer: The customer who was lost
+            reason: ``BALKED`` or ``RENEGED``
+            time: When the customer left (needed for the series)
         """
-        self.customers.append(customer)
+        if reason not in LOSS_REASONS:
+            raise ValueError(f"unknown loss reason {reason!r}")
+        customer_type = getattr(customer, "customer_type", "customer")
+        self._count_lost(customer_type, reason)
+        if self.record_series and time is not None:
+            self._lost_times.append(time)
+            self._lost_types.append(self._series_type(customer_type))
+            self._lost_reasons.append(LOSS_REASONS.index(reason))
+
+    def _count_lost(self, customer_type: str, reason: str) -> None:
+        counts = self.lost_counts[reason]
+        counts[customer_type] = counts.get(customer_type, 0) + 1
+
+    def _series_type(self, customer_type: str) -> int:
+        """Return the series code of a customer type, adding it if new."""
+        if customer_type not in self._series_types:
+            self._series_types.append(customer_type)
+        return self._series_types.index(customer_type)
+
+    def _count(self, customer_type: str, wait: Optional[float]) -> None:
+        """Update the summaries with one finished customer."""
+        self.customer_count += 1
+        self.type_counts[customer_type] = self.type_counts.get(customer_type, 0) + 1
+        if wait is not None:
+            self.wait_time.add(wait)
 
     def reset(self) -> None:
         """Reset all metrics data."""
-        self.customers = []
+        self.customers: List[Any] = []
+        self.customer_count = 0
+        self.type_counts: Dict[str, int] = {}
+        self.wait_time = RunningStatistic()
+        self.lost_counts: Dict[str, Dict[str, int]] = {
+            reason: {} for reason in LOSS_REASONS
+        }
+        # Departure series; waits are NaN for customers never served
+        self._departure_times = array("d")
+        self._departure_types = array("B")
+        self._departure_waits = array("d")
+        self._series_types: List[str] = []
+        # Lost customers: time, type code and index into LOSS_REASONS
+        self._lost_times = array("d")
+        self._lost_types = array("B")
+        self._lost_reasons = array("B")
+
+    def departures(self) -> List[Tuple[float, str, Optional[float]]]:
+        """Recorded departures as (time, customer type, wait or None)."""
+        return [
+            (time, self._series_types[type_code], None if math.isnan(wait) else wait)
+            for time, type_code, wait in zip(
+                self._departure_times, self._departure_types, self._departure_waits
+            )
+        ]
+
+    def wait_series(self) -> Tuple[List[float], List[float]]:
+        """Departure times and waits of served customers, in departure order."""
+        served = [
+            (time, wait)
+            for time, wait in zip(self._departure_times, self._departure_waits)
+            if not math.isnan(wait)
+        ]
+        return [time for time, _ in served], [wait for _, wait in served]
+
+    def truncate(self, cutoff: float) -> None:
+        """
+        Rebuild the summaries from the customers who left at or after ``cutoff``.
+
+        Kept customer objects are filtered too; the trace is left untouched.
+
+        Args:
+            cutoff: Simulation time before which departures are discarded
+        """
+        if not self.record_series:
+            raise ValueError("truncating metrics needs record_series=True")
+        departures = self.departures()
+        self.customer_count = 0
+        self.type_counts = {}
+        self.wait_time = RunningStatistic()
+        for time, customer_type, wait in departures:
+            if time >= cutoff:
+                self._count(customer_type, wait)
+        self.lost_counts = {reason: {} for reason in LOSS_REASONS}
+        for time, type_code, reason in zip(
+            self._lost_times, self._lost_types, self._lost_reasons
+        ):
+            if time >= cutoff:
+                self._count_lost(self._series_types[type_code], LOSS_REASONS[reason])
+        if self.keep_customers:
+            self.customers = [
+                customer
+                for customer, (time, _, _) in zip(self.customers, departures)
+                if time >= cutoff
+            ]
+
+    def mser_cutoff(self, batch_size: int = 5) -> float:
+        """
+        Choose a warm-up cut-off with MSER on the wait-time series.
+
+        Args:
+            batch_size: Observations averaged per batch (5 for MSER-5)
+
+        Returns:
+            Departure time of the first wait kept (0.0 if none is deleted)
+        """
+        times, waits = self.wait_series()
+        deleted = mser_truncation(waits, batch_size)
+        return times[deleted] if deleted else 0.0
 
     def get_customer_count(self) -> int:
         """Get the total number of customers served."""
-        return len(self.customers)
+        return self.customer_count
 
     def get_customer_breakdown(self) -> Dict[str, int]:
         """Get breakdown of customers by type."""
-        from .customer import FoodAppCustomer, InHouseCustomer
-
-        inhouse_count = sum(1 for c in self.customers if isinstance(c, InHouseCustomer))
-        foodapp_count = sum(1 for c in self.customers if isinstance(c, FoodAppCustomer))
+        return {
+            "inhouse_customers": self.type_counts.get("inhouse", 0),
+            "foodapp_customers": self.type_counts.get("foodapp", 0),
+            "total_customers": self.customer_count,
+        }
 
+    def get_lost_breakdown(self) -> Dict[str, int]:
+        """Get the customers lost, by reason and by type."""
+        balked = sum(self.lost_counts[BALKED].values())
+        reneged = sum(self.lost_counts[RENEGED].values())
         return {
-            "inhouse_customers": inhouse_count,
-            "foodapp_customers": foodapp_count,
-            "total_customers": len(self.customers),
+            "balked_customers": balked,
+            "reneged_customers": reneged,
+            "lost_inhouse_customers": sum(
+                counts.get("inhouse", 0) for counts in self.lost_counts.values()
+            ),
+            "lost_foodapp_customers": sum(
+                counts.get("foodapp", 0) for counts in self.lost_counts.values()
+            ),
+            "lost_customers": balked + reneged,
         }
 
     def get_average_wait_time(self) -> float:
         """Calculate average wait time for all customers."""
-        if not self.customers:
-            return 0.0
+        return self.wait_time.mean
 
-        total_wait_time = 0.0
-        count = 0
-
-        for customer in self.customers:
-            if hasattr(customer, "service_time") and hasattr(customer, "arrival_time"):
-                if (
-                    customer.service_time is not None
-                    and customer.arrival_time is not None
-                ):
-                    total_wait_time += customer.service_time - customer.arrival_time
-                    count += 1
-
-        return total_wait_time / count if count > 0 else 0.0
+    def get_wait_time_summary(self) -> Dict[str, float]:
+        """Get the spread of wait times (all 0.0 if nobody was served)."""
+        if self.wait_time.count == 0:
+            return {"wait_time_std": 0.0, "min_wait_time": 0.0, "max_wait_time": 0.0}
+        return {
+            "wait_time_std": self.wait_time.std,
+            "min_wait_time": self.wait_time.minimum,
+            "max_wait_time": self.wait_time.maximum,
+        }
 
 
 class Restaurant:
@@ -75,31 +258,59 @@ class Restaurant:
 
     Attributes:
         env (simpy.Environment): The simulation environment
-        config (Config): Configuration settings for the restaurant
-        order_taker (simpy.Resource): Resource representing order taking staff
-        cook (simpy.Resource): Resource representing kitchen/cooking staff
-        server (simpy.Resource): Resource representing serving staff
+        config (ConfigLike): Configuration settings for the restaurant
+        order_taker (MonitoredResource): Resource representing order taking staff
+        cook (MonitoredResource): Resource representing kitchen/cooking staff
+        server (MonitoredResource): Resource representing serving staff
+        monitors (List[MonitoredResource]): Resources whose use is reported
         metrics (Metrics): Object to track customer and performance metrics
+        streams (RandomStreams): Random streams for the run
+        variates (Variates): Variate supplies drawn from the streams
     """
 
-    def __init__(self, env: simpy.Environment, config: Config) -> None:
+    def __init__(
+        self,
+        env: simpy.Environment,
+        config: ConfigLike,
+        streams: Optional[RandomStreams] = None,
+        keep_customers: bool = False,
+        trace: Optional[TraceRecorder] = None,
+        record_series: bool = False,
+        time_series_capacity: int = 0,
+    ) -> None:
         """
         Initialize the restaurant with staff resources and metrics tracking.
 
         Args:
             env (simpy.Environment): The simulation environment
-            config (Config): Configuration object with restaurant settings
+            config (ConfigLike): Configuration object with restaurant settings
+            streams (RandomStreams): Random streams for the run (unseeded if None)
+            keep_customers (bool): Whether metrics keep finished customer objects
+            trace (TraceRecorder): Columnar trace to append finished customers to
+            record_series (bool): Whether metrics record the departure series
+            time_series_capacity (int): Buckets per resource time series (0
+                records none)
         """
         self.env = env
         self.config = config
+        self.streams = streams or RandomStreams()
+        self.variates = Variates(self.streams, config)
 
         # Initialize staff resources based on configuration
-        self.order_taker = simpy.Resource(env, capacity=config.counter_servers)
-        self.cook = simpy.Resource(env, capacity=config.kitchen_servers)
-        self.server = simpy.Resource(env, capacity=config.counter_servers)
+        self.order_taker = MonitoredResource(
+            env, capacity=config.counter_servers, name="order_taker"
+        )
+        self.cook = MonitoredResource(env, capacity=config.kitchen_servers, name="cook")
+        self.server = MonitoredResource(
+            env, capacity=config.counter_servers, name="server"
+        )
+        self.monitors: List[MonitoredResource] = []
+        self.time_series_capacity = time_series_capacity
+        for resource in (self.order_taker, self.cook, self.server):
+            self.add_monitor(resource)
 
         # Initialize metrics tracking
-        self.metrics = Metrics()
+        self.metrics = Metrics(keep_customers, trace, record_series, self.monitors)
 
     def notify_driver_arrival(self) -> None:
         """
@@ -111,9 +322,45 @@ class Restaurant:
         # Placeholder for driver arrival handling
         pass
 
+    def add_monitor(self, resource: MonitoredResource) -> None:
+        """Report the use of another resource, such as the driver pool."""
+        self.monitors.append(resource)
+        if self.time_series_capacity:
+            resource.track(self.time_series_capacity)
+
     def reset_metrics(self) -> None:
         """Reset all restaurant metrics."""
         self.metrics.reset()
+        for monitor in self.monitors:
+            monitor.reset_monitor()
+
+    def get_resource_summary(
+        self, since: Optional[float] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Get the busy-time and queue integrals of every monitored resource.
+
+        Args:
+            since: Checkpoint time to measure from (last reset if None)
+
+        Returns:
+            dict: ``MonitoredResource.statistics`` per resource name
+        """
+        return {monitor.name: monitor.statistics(since) for monitor in self.monitors}
+
+    def get_time_series(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the tracked queue and in-system series of every resource.
+
+        Returns:
+            dict: ``TimeSeries.to_arrays`` up to now per resource name (empty
+            if no series were recorded)
+        """
+        return {
+            monitor.name: monitor.time_series.to_arrays(until=self.env.now)
+            for monitor in self.monitors
+            if monitor.time_series is not None
+        }
 
     def get_metrics_summary(self) -> Dict[str, Union[int, float]]:
         """
@@ -126,6 +373,8 @@ class Restaurant:
         return {
             "total_customers": self.metrics.get_customer_count(),
             "average_wait_time": self.metrics.get_average_wait_time(),
+            **self.metrics.get_wait_time_summary(),
             "inhouse_customers": breakdown["inhouse_customers"],
             "foodapp_customers": breakdown["foodapp_customers"],
+            **self.metrics.get_lost_breakdown(),
         }
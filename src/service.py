@@ -0,0 +1,330 @@
+"""
+Long-running local simulation service with a warm worker pool.
+
+Callers that simulate many times a minute would otherwise pay for interpreter
+start-up, imports and process creation on every call. The service keeps a
+pool of worker processes alive and answers JSON requests over HTTP on a local
+address::
+
+    POST /simulate  {"config": {"kitchen_servers": 3}, "replications": 10,
+                     "seed": 42}
+    GET  /health
+
+A request is split into replications that run on the shared pool, so
+concurrent requests are interleaved rather than queued behind each other.
+Replications already in flight for another request with the same config and
+seed (such as a dashboard refreshed twice) are not run again; the requests
+share them. With a result cache, replications simulated before are not run
+at all.
+"""
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import ResultCache, result_key
+from .config import DEFAULT_CONFIG, RunConfig
+from .estimation import confidence_interval
+from .random_streams import RandomStreams
+from .simulation import ReplicationTask, _run_replication
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest study one request may ask for
+MAX_REPLICATIONS = 1000
+
+REQUEST_KEYS = ("config", "replications", "seed", "confidence")
+
+
+def _warm_up() -> int:
+    """Run in each worker at start-up, so the first request pays nothing."""
+    return os.getpid()
+
+
+class SimulationService:
+    """
+    Runs simulation requests on a shared, warm pool of worker processes.
+
+    Thread-safe: the HTTP server calls ``simulate`` from one thread per
+    connection.
+
+    Attributes:
+        workers (int): Number of worker processes
+        cache (Optional[ResultCache]): Result cache consulted per replication
+        requests (int): Requests answered
+        replications_run (int): Replications submitted to the pool
+        replications_shared (int): Replications taken from another request
+            in flight instead of being run again
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        cache: Optional[ResultCache] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Start the service and warm up its workers.
+
+        Args:
+            workers: Number of worker processes
+            cache: Result cache consulted per replication
+            executor: Pool to run replications on instead of creating one
+                (it is not shut down by ``close``)
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        self.workers = workers
+        self.cache = cache
+        self.requests = 0
+        self.replications_run = 0
+        self.replications_shared = 0
+
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(workers)
+        self._lock = threading.Lock()
+        # Replications in flight, shared by every request that needs them
+        self._in_flight: Dict[ReplicationTask, Future] = {}
+
+        if self._owns_executor:
+            for future in [self._executor.submit(_warm_up) for _ in range(workers)]:
+                future.result()
+
+    def close(self) -> None:
+        """Shut the worker pool down."""
+        if self._owns_executor:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "SimulationService":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def simulate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the replications of one request.
+
+        Args:
+            request: ``config`` (overrides of the default settings),
+                ``replications`` (default 1), ``seed`` (random if absent)
+                and ``confidence`` (default 0.95)
+
+        Returns:
+            Dictionary with the seed, the per-run metrics in run order and a
+            ``summary`` of ``(mean, half_width)`` per numeric metric
+
+        Raises:
+            ValueError: If the request is malformed or its config invalid
+        """
+        config, replications, seed, confidence = parse_request(request)
+        tasks = [
+            ReplicationTask(config, seed, run_number)
+            for run_number in range(1, replications + 1)
+        ]
+        futures = [self._submit(task) for task in tasks]
+        all_metrics = [future.result() for future in futures]
+
+        with self._lock:
+            self.requests += 1
+        return {
+            "seed": seed,
+            "replications": replications,
+            "metrics": all_metrics,
+            "summary": summarize(all_metrics, confidence),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of the service and its cache."""
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "workers": self.workers,
+                "requests": self.requests,
+                "in_flight": len(self._in_flight),
+                "replications_run": self.replications_run,
+                "replications_shared": self.replications_shared,
+            }
+            if self.cache is not None:
+                stats["cache"] = self.cache.stats()
+        return stats
+
+    def _submit(self, task: ReplicationTask) -> Future:
+        """Return the future of a replication, sharing one already in flight."""
+        with self._lock:
+            future = self._in_flight.get(task)
+            if future is not None:
+                self.replications_shared += 1
+                return future
+
+            key = None
+            if self.cache is not None:
+                streams = RandomStreams(task.seed).spawn(task.run_number)
+                key = result_key(
+                    task.config, streams.seed, fused_journeys=task.fused_journeys
+                )
+                cached = self.cache.get(key)
+                if cached is not None:
+                    future = Future()
+                    future.set_result(cached)
+                    return future
+
+            future = self._executor.submit(_run_replication, task)
+            self._in_flight[task] = future
+            self.replications_run += 1
+        future.add_done_callback(lambda done: self._finish(task, key, done))
+        return future
+
+    def _finish(
+        self, task: ReplicationTask, key: Optional[str], future: Future
+    ) -> None:
+        """Retire a finished replication, caching its metrics."""
+        with self._lock:
+            self._in_flight.pop(task, None)
+            if key is not None and future.exception() is None:
+                self.cache.put(key, future.result())
+
+
+def parse_request(request: Any) -> Tuple[RunConfig, int, int, float]:
+    """
+    Validate a simulation request.
+
+    Returns:
+        The config, replication count, seed (drawn if absent) and confidence
+
+    Raises:
+        ValueError: If the request is malformed or its config invalid
+    """
+    if not isinstance(request, dict):
+        raise ValueError("the request must be a JSON object")
+    unknown = set(request) - set(REQUEST_KEYS)
+    if unknown:
+        raise ValueError(f"unknown request keys {sorted(unknown)}")
+
+    overrides = request.get("config", {})
+    if not isinstance(overrides, dict):
+        raise ValueError("config must be an object of settings")
+    for key, value in overrides.items():
+        if not isinstance(value, (bool, int, float, str)):
+            raise ValueError(
+                f"config setting {key} must be a number, string or boolean, "
+                f"got {value!r}"
+            )
+    try:
+        config = DEFAULT_CONFIG.replace(**overrides)
+    except TypeError as error:
+        raise ValueError(f"invalid config: {error}") from error
+
+    # JSON true and false would pass as integers, so bools are refused
+    replications = request.get("replications", 1)
+    if (
+        not isinstance(replications, int)
+        or isinstance(replications, bool)
+        or not 1 <= replications <= MAX_REPLICATIONS
+    ):
+        raise ValueError(
+            f"replications must be an integer from 1 to {MAX_REPLICATIONS}, "
+            f"got {replications!r}"
+        )
+    seed = request.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+        raise ValueError(f"seed must be an integer, got {seed!r}")
+    confidence = request.get("confidence", 0.95)
+    if not isinstance(confidence, (int, float)) or not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence!r}")
+    return config, replications, RandomStreams(seed).seed, confidence
+
+
+def summarize(
+    all_metrics: List[Dict[str, Any]], confidence: float
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Mean and confidence interval half-width of every numeric metric.
+
+    The half-width is None (JSON null) for a single replication.
+    """
+    summary: Dict[str, Dict[str, Optional[float]]] = {}
+    for key, value in all_metrics[0].items():
+        if key == "run_number" or not isinstance(value, (int, float)):
+            continue
+        mean, half_width = confidence_interval(
+            [float(metrics[key]) for metrics in all_metrics], confidence
+        )
+        summary[key] = {
+            "mean": mean,
+            "half_width": half_width if len(all_metrics) > 1 else None,
+        }
+    return summary
+
+
+class SimulationRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a ``SimulationService`` (set on the server)."""
+
+    server: "SimulationServer"
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._reply(200, {"status": "ok", **self.server.service.stats()})
+        else:
+            self._reply(404, {"error": f"no such path {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/simulate":
+            self._reply(404, {"error": f"no such path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            response = self.server.service.simulate(request)
+        except ValueError as error:
+            self._reply(400, {"error": str(error)})
+        except Exception as error:
+            logger.error(f"Simulation request failed: {error}", exc_info=True)
+            self._reply(500, {"error": str(error)})
+        else:
+            self._reply(200, response)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info(f"{self.address_string()} {format % args}")
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        encoded = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+class SimulationServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering simulation requests.
+
+    Attributes:
+        service (SimulationService): The service requests are run on
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        service: SimulationService,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+    ) -> None:
+        """
+        Bind the server (port 0 picks a free port, see ``server_address``).
+
+        Args:
+            service: The service requests are run on
+            host: Address to listen on (local only by default)
+            port: Port to listen on
+        """
+        super().__init__((host, port), SimulationRequestHandler)
+        self.service = service
@@ -2,23 +2,93 @@
 Restaurant simulation runner with customer generation and metrics reporting.
 """
 
+import cProfile
 import logging
-import random
-from typing import Dict, Generator, List, Optional, Tuple, Union
+import math
+import tracemalloc
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import ExitStack
+from time import perf_counter
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
 import simpy
 
-from .config import Config
-from .customer import FoodAppCustomer, InHouseCustomer
+from .cache import ResultCache, result_key
+from .campaign import DEFAULT_CAMPAIGN_DIR, CampaignLog
+from .config import Config, ConfigLike, RunConfig, fixed_warm_up, run_config
+from .customer import INHOUSE_PROBABILITY, FoodAppCustomer, InHouseCustomer
 from .driver import Driver
+from .estimation import (
+    confidence_interval,
+    lag1_autocorrelation,
+    lag1_test,
+    sample_variance,
+)
+from .instrumentation import CountingEnvironment
+from .profiling import ProfilingEnvironment, StageTimer, peak_memory_bytes
+from .random_streams import RandomStreams
 from .restaurant import Restaurant
+from .trace import TraceRecorder, run_trace_path
+from .vectorized import VectorizedEngine
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Runs in the pilot batch of a precision-driven study
+MIN_PILOT_RUNS = 5
 
-class SimulationConfig:
-    """Configuration class for simulation parameters."""
+# Replication engines: SimPy event simulation or vectorised NumPy recursions
+ENGINES = ("simpy", "vectorized")
+
+# Batch means: starting batch count, the fewest batches merging may leave, and
+# the metrics estimated per batch
+DEFAULT_BATCHES = 20
+MIN_BATCHES = 10
+BATCH_METRICS = ("average_wait_time", "customers_per_hour")
+
+# Customer stage generators timed by a profiled run
+PROFILED_STAGES = (
+    (InHouseCustomer, "journey"),
+    (InHouseCustomer, "place_order"),
+    (InHouseCustomer, "wait_for_food"),
+    (InHouseCustomer, "receive_food"),
+    (FoodAppCustomer, "journey"),
+    (FoodAppCustomer, "place_order"),
+    (FoodAppCustomer, "wait_for_food"),
+    (FoodAppCustomer, "schedule_pickup"),
+)
+
+
+class ReplicationTask(NamedTuple):
+    """Everything a worker process needs to run one replication."""
+
+    config: RunConfig
+    seed: int
+    run_number: int
+    antithetic: bool = False
+    trace_dir: Optional[str] = None
+    fused_journeys: bool = True
+
+
+class SimulationConfig(Config):
+    """
+    Configuration taking the common simulation parameters as arguments.
+
+    Unlike ``Config`` it deletes no warm-up unless one is set.
+    """
 
     def __init__(
         self,
@@ -40,20 +110,20 @@ class SimulationConfig:
             num_runs: Number of simulation runs to execute
             driver_capacity: Maximum number of drivers available
         """
-        self.duration: int = duration
-        self.sim_duration: int = duration  # Alias for compatibility
-        self.interarrival_time: float = interarrival_time
-        self.kitchen_servers: int = kitchen_servers
-        self.counter_servers: int = counter_servers
-        self.num_runs: int = num_runs
-        self.driver_capacity: int = driver_capacity
-
-        # Additional attributes for compatibility with existing code
-        self.kitchen_service_time: int = 3
-        self.counter_service_time: int = 1
-        self.mean_order_time: int = 2
-        self.mean_cook_time: int = 5
-        self.mean_service_time: int = 4
+        super().__init__(
+            sim_duration=duration,
+            interarrival_time=interarrival_time,
+            kitchen_servers=kitchen_servers,
+            counter_servers=counter_servers,
+            num_runs=num_runs,
+            driver_capacity=driver_capacity,
+            warm_up_time=0,
+        )
+
+    @property
+    def duration(self) -> int:
+        """Simulation duration in minutes (alias of ``sim_duration``)."""
+        return self.sim_duration
 
 
 class SimulationRunner:
@@ -63,11 +133,33 @@ class SimulationRunner:
     Handles customer arrival generation, simulation execution, and metrics collection.
     """
 
-    def __init__(self, config: Optional[Config] = None) -> None:
-        """Initialize the simulation runner with configuration."""
-        self.config: Config = config or Config()
+    def __init__(
+        self,
+        config: Optional[ConfigLike] = None,
+        fused_journeys: bool = True,
+        engine: str = "simpy",
+        cache: Optional[ResultCache] = None,
+    ) -> None:
+        """
+        Initialize the simulation runner with configuration.
+
+        Args:
+            config: Simulation configuration (defaults to Config())
+            fused_journeys: Run each customer's lifecycle as one SimPy process
+                (False starts a separate process for every stage)
+            engine: Engine for multi-run studies, one of ``ENGINES``; the
+                vectorized engine runs all replications in-process at once
+            cache: Result cache consulted before simulating a seeded run
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"unknown engine {engine!r}; choose from {ENGINES}")
+        self.config: ConfigLike = config or Config()
+        self.fused_journeys = fused_journeys
+        self.engine = engine
+        self.cache = cache
         self.restaurant: Optional[Restaurant] = None
         self.env: Optional[simpy.Environment] = None
+        self._environment_type = CountingEnvironment
 
     def customer_generator(
         self, env: simpy.Environment, restaurant: Restaurant, driver_pool: Driver
@@ -76,13 +168,15 @@ class SimulationRunner:
         Generate customers arriving at the restaurant over time.
 
         Creates both InHouseCustomer and FoodAppCustomer instances based on
-        configured arrival patterns.
+        configured arrival patterns, drawing from the restaurant's variates.
         """
         customer_id = 1
+        next_interarrival = restaurant.variates.interarrival
+        next_customer_type = restaurant.variates.customer_type
 
         while True:
             # Wait for next customer arrival
-            interarrival_time = random.expovariate(1.0 / self.config.interarrival_time)
+            interarrival_time = next_interarrival()
             yield env.timeout(interarrival_time)
 
             # Record arrival time
@@ -90,30 +184,51 @@ class SimulationRunner:
 
             # Randomly choose customer type (70% in-house, 30% food app)
             customer: Union[InHouseCustomer, FoodAppCustomer]
-            if random.random() < 0.7:
+            if next_customer_type() < INHOUSE_PROBABILITY:
                 customer = InHouseCustomer(
-                    env, customer_id, restaurant, arrival_time, self.config
+                    env, customer_id, restaurant, arrival_time, restaurant.config
                 )
             else:
                 customer = FoodAppCustomer(
-                    env, customer_id, restaurant, arrival_time, self.config, driver_pool
+                    env,
+                    customer_id,
+                    restaurant,
+                    arrival_time,
+                    restaurant.config,
+                    driver_pool,
                 )
 
             # Start the customer journey process
-            if isinstance(customer, InHouseCustomer):
+            if self.fused_journeys:
+                env.process(self._customer_journey(customer))
+            elif isinstance(customer, InHouseCustomer):
                 env.process(self._inhouse_customer_journey(customer))
             else:
                 env.process(self._foodapp_customer_journey(customer))
             customer_id += 1
 
+    def _customer_journey(
+        self, customer: Union[InHouseCustomer, FoodAppCustomer]
+    ) -> Generator[simpy.Event, None, None]:
+        """Process a customer's whole journey as a single SimPy process."""
+        try:
+            yield from customer.journey()
+        except Exception as e:
+            logger.error(f"Error in customer {customer.id} journey: {e}", exc_info=True)
+
     def _inhouse_customer_journey(
         self, customer: InHouseCustomer
     ) -> Generator[simpy.Event, None, None]:
         """Process the complete journey for an in-house customer."""
         try:
-            yield customer.env.process(customer.place_order())
-            yield customer.env.process(customer.wait_for_food())
-            yield customer.env.process(customer.receive_food())
+            if not customer.admit():
+                return
+            if not (yield customer.env.process(customer.place_order())):
+                return
+            if not (yield customer.env.process(customer.wait_for_food())):
+                return
+            if not (yield customer.env.process(customer.receive_food())):
+                return
             customer.leave()
         except Exception as e:
             logger.error(f"Error in customer {customer.id} journey: {e}", exc_info=True)
@@ -123,124 +238,842 @@ class SimulationRunner:
     ) -> Generator[simpy.Event, None, None]:
         """Process the complete journey for a food app customer."""
         try:
-            yield customer.env.process(customer.place_order())
-            yield customer.env.process(customer.wait_for_food())
+            if not customer.admit():
+                return
+            if not (yield customer.env.process(customer.place_order())):
+                return
+            if not (yield customer.env.process(customer.wait_for_food())):
+                return
             # Schedule pickup after food is ready
-            pickup_time = customer.env.now + 5  # 5 minute pickup delay
+            pickup_time = customer.env.now + customer.pickup_delay
             yield customer.env.process(customer.schedule_pickup(pickup_time))
             customer.leave()
         except Exception as e:
             logger.error(f"Error in customer {customer.id} journey: {e}", exc_info=True)
 
     def run_simulation(
-        self, duration: Optional[int] = None, verbose: bool = False
-    ) -> Tuple[Restaurant, Dict[str, Union[int, float]]]:
+        self,
+        duration: Optional[int] = None,
+        verbose: bool = False,
+        seed: Optional[int] = None,
+        streams: Optional[RandomStreams] = None,
+        trace: Optional[TraceRecorder] = None,
+        time_series_capacity: int = 0,
+    ) -> Tuple[Optional[Restaurant], Dict[str, Union[int, float]]]:
         """
         Run a single simulation for the specified duration.
 
+        A seeded run without a trace or time series is looked up in the result
+        cache first; on a hit nothing is simulated and no restaurant is
+        returned.
+
         Args:
             duration: Simulation duration in minutes (uses config default if None)
             verbose: Whether to print detailed simulation events
+            seed: Master seed for the run's random streams (random if None)
+            streams: Random streams to draw from (overrides seed if given)
+            trace: Recorder that finished customers are appended to
+            time_series_capacity: Buckets per resource time series, read with
+                ``Restaurant.get_time_series`` (0 records none)
 
         Returns:
-            Tuple of (Restaurant instance, metrics dictionary)
+            Tuple of (Restaurant instance or None on a cache hit, metrics
+            dictionary)
         """
-        duration = duration or self.config.sim_duration
+        # Freeze the settings, so the run sees them as they are now
+        config = run_config(self.config)
+        duration = duration or config.sim_duration
+        cache_key = None
+        if self.cache is not None and trace is None and not time_series_capacity:
+            if streams is not None or seed is not None:
+                streams = streams or RandomStreams(seed)
+                cache_key = result_key(
+                    config,
+                    streams.seed,
+                    streams.antithetic,
+                    "simpy",
+                    duration,
+                    self.fused_journeys,
+                )
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    if verbose:
+                        self._print_simulation_results(cached)
+                        self._print_cache_stats()
+                    return None, cached
+        streams = streams or RandomStreams(seed)
 
-        # Create SimPy environment, restaurant, and driver pool
-        env = simpy.Environment()
-        restaurant = Restaurant(env, self.config)
-        driver_pool = Driver(env, self.config)
+        warm_up = fixed_warm_up(config, duration)
+        auto_warm_up = config.warm_up_method == "mser5"
 
-        # Start customer generation process
-        env.process(self.customer_generator(env, restaurant, driver_pool))
+        restaurant = self._build_restaurant(
+            config, streams, trace, auto_warm_up, time_series_capacity
+        )
+        env = restaurant.env
+        if warm_up > 0:
+            env.process(self._end_warm_up(env, restaurant, warm_up))
 
         if verbose:
             logger.info(f"Starting simulation for {duration} minutes...")
             logger.info(
-                f"Restaurant capacity: {self.config.kitchen_servers} kitchen, {self.config.counter_servers} counter"
+                f"Restaurant capacity: {config.kitchen_servers} kitchen, {config.counter_servers} counter"
             )
             logger.info(
-                f"Customer arrival rate: every {self.config.interarrival_time} minutes on average"
+                f"Customer arrival rate: every {config.interarrival_time} minutes on average"
             )
             logger.info("-" * 60)
 
         # Run the simulation
         env.run(until=duration)
+        if trace is not None:
+            trace.flush()
+
+        if auto_warm_up:
+            warm_up = restaurant.metrics.mser_cutoff()
+            restaurant.metrics.truncate(warm_up)
 
         # Collect metrics
-        metrics = self._collect_metrics(restaurant, duration)
+        metrics = self._collect_metrics(restaurant, duration, warm_up)
+        if cache_key is not None:
+            self.cache.put(cache_key, metrics)
 
         if verbose:
             self._print_simulation_results(metrics)
+            if self.cache is not None:
+                self._print_cache_stats()
 
         return restaurant, metrics
 
+    def run_batch_means(
+        self,
+        num_batches: int = DEFAULT_BATCHES,
+        duration: Optional[float] = None,
+        seed: Optional[int] = None,
+        confidence: float = 0.95,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Estimate steady-state performance from one long run by batch means.
+
+        The run is warmed up once (by the configured fixed or MSER-5 cut-off)
+        and the rest is split into equal time batches whose metrics serve as
+        the observations of the confidence intervals, in place of independent
+        replications that each pay for their own warm-up. While a lag-1
+        autocorrelation test finds the batch means correlated, adjacent
+        batches are merged, down to ``MIN_BATCHES``.
+
+        Args:
+            num_batches: Number of batches to start from
+            duration: Length of the long run in minutes (if None, the warm-up
+                plus ``num_batches`` times the configured post-warm-up length)
+            seed: Master seed for the run's random streams (random if None)
+            confidence: Confidence level of the intervals
+            verbose: Whether to print the estimates
+
+        Returns:
+            Dictionary with the run layout, the per-batch metrics, the lag-1
+            autocorrelation per metric, whether the batches passed the
+            independence test, and ``(mean, half_width)`` per metric in
+            ``estimates``
+        """
+        if self.engine != "simpy":
+            raise ValueError("batch means runs on the simpy engine")
+        if num_batches < MIN_BATCHES:
+            raise ValueError(
+                f"num_batches must be at least {MIN_BATCHES}, got {num_batches}"
+            )
+        config = run_config(self.config)
+        if duration is None:
+            sim_duration = config.sim_duration
+            warm_up = fixed_warm_up(config, sim_duration)
+            duration = warm_up + num_batches * (sim_duration - warm_up)
+        warm_up = fixed_warm_up(config, duration)
+        streams = RandomStreams(seed)
+
+        if verbose:
+            logger.info(
+                f"Running one {duration} minute run for {num_batches} batches "
+                f"(seed {streams.seed})..."
+            )
+        restaurant = self._build_restaurant(config, streams, record_series=True)
+        restaurant.env.run(until=duration)
+        if config.warm_up_method == "mser5":
+            warm_up = restaurant.metrics.mser_cutoff()
+
+        departures = restaurant.metrics.departures()
+        batches = _batch_metrics(departures, warm_up, duration, num_batches)
+        while True:
+            correlations = {
+                metric: lag1_autocorrelation([batch[metric] for batch in batches])
+                for metric in BATCH_METRICS
+            }
+            independent = all(
+                lag1_test([batch[metric] for batch in batches])
+                for metric in BATCH_METRICS
+            )
+            if independent or len(batches) // 2 < MIN_BATCHES:
+                break
+            batches = _batch_metrics(departures, warm_up, duration, len(batches) // 2)
+
+        result = {
+            "seed": streams.seed,
+            "simulation_duration": duration,
+            "warm_up_time": warm_up,
+            "num_batches": len(batches),
+            "batch_duration": (duration - warm_up) / len(batches),
+            "confidence": confidence,
+            "lag1_autocorrelation": correlations,
+            "independent": independent,
+            "batches": batches,
+            "estimates": {
+                metric: confidence_interval(
+                    [batch[metric] for batch in batches], confidence
+                )
+                for metric in BATCH_METRICS
+            },
+        }
+        if verbose:
+            self._print_batch_means_results(result)
+        return result
+
+    def profile_simulation(
+        self,
+        duration: Optional[int] = None,
+        seed: Optional[int] = None,
+        cprofile_path: Optional[str] = None,
+        tracemalloc_path: Optional[str] = None,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run one simulation in-process and measure where its cost goes.
+
+        Scheduled events are counted by kind, and the time spent resuming
+        the customer generator and each customer stage is measured (stages
+        delegated to are not counted again in the journey). The result
+        cache is bypassed. cProfile and tracemalloc slow the run down, so
+        the timings of a run with a dump are not comparable with one without.
+
+        Args:
+            duration: Simulation duration in minutes (uses config default if None)
+            seed: Master seed for the run's random streams (random if None)
+            cprofile_path: File to dump cProfile statistics to (pstats format)
+            tracemalloc_path: File to dump a tracemalloc snapshot to
+            verbose: Whether to print the profile
+
+        Returns:
+            Dictionary with the wall-clock time, event counts and rates, event
+            counts per customer served by kind, generator and stage times,
+            the process's peak memory, and the run's ``metrics``
+        """
+        runner = SimulationRunner(self.config, self.fused_journeys)
+        runner._environment_type = ProfilingEnvironment
+        timer = StageTimer()
+        targets = ((SimulationRunner, "customer_generator"),) + PROFILED_STAGES
+
+        profiler = cProfile.Profile() if cprofile_path else None
+        traced_peak = None
+        with timer.instrument(targets):
+            if tracemalloc_path:
+                tracemalloc.start()
+            try:
+                start = perf_counter()
+                if profiler is not None:
+                    profiler.enable()
+                restaurant, metrics = runner.run_simulation(duration, seed=seed)
+                if profiler is not None:
+                    profiler.disable()
+                wall_time = perf_counter() - start
+                if tracemalloc_path:
+                    tracemalloc.take_snapshot().dump(tracemalloc_path)
+                    traced_peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                if tracemalloc_path:
+                    tracemalloc.stop()
+        if profiler is not None:
+            profiler.dump_stats(cprofile_path)
+
+        env = cast(ProfilingEnvironment, restaurant.env)
+        customers = metrics["total_customers_served"]
+        stage_labels = [f"{cls.__name__}.{name}" for cls, name in PROFILED_STAGES]
+        profile = {
+            "wall_time": wall_time,
+            "scheduled_events": env.events_scheduled,
+            "events_per_second": (
+                env.events_scheduled / wall_time if wall_time > 0 else 0.0
+            ),
+            "customers_served": customers,
+            "event_counts": dict(env.event_counts),
+            "events_per_customer": {
+                kind: count / customers if customers else 0.0
+                for kind, count in env.event_counts.items()
+            },
+            "generator_time": timer.seconds.get(
+                "SimulationRunner.customer_generator", 0.0
+            ),
+            "stage_time": {
+                label: timer.seconds.get(label, 0.0) for label in stage_labels
+            },
+            "peak_memory": peak_memory_bytes(),
+            "traced_peak_memory": traced_peak,
+            "cprofile_path": cprofile_path,
+            "tracemalloc_path": tracemalloc_path,
+            "metrics": metrics,
+        }
+        if verbose:
+            self._print_profile_results(profile)
+        return profile
+
     def run_multiple_simulations(
-        self, num_runs: Optional[int] = None, verbose: bool = False
+        self,
+        num_runs: Optional[int] = None,
+        verbose: bool = False,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        target_half_width: Optional[float] = None,
+        metric: str = "average_wait_time",
+        confidence: float = 0.95,
+        max_runs: int = 1000,
+        trace_dir: Optional[str] = None,
     ) -> List[Dict[str, Union[int, float]]]:
         """
         Run multiple simulation runs and collect aggregate statistics.
 
+        Each run draws from its own substreams spawned from ``seed`` by run
+        number, so the results do not depend on how many worker processes
+        execute them.
+
+        When ``target_half_width`` is given, runs are launched in batches until
+        the confidence interval half-width of ``metric`` falls to the target
+        or ``max_runs`` is reached, and ``num_runs`` is ignored.
+
         Args:
             num_runs: Number of simulation runs (uses config default if None)
             verbose: Whether to print progress and results
+            workers: Number of worker processes (1 runs everything in-process)
+            seed: Master seed for the runs (a random one is drawn if None)
+            target_half_width: Precision to stop at (fixed run count if None)
+            metric: Metrics key whose confidence interval is checked
+            confidence: Confidence level of the interval
+            max_runs: Cap on the number of runs in precision mode
+            trace_dir: Directory to write one customer trace per run into
 
         Returns:
-            List of metrics dictionaries from each run
+            List of metrics dictionaries from each run, ordered by run number
         """
-        num_runs = num_runs or self.config.num_runs
-        all_metrics: List[Dict[str, Union[int, float]]] = []
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+
+        config = run_config(self.config)
+        num_runs = num_runs or config.num_runs
+        # Draw the master seed up front so workers all spawn from the same one
+        seed = RandomStreams(seed).seed
+
+        if target_half_width is not None:
+            if verbose:
+                logger.info(
+                    f"Running until the {metric} half-width is at most "
+                    f"{target_half_width} (max {max_runs} runs, seed {seed})..."
+                )
+                logger.info("=" * 60)
+            all_metrics = self._run_until_precision(
+                config,
+                seed,
+                workers,
+                target_half_width,
+                metric,
+                confidence,
+                max_runs,
+                trace_dir,
+            )
+        else:
+            if verbose:
+                logger.info(f"Running {num_runs} simulation runs (seed {seed})...")
+                logger.info("=" * 60)
+            tasks = [
+                self._task(config, seed, run_num, trace_dir=trace_dir)
+                for run_num in range(1, num_runs + 1)
+            ]
+            all_metrics = self._run_replications(tasks, workers, verbose)
 
         if verbose:
-            logger.info(f"Running {num_runs} simulation runs...")
-            logger.info("=" * 60)
+            self._print_aggregate_results(all_metrics)
+            if target_half_width is not None:
+                self._print_precision_results(
+                    all_metrics, target_half_width, metric, confidence
+                )
+            if self.cache is not None:
+                self._print_cache_stats()
 
-        for run_num in range(1, num_runs + 1):
-            if verbose and run_num % 10 == 0:
-                logger.info(f"Completed {run_num}/{num_runs} runs...")
+        return all_metrics
 
-            _, metrics = self.run_simulation(verbose=False)
-            metrics["run_number"] = run_num
-            all_metrics.append(metrics)
+    def run_campaign(
+        self,
+        campaign_id: str,
+        num_runs: Optional[int] = None,
+        verbose: bool = False,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        directory: str = DEFAULT_CAMPAIGN_DIR,
+    ) -> List[Dict[str, Union[int, float]]]:
+        """
+        Run replications as a campaign that survives being interrupted.
+
+        Every finished replication is appended to the campaign's log (see
+        ``CampaignLog``) before the next result is taken. Run again with the
+        same ID after a crash, the campaign skips the replications already
+        logged, and the result equals that of ``run_multiple_simulations``
+        with the campaign's seed.
+
+        Args:
+            campaign_id: Name of the campaign and of its log file
+            num_runs: Number of simulation runs (uses config default if None)
+            verbose: Whether to print progress and results
+            workers: Number of worker processes (1 runs everything in-process)
+            seed: Master seed (a new campaign draws one; a resumed one keeps
+                its own)
+            directory: Directory holding campaign logs
+
+        Returns:
+            List of metrics dictionaries from each run, ordered by run number
+
+        Raises:
+            ValueError: If the campaign was started with another config, seed,
+                engine or journey mode
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+
+        config = run_config(self.config)
+        num_runs = num_runs or config.num_runs
+        with CampaignLog(directory, campaign_id) as log:
+            log.open(config, seed, self.engine, self.fused_journeys)
+            tasks = [
+                self._task(config, log.seed, run_num)
+                for run_num in range(1, num_runs + 1)
+                if run_num not in log.completed
+            ]
+            if verbose:
+                logger.info(
+                    f"Campaign {campaign_id}: {num_runs - len(tasks)}/{num_runs} "
+                    f"runs already logged in {log.path} (seed {log.seed})"
+                )
+                logger.info("=" * 60)
+            for done, metrics in enumerate(self.iter_replications(tasks, workers), 1):
+                log.append(metrics)
+                if verbose and done % 10 == 0:
+                    logger.info(f"Completed {done}/{len(tasks)} remaining runs...")
+            all_metrics = [log.completed[run_num] for run_num in range(1, num_runs + 1)]
 
         if verbose:
             self._print_aggregate_results(all_metrics)
+            if self.cache is not None:
+                self._print_cache_stats()
+        return all_metrics
+
+    def _run_until_precision(
+        self,
+        config: RunConfig,
+        seed: int,
+        workers: int,
+        target_half_width: float,
+        metric: str,
+        confidence: float,
+        max_runs: int,
+        trace_dir: Optional[str] = None,
+    ) -> List[Dict[str, Union[int, float]]]:
+        """
+        Launch batches of runs until the metric's CI reaches the target.
+
+        After a pilot batch, each batch is sized from the current half-width
+        so that the target is expected to be met, rounded up to a multiple of
+        the worker count.
+        """
+        if target_half_width <= 0:
+            raise ValueError(
+                f"target_half_width must be positive, got {target_half_width}"
+            )
+        if max_runs < 1:
+            raise ValueError(f"max_runs must be at least 1, got {max_runs}")
+
+        all_metrics: List[Dict[str, Union[int, float]]] = []
+        batch_size = max(MIN_PILOT_RUNS, workers)
+
+        with ExitStack() as stack:
+            executor = None
+            if workers > 1:
+                executor = stack.enter_context(ProcessPoolExecutor(workers))
+
+            while len(all_metrics) < max_runs:
+                first_run = len(all_metrics) + 1
+                last_run = min(len(all_metrics) + batch_size, max_runs)
+                tasks = [
+                    self._task(config, seed, run_num, trace_dir=trace_dir)
+                    for run_num in range(first_run, last_run + 1)
+                ]
+                all_metrics.extend(
+                    self._run_replications(tasks, workers, executor=executor)
+                )
+
+                if metric not in all_metrics[0]:
+                    raise ValueError(f"unknown metric {metric!r}")
+                runs = len(all_metrics)
+                _, half_width = confidence_interval(
+                    [float(m[metric]) for m in all_metrics], confidence
+                )
+                logger.debug(f"{runs} runs: {metric} half-width {half_width:.4f}")
+                if half_width <= target_half_width or runs >= max_runs:
+                    break
+
+                if math.isinf(half_width):
+                    # Too few runs for an interval yet; run another pilot batch
+                    needed = runs + max(MIN_PILOT_RUNS, workers)
+                else:
+                    # Half-width shrinks with the square root of the run count
+                    needed = math.ceil(runs * (half_width / target_half_width) ** 2)
+                batch_size = max(needed - runs, 1)
+                batch_size = math.ceil(batch_size / workers) * workers
+
+        return all_metrics
+
+    def compare_configs(
+        self,
+        configs: Sequence[ConfigLike],
+        num_runs: Optional[int] = None,
+        metric: str = "average_wait_time",
+        antithetic: bool = False,
+        confidence: float = 0.95,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        verbose: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Compare configurations on common random numbers.
+
+        Replication ``n`` of every configuration draws from the same spawned
+        substreams, so the per-replication differences against the first
+        (baseline) configuration are paired and far less noisy than
+        differences between independent runs. In antithetic mode every
+        replication is the average of a run and its antithetic twin.
+
+        Args:
+            configs: Configurations to compare; the first is the baseline
+            num_runs: Replications per configuration (uses config default if None)
+            metric: Metrics key to compare
+            antithetic: Whether to pair each run with an antithetic run
+            confidence: Confidence level of the reported intervals
+            workers: Number of worker processes (1 runs everything in-process)
+            seed: Master seed shared by all configurations (random if None)
+            verbose: Whether to print progress and results
+
+        Returns:
+            Dictionary with the per-configuration means and the paired
+            differences against the baseline, each with a CI half-width
+        """
+        if len(configs) < 2:
+            raise ValueError("compare_configs needs at least two configurations")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+
+        num_runs = num_runs or self.config.num_runs
+        seed = RandomStreams(seed).seed
+        runs_per_replication = 2 if antithetic else 1
+
+        tasks: List[ReplicationTask] = []
+        for config in map(run_config, configs):
+            for run_num in range(1, num_runs + 1):
+                tasks.append(self._task(config, seed, run_num))
+                if antithetic:
+                    tasks.append(self._task(config, seed, run_num, antithetic=True))
+
+        if verbose:
+            logger.info(
+                f"Comparing {len(configs)} configurations over {num_runs} "
+                f"replications (seed {seed})..."
+            )
+        results = self._run_replications(tasks, workers, verbose)
+        if metric not in results[0]:
+            raise ValueError(f"unknown metric {metric!r}")
+
+        # Average antithetic pairs so each configuration has one value per run
+        observations: List[List[float]] = []
+        for values in _chunks([float(m[metric]) for m in results], len(configs)):
+            observations.append(
+                [sum(pair) / runs_per_replication for pair in _chunks(values, num_runs)]
+            )
+
+        comparison: Dict[str, Any] = {
+            "metric": metric,
+            "num_runs": num_runs,
+            "antithetic": antithetic,
+            "confidence": confidence,
+            "seed": seed,
+            "configs": [],
+            "differences": [],
+        }
+        for values in observations:
+            mean, half_width = confidence_interval(values, confidence)
+            comparison["configs"].append({"mean": mean, "half_width": half_width})
+
+        baseline = observations[0]
+        for index, values in enumerate(observations[1:], start=1):
+            differences = [value - base for value, base in zip(values, baseline)]
+            mean, half_width = confidence_interval(differences, confidence)
+            independent_variance = sample_variance(values) + sample_variance(baseline)
+            comparison["differences"].append(
+                {
+                    "config": index,
+                    "mean": mean,
+                    "half_width": half_width,
+                    "lower": mean - half_width,
+                    "upper": mean + half_width,
+                    # Below 1 when pairing beats independent sampling
+                    "variance_ratio": (
+                        sample_variance(differences) / independent_variance
+                        if independent_variance > 0
+                        else 1.0
+                    ),
+                }
+            )
+
+        if verbose:
+            self._print_comparison_results(comparison)
+
+        return comparison
+
+    def _task(
+        self,
+        config: ConfigLike,
+        seed: int,
+        run_number: int,
+        antithetic: bool = False,
+        trace_dir: Optional[str] = None,
+    ) -> ReplicationTask:
+        """Build a replication task carrying this runner's options."""
+        return ReplicationTask(
+            run_config(config),
+            seed,
+            run_number,
+            antithetic,
+            trace_dir,
+            self.fused_journeys,
+        )
+
+    def _run_replications(
+        self,
+        tasks: List[ReplicationTask],
+        workers: int,
+        verbose: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> List[Dict[str, Union[int, float]]]:
+        """Run the given replications serially or over a process pool."""
+        results = self.iter_replications(tasks, workers, executor)
+        return self._gather_results(results, len(tasks), verbose)
 
+    def iter_replications(
+        self,
+        tasks: Sequence[ReplicationTask],
+        workers: int = 1,
+        executor: Optional[Executor] = None,
+    ) -> Iterator[Dict[str, Union[int, float]]]:
+        """
+        Yield the results of the given replications in task order.
+
+        Results are yielded as soon as they and all earlier ones are done, so
+        callers can aggregate while later replications are still running.
+        Replications found in the result cache are not simulated again, and
+        new results are added to it.
+
+        Args:
+            tasks: Replications to run
+            workers: Number of worker processes (1 runs everything in-process)
+            executor: Pool to submit to instead of creating one
+        """
+        if self.cache is None:
+            yield from self._simulate_replications(tasks, workers, executor)
+            return
+
+        keys = [self._cache_key(task) for task in tasks]
+        cached = [
+            None if task.trace_dir is not None else self.cache.get(key)
+            for task, key in zip(tasks, keys)
+        ]
+        missing = [task for task, metrics in zip(tasks, cached) if metrics is None]
+        results = self._simulate_replications(missing, workers, executor)
+
+        for key, metrics in zip(keys, cached):
+            if metrics is None:
+                metrics = next(results)
+                self.cache.put(key, metrics)
+            yield metrics
+
+    def _simulate_replications(
+        self,
+        tasks: Sequence[ReplicationTask],
+        workers: int,
+        executor: Optional[Executor] = None,
+    ) -> Iterator[Dict[str, Union[int, float]]]:
+        """
+        Simulate replications in task order, serially or over a process pool.
+
+        A pool is created for the call unless an ``executor`` is passed in to
+        be reused across several batches. The vectorized engine ignores the
+        workers and runs every replication in-process.
+        """
+        if not tasks:
+            return
+        if self.engine == "vectorized":
+            yield from self._run_vectorized(list(tasks))
+            return
+
+        if workers == 1:
+            yield from map(_run_replication, tasks)
+            return
+
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                yield from self._simulate_replications(tasks, workers, pool)
+            return
+
+        chunksize = max(1, len(tasks) // (workers * 4))
+        # Executor.map yields results in submission order, i.e. task order
+        yield from executor.map(_run_replication, tasks, chunksize=chunksize)
+
+    def _cache_key(self, task: ReplicationTask) -> str:
+        """Cache key of a replication, from the streams it will draw from."""
+        streams = RandomStreams(task.seed).spawn(task.run_number)
+        return result_key(
+            task.config,
+            streams.seed,
+            task.antithetic,
+            self.engine,
+            fused_journeys=task.fused_journeys,
+        )
+
+    def _run_vectorized(
+        self, tasks: List[ReplicationTask]
+    ) -> List[Dict[str, Union[int, float]]]:
+        """Run tasks with the vectorized engine, one batch per config and mode."""
+        if any(task.trace_dir is not None for task in tasks):
+            raise ValueError("the vectorized engine does not write customer traces")
+
+        batches: Dict[Tuple[RunConfig, int, bool], List[int]] = {}
+        for index, task in enumerate(tasks):
+            # Frozen configs compare by value, so equal configs share a batch
+            key = (task.config, task.seed, task.antithetic)
+            batches.setdefault(key, []).append(index)
+
+        results: List[Dict[str, Union[int, float]]] = [{} for _ in tasks]
+        for indices in batches.values():
+            first = tasks[indices[0]]
+            batch = VectorizedEngine(first.config).run_replications(
+                first.seed,
+                [tasks[index].run_number for index in indices],
+                first.antithetic,
+            )
+            for index, metrics in zip(indices, batch):
+                results[index] = metrics
+        return results
+
+    def _gather_results(
+        self,
+        results: Iterable[Dict[str, Union[int, float]]],
+        total: int,
+        verbose: bool,
+    ) -> List[Dict[str, Union[int, float]]]:
+        """Collect replication results, logging progress every ten runs."""
+        all_metrics: List[Dict[str, Union[int, float]]] = []
+        for metrics in results:
+            all_metrics.append(metrics)
+            if verbose and len(all_metrics) % 10 == 0:
+                logger.info(f"Completed {len(all_metrics)}/{total} runs...")
         return all_metrics
 
+    def _build_restaurant(
+        self,
+        config: RunConfig,
+        streams: RandomStreams,
+        trace: Optional[TraceRecorder] = None,
+        record_series: bool = False,
+        time_series_capacity: int = 0,
+    ) -> Restaurant:
+        """Create the environment, restaurant and drivers and start arrivals."""
+        env = self._environment_type()
+        restaurant = Restaurant(
+            env,
+            config,
+            streams,
+            trace=trace,
+            record_series=record_series,
+            time_series_capacity=time_series_capacity,
+        )
+        driver_pool = Driver(env, config)
+        restaurant.add_monitor(driver_pool)
+        env.process(self.customer_generator(env, restaurant, driver_pool))
+        return restaurant
+
+    def _end_warm_up(
+        self, env: simpy.Environment, restaurant: Restaurant, warm_up: float
+    ) -> Generator[simpy.Event, None, None]:
+        """Discard everything recorded before the warm-up cut-off."""
+        yield env.timeout(warm_up)
+        restaurant.reset_metrics()
+
     def _collect_metrics(
-        self, restaurant: Restaurant, duration: int
+        self, restaurant: Restaurant, duration: int, warm_up: float = 0.0
     ) -> Dict[str, Union[int, float]]:
-        """Collect simulation metrics from the restaurant."""
+        """Collect simulation metrics from the restaurant after the warm-up."""
+        config = restaurant.config
         metrics = restaurant.get_metrics_summary()
+        # After a fixed warm-up the monitors were reset at the cut-off; an
+        # MSER-5 cut-off is a departure time, where they were checkpointed
+        since = warm_up if config.warm_up_method == "mser5" else None
+        resources = restaurant.get_resource_summary(since)
 
         # Add simulation-level metrics
         total_customers = metrics.get("total_customers", 0)
+        scheduled_events = getattr(restaurant.env, "events_scheduled", 0)
+        observed = duration - warm_up
         metrics.update(
             {
                 "simulation_duration": duration,
+                "warm_up_time": warm_up,
                 "total_customers_served": total_customers,
                 "customers_per_hour": (
-                    (total_customers / duration) * 60 if duration > 0 else 0
+                    (total_customers / observed) * 60 if observed > 0 else 0
+                ),
+                "scheduled_events": scheduled_events,
+                "events_per_customer": (
+                    scheduled_events / total_customers if total_customers else 0.0
                 ),
                 "kitchen_utilization": self._calculate_utilization(
-                    metrics.get("total_kitchen_time", 0),
-                    duration,
-                    self.config.kitchen_servers,
+                    resources["cook"]["busy_time"],
+                    observed,
+                    config.kitchen_servers,
                 ),
+                # Order taking and serving share the counter staff
                 "counter_utilization": self._calculate_utilization(
-                    metrics.get("total_counter_time", 0),
-                    duration,
-                    self.config.counter_servers,
+                    resources["order_taker"]["busy_time"]
+                    + resources["server"]["busy_time"],
+                    observed,
+                    2 * config.counter_servers,
+                ),
+                "driver_utilization": self._calculate_utilization(
+                    resources["driver"]["busy_time"],
+                    observed,
+                    config.driver_capacity,
                 ),
             }
         )
+        for name, statistics in resources.items():
+            metrics[f"{name}_average_queue"] = (
+                statistics["queue_time"] / observed if observed > 0 else 0.0
+            )
+            metrics[f"{name}_max_queue"] = statistics["max_queue"]
 
         return metrics
 
     def _calculate_utilization(
-        self, total_service_time: float, duration: int, num_servers: int
+        self, total_service_time: float, duration: float, num_servers: int
     ) -> float:
         """Calculate resource utilization percentage."""
         if duration == 0 or num_servers == 0:
@@ -253,6 +1086,7 @@ class SimulationRunner:
         print("SIMULATION RESULTS")
         print("=" * 60)
         print(f"Duration: {metrics['simulation_duration']} minutes")
+        print(f"Warm-up deleted: {metrics.get('warm_up_time', 0):.1f} minutes")
         print(f"Total customers served: {metrics['total_customers_served']}")
         print(f"Customers per hour: {metrics['customers_per_hour']:.1f}")
         print()
@@ -268,12 +1102,38 @@ class SimulationRunner:
         print("RESOURCE UTILIZATION:")
         print(f"  Kitchen: {metrics['kitchen_utilization']:.1f}%")
         print(f"  Counter: {metrics['counter_utilization']:.1f}%")
+        print(f"  Drivers: {metrics.get('driver_utilization', 0):.1f}%")
+        print()
+        print("QUEUES (average / longest):")
+        for name in ("order_taker", "cook", "server", "driver"):
+            if f"{name}_average_queue" in metrics:
+                print(
+                    f"  {name}: {metrics[f'{name}_average_queue']:.2f} / "
+                    f"{metrics[f'{name}_max_queue']}"
+                )
         print()
         print("CUSTOMER BREAKDOWN:")
         print(f"  In-house customers: {metrics.get('inhouse_customers', 0)}")
         print(f"  Food app customers: {metrics.get('foodapp_customers', 0)}")
+        if metrics.get("lost_customers"):
+            print(
+                f"  Lost customers: {metrics['lost_customers']} "
+                f"({metrics['balked_customers']} balked, "
+                f"{metrics['reneged_customers']} reneged)"
+            )
         print("=" * 60)
 
+    def _print_cache_stats(self) -> None:
+        """Print the result cache counters."""
+        if self.cache is None:
+            return
+        stats = self.cache.stats()
+        print(
+            f"CACHE: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['evictions']} evictions, {stats['entries']} entries "
+            f"({stats['size_bytes'] / 1024:.1f} KiB)"
+        )
+
     def _print_aggregate_results(
         self, all_metrics: List[Dict[str, Union[int, float]]]
     ) -> None:
@@ -303,3 +1163,165 @@ class SimulationRunner:
         print(f"Average kitchen utilization: {avg_kitchen_util:.1f}%")
         print(f"Average counter utilization: {avg_counter_util:.1f}%")
         print("=" * 60)
+
+    def _print_profile_results(self, profile: Dict[str, Any]) -> None:
+        """Print where a profiled run spent its events, time and memory."""
+        wall_time = profile["wall_time"]
+        print("\n" + "=" * 60)
+        print("PROFILE")
+        print("=" * 60)
+        print(f"Simulated: {profile['metrics']['simulation_duration']} minutes")
+        print(f"Wall-clock time: {wall_time:.3f} s")
+        print(
+            f"Scheduled events: {profile['scheduled_events']} "
+            f"({profile['events_per_second']:,.0f} per second)"
+        )
+        print(f"Customers served: {profile['customers_served']}")
+        print()
+        print("EVENTS PER CUSTOMER SERVED:")
+        for kind, count in profile["events_per_customer"].items():
+            print(f"  {kind}: {count:.2f}")
+        print()
+        print("TIME IN GENERATORS (exclusive):")
+        timings = {"customer_generator": profile["generator_time"]}
+        timings.update(profile["stage_time"])
+        for label, seconds in timings.items():
+            share = seconds / wall_time * 100 if wall_time > 0 else 0.0
+            print(f"  {label}: {seconds * 1000:.1f} ms ({share:.1f}%)")
+        print()
+        print(f"Peak memory (process): {profile['peak_memory'] / 2**20:.1f} MiB")
+        if profile["traced_peak_memory"] is not None:
+            print(
+                "Peak memory (traced during run): "
+                f"{profile['traced_peak_memory'] / 2**20:.1f} MiB"
+            )
+        for label, key in (
+            ("cProfile", "cprofile_path"),
+            ("tracemalloc", "tracemalloc_path"),
+        ):
+            if profile[key]:
+                print(f"{label} dump written to {profile[key]}")
+        print("=" * 60)
+
+    def _print_batch_means_results(self, result: Dict[str, Any]) -> None:
+        """Print the batch-means estimates of a single long run."""
+        level = result["confidence"] * 100
+        print("\n" + "=" * 60)
+        print(
+            f"BATCH MEANS ({result['num_batches']} batches of "
+            f"{result['batch_duration']:.1f} minutes)"
+        )
+        print("=" * 60)
+        print(f"Run length: {result['simulation_duration']} minutes")
+        print(f"Warm-up deleted: {result['warm_up_time']:.1f} minutes")
+        for metric, (mean, half_width) in result["estimates"].items():
+            print(
+                f"  {metric}: {mean:.3f} ± {half_width:.3f} ({level:.0f}% CI, "
+                f"lag-1 r = {result['lag1_autocorrelation'][metric]:.2f})"
+            )
+        if not result["independent"]:
+            print("  Warning: batch means are autocorrelated; use a longer run")
+        print("=" * 60)
+
+    def _print_precision_results(
+        self,
+        all_metrics: List[Dict[str, Union[int, float]]],
+        target_half_width: float,
+        metric: str,
+        confidence: float,
+    ) -> None:
+        """Print the precision reached by a precision-driven study."""
+        mean, half_width = confidence_interval(
+            [float(m[metric]) for m in all_metrics], confidence
+        )
+        status = "reached" if half_width <= target_half_width else "NOT reached"
+
+        print(f"PRECISION ({confidence * 100:.0f}% CI on {metric}):")
+        print(f"  Estimate: {mean:.3f} ± {half_width:.3f}")
+        print(f"  Target half-width {target_half_width} {status}")
+        print(f"  Runs used: {len(all_metrics)}")
+        print("=" * 60)
+
+    def _print_comparison_results(self, comparison: Dict[str, Any]) -> None:
+        """Print per-configuration means and paired differences."""
+        level = comparison["confidence"] * 100
+        mode = "antithetic pairs" if comparison["antithetic"] else "replications"
+
+        print("\n" + "=" * 60)
+        print(
+            f"CONFIG COMPARISON ({comparison['num_runs']} {mode}, "
+            f"common random numbers)"
+        )
+        print("=" * 60)
+        print(f"Metric: {comparison['metric']}")
+        for index, summary in enumerate(comparison["configs"]):
+            print(
+                f"  Config {index}: {summary['mean']:.3f} "
+                f"± {summary['half_width']:.3f}"
+            )
+        print()
+        print(f"PAIRED DIFFERENCES VS CONFIG 0 ({level:.0f}% CI):")
+        for difference in comparison["differences"]:
+            print(
+                f"  Config {difference['config']}: {difference['mean']:.3f} "
+                f"[{difference['lower']:.3f}, {difference['upper']:.3f}], "
+                f"variance ratio {difference['variance_ratio']:.2f}"
+            )
+        print("=" * 60)
+
+
+def _run_replication(task: ReplicationTask) -> Dict[str, Union[int, float]]:
+    """
+    Run one replication on the substreams spawned for its run number.
+
+    Defined at module level so it can be pickled to worker processes.
+    """
+    streams = RandomStreams(task.seed).spawn(task.run_number)
+    if task.antithetic:
+        streams = streams.antithetic_twin()
+
+    runner = SimulationRunner(task.config, task.fused_journeys)
+    if task.trace_dir is None:
+        _, metrics = runner.run_simulation(streams=streams)
+    else:
+        trace_path = run_trace_path(task.trace_dir, task.run_number)
+        with TraceRecorder(trace_path, task.run_number) as trace:
+            _, metrics = runner.run_simulation(streams=streams, trace=trace)
+
+    metrics["run_number"] = task.run_number
+    return metrics
+
+
+def _chunks(values: List[float], count: int) -> List[List[float]]:
+    """Split values into ``count`` consecutive, equally sized chunks."""
+    size = len(values) // count
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
+
+def _batch_metrics(
+    departures: Sequence[Tuple[float, str, Optional[float]]],
+    start: float,
+    end: float,
+    num_batches: int,
+) -> List[Dict[str, Union[int, float]]]:
+    """Split the departures in ``[start, end)`` into equal time batches."""
+    width = (end - start) / num_batches
+    waits: List[List[float]] = [[] for _ in range(num_batches)]
+    counts = [0] * num_batches
+    for time, _, wait in departures:
+        if start <= time < end:
+            index = min(int((time - start) / width), num_batches - 1)
+            counts[index] += 1
+            if wait is not None:
+                waits[index].append(wait)
+    return [
+        {
+            "batch_number": index + 1,
+            "total_customers_served": counts[index],
+            "customers_per_hour": counts[index] / width * 60,
+            "average_wait_time": (
+                sum(waits[index]) / len(waits[index]) if waits[index] else 0.0
+            ),
+        }
+        for index in range(num_batches)
+    ]
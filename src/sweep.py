@@ -0,0 +1,257 @@
+"""
+Parameter sweeps over a grid of configurations.
+
+A sweep takes a list of values for any number of configuration keys, expands
+their Cartesian product and runs every grid point's replications through a
+single worker pool. Results are aggregated per grid point and streamed to a
+CSV or JSON Lines file as soon as each point's replications are done.
+"""
+
+import csv
+import itertools
+import json
+import logging
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .cache import ResultCache
+from .config import Config, ConfigLike, RunConfig, run_config
+from .estimation import confidence_interval
+from .random_streams import RandomStreams
+from .simulation import ReplicationTask, SimulationRunner
+
+logger = logging.getLogger(__name__)
+
+# Metrics aggregated per grid point unless others are asked for
+SWEEP_METRICS = (
+    "total_customers_served",
+    "customers_per_hour",
+    "average_wait_time",
+    "max_wait_time",
+    "kitchen_utilization",
+    "counter_utilization",
+)
+
+OUTPUT_FORMATS = ("csv", "jsonl")
+
+
+def parse_axis(spec: str) -> Tuple[str, List[Any]]:
+    """
+    Parse a sweep axis of the form ``key=values``.
+
+    Values are a comma-separated list (``1,2,4``) or, for numeric keys, an
+    inclusive range ``start:stop`` or ``start:stop:step``. Values are converted
+    to the type of the key's default in ``Config``.
+
+    Args:
+        spec: The axis specification
+
+    Raises:
+        ValueError: If the key is unknown or the values cannot be parsed
+    """
+    key, separator, text = spec.partition("=")
+    key = key.strip().replace("-", "_")
+    defaults = Config.get_config()
+    if not separator or not text:
+        raise ValueError(f"sweep axis {spec!r} must look like key=values")
+    if key not in defaults:
+        raise ValueError(f"unknown config key {key!r}; choose from {sorted(defaults)}")
+
+    if isinstance(defaults[key], str):
+        # Distribution specs contain ':', so strings are lists only
+        return key, [value.strip() for value in text.split(",")]
+
+    convert = _number_parser(defaults[key])
+    if ":" in text:
+        parts = [convert(part) for part in text.split(":")]
+        if len(parts) not in (2, 3):
+            raise ValueError(f"range {text!r} must be start:stop or start:stop:step")
+        start, stop = parts[0], parts[1]
+        step = parts[2] if len(parts) == 3 else 1
+        if step <= 0 or stop < start:
+            raise ValueError(f"range {text!r} must have start <= stop and step > 0")
+        count = int((stop - start) / step + 1e-9) + 1
+        return key, [convert(round(start + i * step, 10)) for i in range(count)]
+    return key, [convert(value) for value in text.split(",")]
+
+
+def _number_parser(default: Any) -> Callable[[Any], Any]:
+    """Return a converter keeping whole numbers as ints for int-valued keys."""
+
+    def convert(value: Any) -> Any:
+        number = float(value)
+        if isinstance(default, int) and number.is_integer():
+            return int(number)
+        return number
+
+    return convert
+
+
+def expand_grid(axes: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Return every combination of the axis values, last axis varying fastest."""
+    keys = list(axes)
+    return [dict(zip(keys, values)) for values in itertools.product(*axes.values())]
+
+
+def point_config(base: Any, point: Dict[str, Any]) -> RunConfig:
+    """Return a new config with the base's values and the point's overrides."""
+    return run_config(base).replace(**point)
+
+
+class ParameterSweep:
+    """
+    Runs replications for every point of a configuration grid.
+
+    All grid points share the master seed, so replication ``n`` of every
+    point draws from the same substreams (common random numbers) and
+    differences between neighbouring points are not swamped by noise.
+
+    Attributes:
+        base_config (ConfigLike): Values for every key that is not swept
+        axes (Dict[str, List]): Values of each swept key
+        num_runs (int): Replications per grid point
+        metrics (Sequence[str]): Metrics aggregated per grid point
+        confidence (float): Confidence level of the reported half-widths
+    """
+
+    def __init__(
+        self,
+        axes: Dict[str, Sequence[Any]],
+        base_config: Optional[ConfigLike] = None,
+        num_runs: int = 10,
+        metrics: Sequence[str] = SWEEP_METRICS,
+        confidence: float = 0.95,
+    ) -> None:
+        """
+        Initialize the sweep.
+
+        Args:
+            axes: Values of each swept config key
+            base_config: Values for every key that is not swept
+            num_runs: Replications per grid point
+            metrics: Metrics aggregated per grid point
+            confidence: Confidence level of the reported half-widths
+        """
+        if not axes:
+            raise ValueError("a sweep needs at least one axis")
+        if num_runs < 1:
+            raise ValueError(f"num_runs must be at least 1, got {num_runs}")
+        self.base_config: ConfigLike = base_config or Config()
+        self.axes = {key: list(values) for key, values in axes.items()}
+        self.num_runs = num_runs
+        self.metrics = metrics
+        self.confidence = confidence
+
+    def points(self) -> List[Dict[str, Any]]:
+        """The grid points in the order they are run and reported."""
+        return expand_grid(self.axes)
+
+    def run(
+        self,
+        workers: int = 1,
+        seed: Optional[int] = None,
+        engine: str = "simpy",
+        cache: Optional[ResultCache] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Run the sweep, yielding one aggregated row per grid point.
+
+        Every grid point's replications are submitted to one pool up front, so
+        workers never idle between points; rows are yielded in grid order as
+        soon as a point's replications have finished.
+
+        Args:
+            workers: Number of worker processes (1 runs everything in-process)
+            seed: Master seed shared by all grid points (random if None)
+            engine: Replication engine, as for ``SimulationRunner``
+            cache: Result cache, so unchanged grid points are not re-simulated
+
+        Yields:
+            The point's swept values, the run count, and the mean and CI
+            half-width of every metric as ``<metric>_mean`` and
+            ``<metric>_half_width``
+        """
+        seed = RandomStreams(seed).seed
+        runner = SimulationRunner(self.base_config, engine=engine, cache=cache)
+        points = self.points()
+
+        tasks = [
+            ReplicationTask(
+                point_config(self.base_config, point),
+                seed,
+                run_number,
+                fused_journeys=runner.fused_journeys,
+            )
+            for point in points
+            for run_number in range(1, self.num_runs + 1)
+        ]
+        logger.info(
+            f"Sweeping {len(points)} grid points x {self.num_runs} runs "
+            f"(seed {seed})..."
+        )
+
+        results = runner.iter_replications(tasks, workers)
+        for index, point in enumerate(points, start=1):
+            point_results = list(itertools.islice(results, self.num_runs))
+            logger.info(f"Finished grid point {index}/{len(points)}: {point}")
+            yield self._aggregate(point, point_results, seed)
+
+    def _aggregate(
+        self, point: Dict[str, Any], results: List[Dict[str, Any]], seed: int
+    ) -> Dict[str, Any]:
+        """Build the output row for one grid point."""
+        row: Dict[str, Any] = {**point, "runs": len(results), "seed": seed}
+        for metric in self.metrics:
+            if metric not in results[0]:
+                raise ValueError(f"unknown metric {metric!r}")
+            mean, half_width = confidence_interval(
+                [float(result[metric]) for result in results], self.confidence
+            )
+            row[f"{metric}_mean"] = mean
+            row[f"{metric}_half_width"] = half_width
+        return row
+
+
+class RowWriter:
+    """
+    Streams sweep rows to a CSV or JSON Lines file, flushing every row.
+
+    Attributes:
+        stream (IO[str]): The file rows are written to
+        output_format (str): ``"csv"`` or ``"jsonl"``
+    """
+
+    def __init__(self, stream: IO[str], output_format: str = "csv") -> None:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"unknown output format {output_format!r}; choose from {OUTPUT_FORMATS}"
+            )
+        self.stream = stream
+        self.output_format = output_format
+        self._csv_writer: Optional["csv.DictWriter[str]"] = None
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """Write one row."""
+        if self.output_format == "jsonl":
+            self.stream.write(json.dumps(row) + "\n")
+        else:
+            if self._csv_writer is None:
+                self._csv_writer = csv.DictWriter(self.stream, fieldnames=list(row))
+                self._csv_writer.writeheader()
+            self._csv_writer.writerow(row)
+        self.stream.flush()
+
+
+def output_format_for(path: str) -> str:
+    """Pick the output format from a file name (JSON Lines for .jsonl/.json)."""
+    return "jsonl" if path.endswith((".jsonl", ".json")) else "csv"
@@ -0,0 +1,165 @@
+"""
+Bounded-memory time series of piecewise-constant signals such as queue lengths.
+
+Samples arrive whenever the signal changes and are summarised into equal time
+buckets holding the minimum, maximum and time-weighted mean of each channel.
+The buckets live in fixed-capacity arrays allocated up front; when the run
+outgrows them, neighbouring buckets are merged pairwise and the bucket width
+doubles, so memory stays the same whether a run lasts a shift or several
+weeks, and the whole run can still be plotted at a resolution of about
+``duration / capacity``.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_CAPACITY = 512
+DEFAULT_BUCKET_WIDTH = 1.0
+
+
+class TimeSeries:
+    """
+    Downsampling recorder of one or more piecewise-constant channels.
+
+    Attributes:
+        channels (Sequence[str]): Names of the recorded signals
+        capacity (int): Maximum number of buckets kept
+        bucket_width (float): Current bucket width in simulation time
+        start_time (float): Start of the first bucket
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[str],
+        capacity: int = DEFAULT_CAPACITY,
+        bucket_width: float = DEFAULT_BUCKET_WIDTH,
+        start_time: float = 0.0,
+    ) -> None:
+        """
+        Create an empty series; every channel starts at 0.
+
+        Args:
+            channels: Names of the recorded signals
+            capacity: Maximum number of buckets kept (even, at least 2)
+            bucket_width: Initial bucket width in simulation time
+            start_time: Start of the first bucket
+        """
+        if capacity < 2 or capacity % 2:
+            raise ValueError(f"capacity must be an even number >= 2, got {capacity}")
+        if bucket_width <= 0:
+            raise ValueError(f"bucket_width must be positive, got {bucket_width}")
+        self.channels = list(channels)
+        self.capacity = capacity
+        self.bucket_width = bucket_width
+        self.start_time = start_time
+
+        self._buckets = 0
+        self._last_time = start_time
+        self._values = [0.0] * len(self.channels)
+        self._minimum = [array("d", bytes(8 * capacity)) for _ in self.channels]
+        self._maximum = [array("d", bytes(8 * capacity)) for _ in self.channels]
+        self._area = [array("d", bytes(8 * capacity)) for _ in self.channels]
+
+    def __len__(self) -> int:
+        return self._buckets
+
+    def record(self, time: float, *values: float) -> None:
+        """
+        Record that the channels change to ``values`` at ``time``.
+
+        Args:
+            time: Simulation time of the change (not before the last one)
+            values: New value of every channel, in channel order
+        """
+        if len(values) != len(self.channels):
+            raise ValueError(f"expected {len(self.channels)} values, got {len(values)}")
+        self._advance(time)
+        index = self._bucket(time)
+        self._values = list(values)
+        for channel, value in enumerate(values):
+            if value < self._minimum[channel][index]:
+                self._minimum[channel][index] = value
+            if value > self._maximum[channel][index]:
+                self._maximum[channel][index] = value
+
+    def to_arrays(self, until: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Export the buckets as NumPy arrays.
+
+        Args:
+            until: Time the last values are held to (the last change if None)
+
+        Returns:
+            Dictionary with the bucket start ``time`` and, per channel,
+            ``<channel>_min``, ``<channel>_max`` and ``<channel>_mean``
+        """
+        if until is not None:
+            self._advance(until)
+
+        count = self._buckets
+        starts = self.start_time + self.bucket_width * np.arange(count)
+        # The last bucket is only covered up to the last recorded time
+        covered = np.minimum(starts + self.bucket_width, self._last_time) - starts
+        arrays = {"time": starts}
+        for channel, name in enumerate(self.channels):
+            area = np.frombuffer(self._area[channel], count=count)
+            arrays[f"{name}_min"] = np.array(self._minimum[channel][:count])
+            arrays[f"{name}_max"] = np.array(self._maximum[channel][:count])
+            arrays[f"{name}_mean"] = np.divide(
+                area,
+                covered,
+                out=np.array(self._minimum[channel][:count]),
+                where=covered > 0,
+            )
+        return arrays
+
+    def _advance(self, time: float) -> None:
+        """Hold the current values from the last change up to ``time``."""
+        if time < self._last_time:
+            raise ValueError(f"time {time} is before the last change")
+        last_bucket = self._bucket(time)
+        index = min(
+            int((self._last_time - self.start_time) // self.bucket_width), last_bucket
+        )
+        while self._last_time < time:
+            end = time
+            if index < last_bucket:
+                end = min(time, self.start_time + (index + 1) * self.bucket_width)
+            for channel, value in enumerate(self._values):
+                self._area[channel][index] += max(end - self._last_time, 0.0) * value
+            self._last_time = end
+            index += 1
+
+    def _bucket(self, time: float) -> int:
+        """Return the bucket holding ``time``, opening buckets up to it."""
+        index = int((time - self.start_time) // self.bucket_width)
+        while index >= self.capacity:
+            self._downsample()
+            index = int((time - self.start_time) // self.bucket_width)
+        while self._buckets <= index:
+            # A new bucket starts at the values held when it opens
+            for channel, value in enumerate(self._values):
+                self._minimum[channel][self._buckets] = value
+                self._maximum[channel][self._buckets] = value
+                self._area[channel][self._buckets] = 0.0
+            self._buckets += 1
+        return index
+
+    def _downsample(self) -> None:
+        """Merge neighbouring buckets pairwise, doubling the bucket width."""
+        merged = math.ceil(self._buckets / 2)
+        for channel in range(len(self.channels)):
+            minimum = self._minimum[channel]
+            maximum = self._maximum[channel]
+            area = self._area[channel]
+            for index in range(merged):
+                left = 2 * index
+                right = min(left + 1, self._buckets - 1)
+                minimum[index] = min(minimum[left], minimum[right])
+                maximum[index] = max(maximum[left], maximum[right])
+                area[index] = area[left] + (area[right] if right != left else 0.0)
+        self._buckets = merged
+        self.bucket_width *= 2
@@ -0,0 +1,196 @@
+"""
+Columnar binary trace of finished customers.
+
+A trace is a directory holding one fixed-width binary file per field plus a
+small JSON header describing the columns. Records are appended column by
+column as customers leave, and the reader memory-maps each column as a NumPy
+array, so millions of records can be analysed without building Python objects.
+"""
+
+import json
+import os
+import sys
+from array import array
+from typing import Any, BinaryIO, Dict, List
+
+import numpy as np
+
+TRACE_VERSION = 1
+HEADER_FILE = "header.json"
+
+# Column name -> array typecode (all fixed width on every platform)
+TRACE_COLUMNS = {
+    "run_number": "q",
+    "customer_id": "q",
+    "customer_type": "B",
+    "arrival_time": "d",
+    "order_time": "d",
+    "cook_time": "d",
+    "service_time": "d",
+    "pickup_time": "d",
+}
+
+# Customer type labels stored as small integer codes
+CUSTOMER_TYPES = ["inhouse", "foodapp"]
+UNKNOWN_TYPE_CODE = 255
+
+_NUMPY_TYPES = {"q": "i8", "B": "u1", "d": "f8"}
+_TIME_COLUMNS = [name for name, code in TRACE_COLUMNS.items() if code == "d"]
+
+
+class TraceRecorder:
+    """
+    Appends finished customers to a columnar trace directory.
+
+    Records are buffered per column and written in blocks. Missing timestamps
+    (for example ``service_time`` of a food app customer) are stored as NaN.
+
+    Attributes:
+        path (str): The trace directory
+        run_number (int): Run number stored with every record
+        buffer_size (int): Number of records buffered before writing
+    """
+
+    def __init__(self, path: str, run_number: int = 0, buffer_size: int = 4096):
+        """
+        Start a trace in a directory, replacing any trace already there.
+
+        Args:
+            path: Directory holding the trace
+            run_number: Run number stored with every record
+            buffer_size: Number of records buffered before writing
+        """
+        self.path = path
+        self.run_number = run_number
+        self.buffer_size = buffer_size
+        self._type_codes = {name: code for code, name in enumerate(CUSTOMER_TYPES)}
+
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, HEADER_FILE), "w") as header_file:
+            json.dump(_header(), header_file, indent=2)
+
+        # Integer and time columns are buffered separately, each typed
+        self._integer_buffers: Dict[str, "array[int]"] = {
+            name: array(code)
+            for name, code in TRACE_COLUMNS.items()
+            if name not in _TIME_COLUMNS
+        }
+        self._time_buffers: Dict[str, "array[float]"] = {
+            name: array("d") for name in _TIME_COLUMNS
+        }
+        # Truncate, so writing a trace twice to one directory does not double it
+        self._files: Dict[str, BinaryIO] = {
+            name: open(os.path.join(path, f"{name}.bin"), "wb")
+            for name in TRACE_COLUMNS
+        }
+
+    def record(self, customer: Any) -> None:
+        """Append one finished customer to the trace."""
+        integers = self._integer_buffers
+        integers["run_number"].append(self.run_number)
+        integers["customer_id"].append(customer.id)
+        integers["customer_type"].append(
+            self._type_codes.get(
+                getattr(customer, "customer_type", None), UNKNOWN_TYPE_CODE
+            )
+        )
+        for name, buffer in self._time_buffers.items():
+            value = getattr(customer, name, None)
+            buffer.append(float("nan") if value is None else value)
+
+        if len(integers["customer_id"]) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to disk."""
+        buffers: Dict[str, array] = {**self._integer_buffers, **self._time_buffers}
+        for name, buffer in buffers.items():
+            buffer.tofile(self._files[name])
+            del buffer[:]
+            self._files[name].flush()
+
+    def close(self) -> None:
+        """Flush buffered records and close the column files."""
+        self.flush()
+        for column_file in self._files.values():
+            column_file.close()
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class TraceReader:
+    """
+    Memory-maps a trace directory as read-only NumPy arrays.
+
+    Attributes:
+        path (str): The trace directory
+        columns (Dict[str, numpy.ndarray]): Memory-mapped column arrays
+        customer_types (List[str]): Labels of the ``customer_type`` codes
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a trace directory written by ``TraceRecorder``.
+
+        Args:
+            path: Directory holding the trace
+
+        Raises:
+            ValueError: If the trace was written in an unsupported format
+        """
+        with open(os.path.join(path, HEADER_FILE)) as header_file:
+            header = json.load(header_file)
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"unsupported trace version {header.get('version')}")
+
+        self.path = path
+        self.customer_types: List[str] = header["customer_types"]
+        byteorder = "<" if header["byteorder"] == "little" else ">"
+
+        self.columns: Dict[str, Any] = {}
+        for name, dtype in header["columns"].items():
+            column_path = os.path.join(path, f"{name}.bin")
+            dtype = np.dtype(byteorder + dtype)
+            if os.path.getsize(column_path) == 0:
+                # numpy cannot memory-map an empty file
+                self.columns[name] = np.empty(0, dtype=dtype)
+            else:
+                self.columns[name] = np.memmap(column_path, dtype=dtype, mode="r")
+
+    def __len__(self) -> int:
+        return len(self.columns["customer_id"])
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name]
+
+    def wait_times(self) -> Any:
+        """Arrival-to-service times (NaN for customers who were not served)."""
+        return self.columns["service_time"] - self.columns["arrival_time"]
+
+
+def open_run_traces(directory: str) -> List[TraceReader]:
+    """Open the per-run traces written by a multi-run study, in run order."""
+    return [
+        TraceReader(os.path.join(directory, name))
+        for name in sorted(os.listdir(directory))
+        if os.path.exists(os.path.join(directory, name, HEADER_FILE))
+    ]
+
+
+def run_trace_path(directory: str, run_number: int) -> str:
+    """Return the trace directory for one run of a multi-run study."""
+    return os.path.join(directory, f"run_{run_number:05d}")
+
+
+def _header() -> Dict[str, Any]:
+    """Build the JSON header describing the trace layout."""
+    return {
+        "version": TRACE_VERSION,
+        "byteorder": sys.byteorder,
+        "columns": {name: _NUMPY_TYPES[code] for name, code in TRACE_COLUMNS.items()},
+        "customer_types": CUSTOMER_TYPES,
+    }
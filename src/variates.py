@@ -0,0 +1,247 @@
+"""
+Random variate supply for the stochastic sources of the restaurant model.
+
+Each source (interarrival, order, cook and service times, and the customer
+type draw) gets a callable supply that returns the next variate. The block
+supply generates variates in large NumPy blocks and hands them out through a
+cheap cursor; the scalar supply draws one value at a time from the source's
+``random.Random`` stream. Distributions are chosen per source in the config.
+"""
+
+import math
+import random
+from itertools import chain
+from typing import Any, Callable, List, NamedTuple, Tuple
+
+import numpy as np
+
+from src.random_streams import (
+    ARRIVAL,
+    COOK,
+    CUSTOMER_TYPE,
+    ORDER,
+    SERVICE,
+    RandomStreams,
+    derive_seed,
+)
+
+DISTRIBUTIONS = ("uniform", "exponential", "lognormal", "gamma")
+
+# Half-width of the uniform stage times of the original model (mean ± 2)
+STAGE_TIME_HALF_WIDTH = 2.0
+
+
+class Distribution(NamedTuple):
+    """
+    A distribution described by its name, mean and standard deviation.
+
+    Uniform distributions are centred on the mean with half-width sd * sqrt(3).
+    """
+
+    name: str
+    mean: float
+    sd: float
+
+    @property
+    def half_width(self) -> float:
+        """Half-width of a uniform distribution with this mean and sd."""
+        return math.sqrt(3) * self.sd
+
+    @property
+    def log_params(self) -> Tuple[float, float]:
+        """(mu, sigma) of the underlying normal for a lognormal distribution."""
+        sigma_squared = math.log(1 + (self.sd / self.mean) ** 2)
+        return math.log(self.mean) - sigma_squared / 2, math.sqrt(sigma_squared)
+
+    @property
+    def gamma_params(self) -> Tuple[float, float]:
+        """(shape, scale) of a gamma distribution."""
+        return (self.mean / self.sd) ** 2, self.sd**2 / self.mean
+
+
+def parse_distribution(spec: str, mean: float, default_sd: float) -> Distribution:
+    """
+    Parse a distribution spec of the form ``name`` or ``name:sd``.
+
+    Args:
+        spec: Distribution name, optionally followed by a standard deviation
+        mean: Mean of the distribution (from the config)
+        default_sd: Standard deviation used when the spec does not give one
+
+    Raises:
+        ValueError: If the spec is unknown or would produce negative durations
+    """
+    name, _, sd_text = spec.partition(":")
+    name = name.strip().lower()
+    if name not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution {spec!r}; choose from {DISTRIBUTIONS}")
+    if mean <= 0:
+        raise ValueError(f"{name} distribution needs a positive mean, got {mean}")
+
+    sd = mean if name == "exponential" else float(sd_text or default_sd)
+    distribution = Distribution(name, mean, sd)
+    if name == "uniform" and distribution.half_width > mean + 1e-9:
+        raise ValueError(
+            f"uniform distribution with mean {mean} and sd {sd} "
+            "would produce negative durations"
+        )
+    if name in ("lognormal", "gamma") and sd <= 0:
+        raise ValueError(f"{name} distribution needs a positive sd, got {sd}")
+    return distribution
+
+
+def scalar_supply(
+    rng: random.Random, distribution: Distribution
+) -> Callable[[], float]:
+    """Return a supply drawing one variate per call from ``rng``."""
+    if distribution.name == "uniform":
+        low = distribution.mean - distribution.half_width
+        high = distribution.mean + distribution.half_width
+        return lambda: rng.uniform(low, high)
+    if distribution.name == "exponential":
+        rate = 1.0 / distribution.mean
+        return lambda: rng.expovariate(rate)
+    if distribution.name == "lognormal":
+        mu, sigma = distribution.log_params
+        return lambda: rng.lognormvariate(mu, sigma)
+    shape, scale = distribution.gamma_params
+    return lambda: rng.gammavariate(shape, scale)
+
+
+class BlockSupply:
+    """
+    Supply that generates variates in NumPy blocks and hands them out one by
+    one through ``next``, refilling when the block runs out.
+
+    Uniform and exponential variates are inverse transforms of uniforms and
+    lognormal variates are built from normals, so all three honour antithetic
+    mode; gamma variates are drawn directly and are not antithetic.
+    """
+
+    def __init__(
+        self,
+        generator: Any,
+        distribution: Distribution,
+        block_size: int,
+        antithetic: bool = False,
+    ) -> None:
+        self.generator = generator
+        self.distribution = distribution
+        self.block_size = block_size
+        self.antithetic = antithetic
+        # chain() walks each block and calls draw_block() for the next one,
+        # so handing out a variate never runs Python-level code
+        self.next: Callable[[], float] = chain.from_iterable(
+            iter(self.draw_block, None)
+        ).__next__
+
+    def __call__(self) -> float:
+        return self.next()
+
+    def draw_block(self) -> List[float]:
+        """Generate the next block of variates as Python floats."""
+        return draw_array(
+            self.generator, self.distribution, self.block_size, self.antithetic
+        ).tolist()
+
+
+def draw_array(
+    generator: Any, distribution: Distribution, size: int, antithetic: bool = False
+) -> Any:
+    """
+    Draw ``size`` variates from a NumPy generator as an array.
+
+    Args:
+        generator: NumPy random generator
+        distribution: Distribution to draw from
+        size: Number of variates
+        antithetic: Whether to draw the antithetic counterparts
+    """
+    if distribution.name == "lognormal":
+        mu, sigma = distribution.log_params
+        z = generator.standard_normal(size)
+        if antithetic:
+            z = -z
+        return np.exp(mu + sigma * z)
+    if distribution.name == "gamma":
+        shape, scale = distribution.gamma_params
+        return generator.gamma(shape, scale, size)
+
+    u = generator.random(size)
+    if antithetic:
+        # Same mapping as AntitheticRandom, keeping u in [0, 1)
+        u = np.where(u > 0.0, 1.0 - u, 0.0)
+    if distribution.name == "uniform":
+        low = distribution.mean - distribution.half_width
+        return low + 2 * distribution.half_width * u
+    return -distribution.mean * np.log1p(-u)
+
+
+def config_distributions(config: Any) -> Tuple[Distribution, ...]:
+    """
+    Parse the interarrival, order, cook and service distributions of a config.
+
+    Stage times default to the spread of the original uniform model.
+
+    Raises:
+        ValueError: If a distribution spec is invalid for its mean
+    """
+    stage_sd = STAGE_TIME_HALF_WIDTH / math.sqrt(3)
+    return (
+        parse_distribution(
+            config.interarrival_distribution,
+            config.interarrival_time,
+            config.interarrival_time,
+        ),
+        parse_distribution(
+            config.order_time_distribution, config.mean_order_time, stage_sd
+        ),
+        parse_distribution(
+            config.cook_time_distribution, config.mean_cook_time, stage_sd
+        ),
+        parse_distribution(
+            config.service_time_distribution, config.mean_service_time, stage_sd
+        ),
+    )
+
+
+class Variates:
+    """
+    Per-run variate supplies for every stochastic source of the model.
+
+    Attributes:
+        interarrival (Callable[[], float]): Next customer interarrival time
+        customer_type (Callable[[], float]): Next uniform for the customer type
+        order_time (Callable[[], float]): Next order-taking time
+        cook_time (Callable[[], float]): Next cooking time
+        service_time (Callable[[], float]): Next serving time
+    """
+
+    def __init__(self, streams: RandomStreams, config: Any) -> None:
+        """
+        Build the supplies for a run.
+
+        Args:
+            streams: The run's random streams
+            config: Configuration giving means, distributions and block size
+        """
+        interarrival, order, cook, service = config_distributions(config)
+        unit_uniform = Distribution("uniform", 0.5, 0.5 / math.sqrt(3))
+
+        block_size = config.variate_block_size
+
+        def supply(name: str, distribution: Distribution) -> Callable[[], float]:
+            if block_size == 0:
+                if name == CUSTOMER_TYPE:
+                    return streams.stream(name).random
+                return scalar_supply(streams.stream(name), distribution)
+            generator = np.random.default_rng(derive_seed(streams.seed, name))
+            return BlockSupply(
+                generator, distribution, block_size, streams.antithetic
+            ).next
+
+        self.interarrival = supply(ARRIVAL, interarrival)
+        self.customer_type = supply(CUSTOMER_TYPE, unit_uniform)
+        self.order_time = supply(ORDER, order)
+        self.cook_time = supply(COOK, cook)
+        self.service_time = supply(SERVICE, service)
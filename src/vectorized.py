@@ -0,0 +1,533 @@
+"""
+Vectorised replication engine built on multi-server Lindley recursions.
+
+Instead of stepping an event queue, every station is simulated with the
+Kiefer-Wolfowitz recursion for first-come first-served multi-server queues:
+customers are taken in order of arrival at the station and each one starts on
+the server that frees up first, no earlier than its arrival. The recursion
+runs over customers while NumPy carries it across all replications at once, so
+thousands of replications cost about as much Python work as one.
+
+The stations and routing match the SimPy model: in-house customers pass the
+order taker, the cook and the server; food app customers place their order
+with the cook, queue for the cook again to have it cooked, and hold a driver
+until the pickup delay after cooking has passed. The cook is fed by both
+customer types and by food app customers returning from their order, so it is
+processed event by event in time order with the returning customers held in a
+small per-replication pending set.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .config import Config, ConfigLike, fixed_warm_up
+from .customer import INHOUSE_PROBABILITY, FoodAppCustomer
+from .estimation import mser_truncation
+from .random_streams import (
+    ARRIVAL,
+    COOK,
+    CUSTOMER_TYPE,
+    ORDER,
+    SERVICE,
+    RandomStreams,
+    derive_seed,
+)
+from .variates import Distribution, config_distributions, draw_array
+
+# Variates drawn per block when a config asks for scalar draws
+DEFAULT_BLOCK_SIZE = 1024
+
+
+class VectorizedEngine:
+    """
+    Runs many replications of the restaurant at once as NumPy arrays.
+
+    Replication ``n`` draws from the same spawned substreams as SimPy run
+    ``n``, so arrivals and customer types match the SimPy model exactly when
+    it draws variates in blocks; stage times are consumed in a different
+    order and agree only in distribution.
+
+    Attributes:
+        config (ConfigLike): Simulation configuration
+    """
+
+    def __init__(self, config: Optional[ConfigLike] = None) -> None:
+        """Initialize the engine with configuration."""
+        self.config: ConfigLike = config or Config()
+
+    def run_replications(
+        self,
+        seed: int,
+        run_numbers: Sequence[int],
+        antithetic: bool = False,
+        duration: Optional[int] = None,
+    ) -> List[Dict[str, Union[int, float]]]:
+        """
+        Run the given replications together.
+
+        Args:
+            seed: Master seed the runs' substreams are spawned from
+            run_numbers: Run numbers to simulate
+            antithetic: Whether to run the antithetic twins of the runs
+            duration: Simulation duration in minutes (uses config default if None)
+
+        Returns:
+            One metrics dictionary per run, with the same keys as
+            ``SimulationRunner._collect_metrics`` plus ``run_number``
+
+        Raises:
+            ValueError: If admission control or reneging is configured; the
+                recursions assume unbounded queues and unlimited patience
+        """
+        if self.config.admission_control or math.isfinite(self.config.patience):
+            raise ValueError(
+                "the vectorized engine has no admission control or reneging; "
+                "use the simpy engine"
+            )
+        duration = duration or self.config.sim_duration
+        warm_up = fixed_warm_up(self.config, duration)
+        if not run_numbers:
+            return []
+
+        arrivals, inhouse, order, cook, service = self._draw_variates(
+            seed, run_numbers, antithetic, duration
+        )
+        real = np.isfinite(arrivals)
+        foodapp = real & ~inhouse
+        inhouse = real & inhouse
+
+        # Order taker: in-house customers in arrival order
+        order_start, order_end = _fifo_station(
+            np.where(inhouse, arrivals, np.inf),
+            order,
+            self.config.counter_servers,
+        )
+
+        # Cook: in-house customers after ordering, food app customers twice
+        first_arrival = np.where(
+            inhouse, order_end, np.where(foodapp, arrivals, np.inf)
+        )
+        first_service = np.where(inhouse, cook, order)
+        cook_start, cook_end, app_order_start, app_order_end = _cook_station(
+            first_arrival, first_service, cook, foodapp, self.config.kitchen_servers
+        )
+        order_start = np.where(foodapp, app_order_start, order_start)
+        order_end = np.where(foodapp, app_order_end, order_end)
+
+        # Server: in-house customers as their food comes out of the kitchen
+        serve_start, serve_end = _fifo_station(
+            np.where(inhouse, cook_end, np.inf),
+            service,
+            self.config.counter_servers,
+        )
+
+        # Drivers: booked when the food is cooked, held until the pickup time
+        pickup_time = cook_end + FoodAppCustomer.pickup_delay
+        driver_start, driver_end = _fifo_station(
+            np.where(foodapp, cook_end, np.inf),
+            np.zeros_like(cook_end),
+            self.config.driver_capacity,
+            release=pickup_time,
+        )
+
+        inhouse_done = inhouse & (serve_end < duration)
+        foodapp_done = foodapp & (driver_end < duration)
+
+        # Customers who left before the warm-up cut-off are not counted
+        if self.config.warm_up_method == "mser5":
+            cutoffs = _mser_cutoffs(arrivals, serve_end, inhouse_done)
+        else:
+            cutoffs = np.full(len(run_numbers), float(warm_up))
+        inhouse_done &= serve_end >= cutoffs[:, None]
+        foodapp_done &= driver_end >= cutoffs[:, None]
+
+        kitchen_busy = _busy_time(
+            [(cook_start, cook_end), (app_order_start, app_order_end)],
+            foodapp | inhouse,
+            duration,
+            cutoffs,
+        )
+        counter_busy = _busy_time(
+            [
+                (np.where(inhouse, order_start, np.inf), order_end),
+                (serve_start, serve_end),
+            ],
+            inhouse,
+            duration,
+            cutoffs,
+        )
+        driver_busy = _busy_time(
+            [(driver_start, driver_end)], foodapp, duration, cutoffs
+        )
+
+        # Queues as (joined, served) times per visit, as SimPy monitors them
+        never = np.full_like(arrivals, np.inf)
+        queues = {
+            "order_taker": [
+                (
+                    np.where(inhouse, arrivals, np.inf),
+                    np.where(inhouse, order_start, np.inf),
+                )
+            ],
+            "cook": [
+                (first_arrival, np.where(inhouse, cook_start, app_order_start)),
+                (
+                    np.where(foodapp, app_order_end, np.inf),
+                    np.where(foodapp, cook_start, never),
+                ),
+            ],
+            "server": [
+                (
+                    np.where(inhouse, cook_end, np.inf),
+                    np.where(inhouse, serve_start, np.inf),
+                )
+            ],
+            "driver": [
+                (
+                    np.where(foodapp, cook_end, np.inf),
+                    np.where(foodapp, driver_start, np.inf),
+                )
+            ],
+        }
+        queue_statistics = {
+            name: _queue_statistics(visits, duration, cutoffs)
+            for name, visits in queues.items()
+        }
+
+        results = []
+        for row, run_number in enumerate(run_numbers):
+            inhouse_count = int(inhouse_done[row].sum())
+            foodapp_count = int(foodapp_done[row].sum())
+            total = inhouse_count + foodapp_count
+            done = inhouse_done[row]
+            row_waits = serve_end[row][done] - arrivals[row][done]
+            observed = duration - float(cutoffs[row])
+            results.append(
+                {
+                    "total_customers": total,
+                    "average_wait_time": (
+                        float(row_waits.mean()) if len(row_waits) else 0.0
+                    ),
+                    "wait_time_std": (
+                        float(row_waits.std(ddof=1)) if len(row_waits) > 1 else 0.0
+                    ),
+                    "min_wait_time": (
+                        float(row_waits.min()) if len(row_waits) else 0.0
+                    ),
+                    "max_wait_time": (
+                        float(row_waits.max()) if len(row_waits) else 0.0
+                    ),
+                    "inhouse_customers": inhouse_count,
+                    "foodapp_customers": foodapp_count,
+                    # Queues are unbounded and customers never give up
+                    "balked_customers": 0,
+                    "reneged_customers": 0,
+                    "lost_inhouse_customers": 0,
+                    "lost_foodapp_customers": 0,
+                    "lost_customers": 0,
+                    "simulation_duration": duration,
+                    "warm_up_time": float(cutoffs[row]),
+                    "total_customers_served": total,
+                    "customers_per_hour": (
+                        (total / observed) * 60 if observed > 0 else 0
+                    ),
+                    # No event queue is involved
+                    "scheduled_events": 0,
+                    "events_per_customer": 0.0,
+                    "kitchen_utilization": _utilization(
+                        kitchen_busy[row], observed, self.config.kitchen_servers
+                    ),
+                    "counter_utilization": _utilization(
+                        counter_busy[row], observed, 2 * self.config.counter_servers
+                    ),
+                    "driver_utilization": _utilization(
+                        driver_busy[row], observed, self.config.driver_capacity
+                    ),
+                    "run_number": run_number,
+                }
+            )
+            for name, (queue_time, max_queue) in queue_statistics.items():
+                results[-1][f"{name}_average_queue"] = (
+                    float(queue_time[row]) / observed if observed > 0 else 0.0
+                )
+                results[-1][f"{name}_max_queue"] = int(max_queue[row])
+        return results
+
+    def _draw_variates(
+        self,
+        seed: int,
+        run_numbers: Sequence[int],
+        antithetic: bool,
+        duration: int,
+    ) -> Tuple[Any, Any, Any, Any, Any]:
+        """
+        Draw every run's arrivals and stage times as padded 2-D arrays.
+
+        Rows are runs and columns are customers in arrival order. Arrival
+        times at or after ``duration`` (and padding) are ``inf``.
+
+        Returns:
+            Tuple of (arrival times, in-house mask, order, cook and serve times)
+        """
+        config = self.config
+        interarrival, order, cook, service = config_distributions(config)
+        stages = {ORDER: order, COOK: cook, SERVICE: service}
+        unit_uniform = Distribution("uniform", 0.5, 0.5 / math.sqrt(3))
+        block_size = config.variate_block_size or DEFAULT_BLOCK_SIZE
+
+        master = RandomStreams(seed, antithetic)
+        per_run = []
+        for run_number in run_numbers:
+            streams = master.spawn(run_number)
+
+            def generator(name: str) -> Any:
+                return np.random.default_rng(derive_seed(streams.seed, name))
+
+            # Draw whole blocks, as the SimPy model does, until past the end
+            arrival_rng = generator(ARRIVAL)
+            blocks = []
+            last_arrival = 0.0
+            while last_arrival < duration:
+                block = draw_array(arrival_rng, interarrival, block_size, antithetic)
+                block = np.cumsum(block) + last_arrival
+                blocks.append(block)
+                last_arrival = block[-1]
+            arrivals = np.concatenate(blocks)
+            arrivals = arrivals[arrivals < duration]
+            count = len(arrivals)
+
+            blocks_needed = -(-count // block_size) or 1
+            type_draws = draw_array(
+                generator(CUSTOMER_TYPE),
+                unit_uniform,
+                blocks_needed * block_size,
+                antithetic,
+            )[:count]
+            stage_times = [
+                draw_array(generator(name), distribution, count, antithetic)
+                for name, distribution in stages.items()
+            ]
+            per_run.append((arrivals, type_draws < INHOUSE_PROBABILITY, *stage_times))
+
+        width = max(len(run[0]) for run in per_run) + 1
+        arrays = []
+        for field, fill in enumerate([np.inf, False, 0.0, 0.0, 0.0]):
+            padded = np.full((len(per_run), width), fill)
+            for row, run in enumerate(per_run):
+                padded[row, : len(run[field])] = run[field]
+            arrays.append(padded)
+        arrays[1] = arrays[1].astype(bool)
+        return tuple(arrays)  # type: ignore[return-value]
+
+
+def _fifo_station(
+    arrivals: Any, durations: Any, servers: int, release: Any = None
+) -> Tuple[Any, Any]:
+    """
+    Run a first-come first-served multi-server station for every row.
+
+    Customers are served in order of arrival; ``inf`` arrivals never arrive.
+    A server is held for the customer's duration, or until their ``release``
+    time if that is later.
+
+    Returns:
+        Tuple of (service start times, departure times) in the input layout
+    """
+    runs, customers = arrivals.shape
+    order = np.argsort(arrivals, axis=1, kind="stable")
+    sorted_arrivals = np.take_along_axis(arrivals, order, axis=1)
+    sorted_durations = np.take_along_axis(durations, order, axis=1)
+    sorted_release = (
+        None if release is None else np.take_along_axis(release, order, axis=1)
+    )
+
+    rows = np.arange(runs)
+    free = np.zeros((runs, servers))
+    starts = np.full((runs, customers), np.inf)
+    ends = np.full((runs, customers), np.inf)
+    # Only columns with a real arrival in some row need the recursion
+    active = int(np.isfinite(sorted_arrivals).sum(axis=1).max(initial=0))
+    for k in range(active):
+        server = free.argmin(axis=1)
+        start = np.maximum(sorted_arrivals[:, k], free[rows, server])
+        end = start + sorted_durations[:, k]
+        if sorted_release is not None:
+            end = np.maximum(end, sorted_release[:, k])
+        free[rows, server] = end
+        starts[:, k] = start
+        ends[:, k] = end
+
+    start_times = np.empty_like(starts)
+    end_times = np.empty_like(ends)
+    np.put_along_axis(start_times, order, starts, axis=1)
+    np.put_along_axis(end_times, order, ends, axis=1)
+    return start_times, end_times
+
+
+def _cook_station(
+    first_arrival: Any,
+    first_service: Any,
+    cook_times: Any,
+    foodapp: Any,
+    servers: int,
+) -> Tuple[Any, Any, Any, Any]:
+    """
+    Run the cook, where food app customers come back after ordering.
+
+    Visits are processed in time order for every row: the next visit is the
+    earlier of the next first visit (known up front) and the earliest pending
+    return of a food app customer whose order has been taken.
+
+    Returns:
+        Tuple of (cooking start, cooking end, food app order start, food app
+        order end) per customer
+    """
+    runs, customers = first_arrival.shape
+    rows = np.arange(runs)
+
+    order = np.argsort(first_arrival, axis=1, kind="stable")
+    sorted_first = np.take_along_axis(first_arrival, order, axis=1)
+    first_count = np.isfinite(sorted_first).sum(axis=1)
+    visits = int((first_count + foodapp.sum(axis=1)).max(initial=0))
+
+    free = np.zeros((runs, servers))
+    cook_start = np.full((runs, customers), np.inf)
+    cook_end = np.full((runs, customers), np.inf)
+    order_start = np.full((runs, customers), np.inf)
+    order_end = np.full((runs, customers), np.inf)
+    pending_time = np.full((runs, max(servers, 1)), np.inf)
+    pending_customer = np.zeros((runs, max(servers, 1)), dtype=np.intp)
+    position = np.zeros(runs, dtype=np.intp)
+
+    for _ in range(visits):
+        # Earliest pending return versus the next first visit
+        slot = pending_time.argmin(axis=1)
+        return_time = pending_time[rows, slot]
+        next_first = np.minimum(position, customers - 1)
+        first_customer = order[rows, next_first]
+        first_time = np.where(
+            position < first_count, sorted_first[rows, next_first], np.inf
+        )
+        returning = return_time < first_time
+        arrival = np.where(returning, return_time, first_time)
+        real = np.isfinite(arrival)
+
+        customer = np.where(returning, pending_customer[rows, slot], first_customer)
+        taking_order = real & ~returning & foodapp[rows, customer]
+        duration = np.where(
+            returning,
+            cook_times[rows, customer],
+            first_service[rows, customer],
+        )
+
+        server = free.argmin(axis=1)
+        start = np.maximum(arrival, free[rows, server])
+        end = start + duration
+        free[rows, server] = end
+
+        # Record the visit and move the returning customer out of pending
+        cooking = real & ~taking_order
+        cook_start[rows[cooking], customer[cooking]] = start[cooking]
+        cook_end[rows[cooking], customer[cooking]] = end[cooking]
+        order_start[rows[taking_order], customer[taking_order]] = start[taking_order]
+        order_end[rows[taking_order], customer[taking_order]] = end[taking_order]
+        pending_time[rows[returning], slot[returning]] = np.inf
+        position += ~returning
+
+        # Food app customers whose order was taken return when it is done
+        if taking_order.any():
+            has_room = np.asarray(np.isinf(pending_time).any(axis=1))
+            if not has_room[taking_order].all():
+                width = pending_time.shape[1]
+                pending_time = np.hstack([pending_time, np.full((runs, width), np.inf)])
+                pending_customer = np.hstack(
+                    [pending_customer, np.zeros((runs, width), dtype=np.intp)]
+                )
+            free_slot = np.isinf(pending_time).argmax(axis=1)
+            pending_time[rows[taking_order], free_slot[taking_order]] = end[
+                taking_order
+            ]
+            pending_customer[rows[taking_order], free_slot[taking_order]] = customer[
+                taking_order
+            ]
+
+    return cook_start, cook_end, order_start, order_end
+
+
+def _mser_cutoffs(arrivals: Any, departures: Any, served: Any) -> Any:
+    """Per-row MSER-5 cut-off on the waits taken in order of departure."""
+    cutoffs = np.zeros(departures.shape[0])
+    for row in range(departures.shape[0]):
+        times = departures[row][served[row]]
+        order = np.argsort(times, kind="stable")
+        waits = (times - arrivals[row][served[row]])[order]
+        deleted = mser_truncation(waits.tolist())
+        if deleted:
+            cutoffs[row] = times[order[deleted]]
+    return cutoffs
+
+
+def _busy_time(
+    intervals: List[Tuple[Any, Any]], mask: Any, duration: int, cutoffs: Any
+) -> Any:
+    """Total server busy time within ``[cutoff, duration)`` per row."""
+    busy = np.zeros(mask.shape[0])
+    lower = cutoffs[:, None]
+    for start, end in intervals:
+        start = np.minimum(np.maximum(np.where(mask, start, np.inf), lower), duration)
+        end = np.minimum(np.maximum(end, lower), duration)
+        busy += np.where(end > start, end - start, 0.0).sum(axis=1)
+    return busy
+
+
+def _queue_statistics(
+    visits: List[Tuple[Any, Any]], duration: int, cutoffs: Any
+) -> Tuple[Any, Any]:
+    """
+    Queue-length integral and longest queue within ``[cutoff, duration)``.
+
+    Args:
+        visits: (joined, served) time arrays per row, ``inf`` for no visit
+        duration: End of the run
+        cutoffs: Warm-up cut-off per row
+
+    Returns:
+        Tuple of (queue integral, longest queue) arrays, one entry per row
+    """
+    lower = cutoffs[:, None]
+    queue_time = np.zeros(len(cutoffs))
+    for joined, served in visits:
+        begin = np.clip(joined, lower, duration)
+        end = np.clip(served, lower, duration)
+        queue_time += np.where(end > begin, end - begin, 0.0).sum(axis=1)
+
+    # Queue length after every join (+1) and service start (-1); a customer
+    # served on arrival leaves the queue before the next one joins
+    times = np.concatenate([t for visit in visits for t in visit], axis=1)
+    steps = np.concatenate(
+        [
+            np.full(t.shape, step)
+            for joined, served in visits
+            for t, step in ((joined, 1), (served, -1))
+        ],
+        axis=1,
+    )
+    order = np.lexsort((steps, times))
+    times = np.take_along_axis(times, order, axis=1)
+    levels = np.cumsum(np.take_along_axis(steps, order, axis=1), axis=1)
+
+    rows = np.arange(len(cutoffs))
+    before = (times < lower).sum(axis=1)
+    at_cutoff = np.where(before > 0, levels[rows, np.maximum(before - 1, 0)], 0)
+    inside = (times >= lower) & (times < duration)
+    max_queue = np.maximum(at_cutoff, np.where(inside, levels, 0).max(axis=1))
+    return queue_time, max_queue
+
+
+def _utilization(busy_time: float, duration: float, num_servers: int) -> float:
+    """Busy time as a percentage of the available server time."""
+    if duration == 0 or num_servers == 0:
+        return 0.0
+    return min(100.0, float(busy_time) / (duration * num_servers) * 100)
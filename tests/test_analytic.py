@@ -0,0 +1,81 @@
+import math
+import unittest
+
+from src.analytic import AnalyticEstimator, erlang_c, estimate_station
+from src.config import Config
+
+
+class TestErlangC(unittest.TestCase):
+    def test_single_server_wait_probability_is_utilization(self):
+        self.assertAlmostEqual(erlang_c(1, 0.6), 0.6)
+
+    def test_matches_known_value(self):
+        # M/M/2 with offered load 1: P(wait) = 1/3
+        self.assertAlmostEqual(erlang_c(2, 1.0), 1 / 3)
+
+    def test_overloaded_station_always_waits(self):
+        self.assertEqual(erlang_c(2, 2.5), 1.0)
+
+
+class TestEstimateStation(unittest.TestCase):
+    def test_mm1_wait_matches_closed_form(self):
+        station = estimate_station("mm1", 1, 0.5, 1.0, 1.0, 1.0)
+        # Wq = rho / (mu - lambda) for M/M/1
+        self.assertAlmostEqual(station.wait_in_queue, 1.0)
+        self.assertAlmostEqual(station.departure_scv, 1.0)
+
+    def test_unstable_station_is_flagged(self):
+        station = estimate_station("busy", 1, 2.0, 1.0, 1.0, 1.0)
+        self.assertFalse(station.stable)
+        self.assertTrue(math.isinf(station.wait_in_queue))
+        self.assertEqual(station.throughput, 1.0)
+
+
+class TestAnalyticEstimator(unittest.TestCase):
+    def test_estimate_has_simulation_metric_keys(self):
+        estimate = AnalyticEstimator(Config()).estimate()
+        for key in [
+            "total_customers_served",
+            "customers_per_hour",
+            "average_wait_time",
+            "kitchen_utilization",
+            "counter_utilization",
+        ]:
+            self.assertIn(key, estimate)
+        self.assertTrue(estimate["stable"])
+        self.assertEqual(len(estimate["stations"]), 4)
+
+    def test_more_cooks_never_increase_the_wait(self):
+        config = Config()
+        config.kitchen_servers = 1
+        slow = AnalyticEstimator(config).estimate()
+        config.kitchen_servers = 3
+        fast = AnalyticEstimator(config).estimate()
+        self.assertLess(fast["average_wait_time"], slow["average_wait_time"])
+
+    def test_overloaded_config_still_estimates_throughput(self):
+        config = Config()
+        config.interarrival_time = 1.0
+        estimate = AnalyticEstimator(config).estimate()
+        self.assertFalse(estimate["stable"])
+        self.assertTrue(math.isinf(estimate["average_wait_time"]))
+        self.assertGreater(estimate["total_customers_served"], 0)
+
+    def test_run_within_the_warm_up_keeps_everything(self):
+        config = Config()
+        for duration in (config.warm_up_time, config.warm_up_time // 2):
+            with self.subTest(duration=duration):
+                with self.assertLogs("src.config", "WARNING"):
+                    estimate = AnalyticEstimator(config).estimate(duration)
+                self.assertEqual(estimate["warm_up_time"], 0)
+                self.assertGreaterEqual(estimate["customers_per_hour"], 0)
+
+    def test_agrees_with_simulation(self):
+        rows = AnalyticEstimator(Config()).validate(num_runs=20, seed=7)
+        for row in rows:
+            if row["metric"] in ("average_wait_time", "total_customers_served"):
+                self.assertLess(abs(row["relative_error"]), 0.15, row)
+
+
+if __name__ == "__main__":
+    unittest.main()
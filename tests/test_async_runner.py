@@ -0,0 +1,109 @@
+import asyncio
+import tempfile
+import threading
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Any, Callable, TypeVar
+
+from src.async_runner import AsyncSimulationRunner
+from src.cache import ResultCache
+from src.config import RunConfig
+from src.simulation import SimulationRunner
+
+CONFIG = RunConfig(sim_duration=120)
+
+T = TypeVar("T")
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """Thread pool that records how many calls it has started."""
+
+    def __init__(self, max_workers):
+        super().__init__(max_workers)
+        self.started = 0
+        self._count_lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        with self._count_lock:
+            self.started += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+class TestAsyncSimulationRunner(unittest.TestCase):
+    def test_results_match_the_blocking_runner(self):
+        async def study():
+            async with AsyncSimulationRunner(CONFIG, max_workers=2) as runner:
+                return (
+                    await runner.run_simulation(seed=3),
+                    await runner.run_multiple_simulations(4, seed=3),
+                )
+
+        single, multiple = asyncio.run(study())
+        runner = SimulationRunner(CONFIG)
+        self.assertEqual(single, runner.run_simulation(seed=3)[1])
+        self.assertEqual(multiple, runner.run_multiple_simulations(4, seed=3))
+
+    def test_iterator_yields_each_run_once(self):
+        async def study(executor):
+            runner = AsyncSimulationRunner(CONFIG, max_concurrency=3, executor=executor)
+            return [m["run_number"] async for m in runner.iter_replications(7, 1)]
+
+        with ThreadPoolExecutor(3) as executor:
+            run_numbers = asyncio.run(study(executor))
+        self.assertEqual(sorted(run_numbers), list(range(1, 8)))
+
+    def test_leaving_the_iterator_early_starts_no_more_runs(self):
+        executor = CountingExecutor(1)
+
+        async def study():
+            runner = AsyncSimulationRunner(CONFIG, max_concurrency=2, executor=executor)
+            async with aclosing(runner.iter_replications(50, seed=1)) as results:
+                async for _ in results:
+                    break
+
+        asyncio.run(study())
+        executor.shutdown()
+        # The first window of two, plus one run refilling it after the first
+        self.assertLessEqual(executor.started, 3)
+
+    def test_cancellation_stops_the_study(self):
+        executor = CountingExecutor(1)
+
+        async def study():
+            runner = AsyncSimulationRunner(CONFIG, max_concurrency=1, executor=executor)
+            task = asyncio.ensure_future(runner.run_multiple_simulations(50, seed=1))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(study())
+        executor.shutdown()
+        self.assertLess(executor.started, 50)
+
+    def test_cached_replications_are_not_run_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            executor = CountingExecutor(2)
+            runner = SimulationRunner(CONFIG, cache=ResultCache(directory))
+
+            async def study():
+                async_runner = AsyncSimulationRunner(runner, executor=executor)
+                first = await async_runner.run_multiple_simulations(3, seed=2)
+                second = await async_runner.run_multiple_simulations(3, seed=2)
+                return first, second
+
+            first, second = asyncio.run(study())
+            executor.shutdown()
+            self.assertEqual(first, second)
+            self.assertEqual(executor.started, 3)
+
+    def test_rejects_bad_limits(self):
+        with self.assertRaises(ValueError):
+            AsyncSimulationRunner(CONFIG, max_workers=0)
+        with self.assertRaises(ValueError):
+            AsyncSimulationRunner(SimulationRunner(CONFIG, engine="vectorized"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.cache import ResultCache, result_key
+from src.config import Config
+from src.simulation import SimulationRunner
+
+
+class TestResultKey(unittest.TestCase):
+    def test_key_is_stable(self):
+        self.assertEqual(result_key(Config(), 1), result_key(Config(), 1))
+
+    def test_key_depends_on_what_determines_the_result(self):
+        config = Config()
+        key = result_key(config, 1)
+        self.assertNotEqual(key, result_key(config, 2))
+        self.assertNotEqual(key, result_key(config, 1, antithetic=True))
+        self.assertNotEqual(key, result_key(config, 1, engine="vectorized"))
+        self.assertNotEqual(key, result_key(config, 1, duration=60))
+        self.assertNotEqual(key, result_key(config, 1, fused_journeys=False))
+        config.kitchen_servers = 3
+        self.assertNotEqual(key, result_key(config, 1))
+
+    def test_run_count_does_not_change_the_key(self):
+        config = Config()
+        config.num_runs = 7
+        self.assertEqual(result_key(config, 1), result_key(Config(), 1))
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_and_counters(self):
+        cache = ResultCache(self.tmpdir.name)
+        self.assertIsNone(cache.get("ab12"))
+        cache.put("ab12", {"average_wait_time": 1.5, "total_customers": 3})
+        self.assertEqual(
+            cache.get("ab12"), {"average_wait_time": 1.5, "total_customers": 3}
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_entries_survive_reopening(self):
+        ResultCache(self.tmpdir.name).put("cd34", {"x": 1})
+        reopened = ResultCache(self.tmpdir.name)
+        self.assertEqual(len(reopened), 1)
+        self.assertEqual(reopened.get("cd34"), {"x": 1})
+
+    def test_evicts_least_recently_used(self):
+        cache = ResultCache(self.tmpdir.name)
+        cache.put("aa", {"x": 1})
+        entry_size = cache.size_bytes
+        cache.max_bytes = 2 * entry_size
+        cache.put("bb", {"x": 2})
+        cache.get("aa")
+        cache.put("cc", {"x": 3})
+        self.assertIsNone(cache.get("bb"))
+        self.assertIsNotNone(cache.get("aa"))
+        self.assertEqual(cache.evictions, 1)
+        self.assertLessEqual(cache.size_bytes, cache.max_bytes)
+
+
+class TestRunnerCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.tmpdir.name)
+        self.config = Config()
+        self.config.sim_duration = 120
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_repeated_study_is_served_from_cache(self):
+        runner = SimulationRunner(self.config, cache=self.cache)
+        first = runner.run_multiple_simulations(4, seed=5)
+        with patch("src.simulation._run_replication") as run_replication:
+            second = runner.run_multiple_simulations(4, seed=5)
+        run_replication.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.hits, 4)
+
+    def test_longer_study_only_runs_new_replications(self):
+        runner = SimulationRunner(self.config, cache=self.cache)
+        runner.run_multiple_simulations(3, seed=5)
+        all_metrics = runner.run_multiple_simulations(5, seed=5)
+        self.assertEqual([m["run_number"] for m in all_metrics], [1, 2, 3, 4, 5])
+        self.assertEqual((self.cache.hits, len(self.cache)), (3, 5))
+
+    def test_seeded_single_run_hit_returns_no_restaurant(self):
+        runner = SimulationRunner(self.config, cache=self.cache)
+        restaurant, metrics = runner.run_simulation(seed=9)
+        self.assertIsNotNone(restaurant)
+        restaurant, cached = runner.run_simulation(seed=9)
+        self.assertIsNone(restaurant)
+        self.assertEqual(cached, metrics)
+
+    def test_staged_journeys_do_not_share_fused_results(self):
+        SimulationRunner(self.config, cache=self.cache).run_simulation(seed=7)
+        staged = SimulationRunner(self.config, fused_journeys=False, cache=self.cache)
+        restaurant, _ = staged.run_simulation(seed=7)
+        self.assertIsNotNone(restaurant)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_unseeded_runs_are_not_cached(self):
+        runner = SimulationRunner(self.config, cache=self.cache)
+        runner.run_simulation()
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.campaign import CampaignLog, campaign_path, config_hash
+from src.config import RunConfig
+from src.simulation import SimulationRunner
+
+CONFIG = RunConfig(sim_duration=120)
+
+
+class Interrupted(Exception):
+    pass
+
+
+class CrashingLog(CampaignLog):
+    """Campaign log whose process 'dies' after a number of appends."""
+
+    def __init__(self, directory, campaign_id, appends):
+        super().__init__(directory, campaign_id)
+        self.appends = appends
+
+    def append(self, metrics):
+        if self.appends == 0:
+            raise Interrupted
+        self.appends -= 1
+        super().append(metrics)
+
+
+class TestCampaignLog(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_new_log_has_a_header(self):
+        with CampaignLog(self.directory, "study") as log:
+            log.open(CONFIG, seed=7)
+            log.append({"run_number": 1, "average_wait_time": 1.5})
+        with open(campaign_path(self.directory, "study")) as log_file:
+            header, record = [json.loads(line) for line in log_file]
+        self.assertEqual(header["seed"], 7)
+        self.assertEqual(header["config_hash"], config_hash(CONFIG))
+        self.assertEqual(record["run_number"], 1)
+        self.assertEqual(record["seed"], 7)
+
+    def test_resume_reads_completed_runs_and_keeps_the_seed(self):
+        with CampaignLog(self.directory, "study") as log:
+            log.open(CONFIG)
+            seed = log.seed
+            log.append({"run_number": 2, "average_wait_time": 0.1 + 0.2})
+        with CampaignLog(self.directory, "study") as log:
+            log.open(CONFIG)
+            self.assertEqual(log.seed, seed)
+            self.assertEqual(
+                log.completed, {2: {"run_number": 2, "average_wait_time": 0.1 + 0.2}}
+            )
+
+    def test_torn_last_line_is_dropped(self):
+        with CampaignLog(self.directory, "study") as log:
+            log.open(CONFIG, seed=1)
+            log.append({"run_number": 1, "average_wait_time": 1.0})
+        path = campaign_path(self.directory, "study")
+        with open(path, "a") as log_file:
+            log_file.write('{"config_hash": "ab')
+
+        with CampaignLog(self.directory, "study") as log:
+            log.open(CONFIG, seed=1)
+            self.assertEqual(list(log.completed), [1])
+            log.append({"run_number": 2, "average_wait_time": 2.0})
+        with open(path) as log_file:
+            self.assertEqual(len([json.loads(line) for line in log_file]), 3)
+
+    def test_refuses_a_different_study(self):
+        with CampaignLog(self.directory, "study") as log:
+            log.open(CONFIG, seed=1)
+        for config, seed in ((CONFIG.replace(kitchen_servers=3), 1), (CONFIG, 2)):
+            with self.subTest(config=config, seed=seed):
+                with CampaignLog(self.directory, "study") as log:
+                    with self.assertRaises(ValueError):
+                        log.open(config, seed)
+
+    def test_refuses_another_journey_mode(self):
+        with CampaignLog(self.directory, "study") as log:
+            log.open(CONFIG, seed=1, fused_journeys=True)
+        with CampaignLog(self.directory, "study") as log:
+            with self.assertRaises(ValueError):
+                log.open(CONFIG, 1, fused_journeys=False)
+
+    def test_run_count_is_not_part_of_the_identity(self):
+        self.assertEqual(config_hash(CONFIG), config_hash(CONFIG.replace(num_runs=3)))
+
+    def test_rejects_unsafe_ids(self):
+        for campaign_id in ("", "../escape", "a/b", ".hidden"):
+            with self.subTest(campaign_id=campaign_id):
+                with self.assertRaises(ValueError):
+                    campaign_path(self.directory, campaign_id)
+
+
+class TestRunCampaign(unittest.TestCase):
+    def test_resumed_campaign_equals_an_uninterrupted_run(self):
+        runner = SimulationRunner(CONFIG)
+        expected = runner.run_multiple_simulations(8, seed=9)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with patch(
+                "src.simulation.CampaignLog",
+                lambda directory, campaign_id: CrashingLog(
+                    directory, campaign_id, appends=5
+                ),
+            ):
+                with self.assertRaises(Interrupted):
+                    runner.run_campaign("study", 8, seed=9, directory=directory)
+
+            with patch(
+                "src.simulation.SimulationRunner.iter_replications",
+                side_effect=SimulationRunner.iter_replications,
+                autospec=True,
+            ) as iter_replications:
+                resumed = runner.run_campaign("study", 8, directory=directory)
+            tasks = iter_replications.call_args.args[1]
+            self.assertEqual([task.run_number for task in tasks], [6, 7, 8])
+
+            self.assertEqual(resumed, expected)
+            staged = SimulationRunner(CONFIG, fused_journeys=False)
+            with self.assertRaises(ValueError):
+                staged.run_campaign("study", 8, directory=directory)
+            path = campaign_path(directory, "study")
+            with open(path) as log_file:
+                self.assertEqual(sum(1 for _ in log_file), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
+import dataclasses
+import math
+import pickle
 import unittest
+from typing import Any, Dict
 
-from src.config import Config
+from src.config import CONFIG_KEYS, Config, RunConfig, config_values, run_config
 
 
 class TestConfig(unittest.TestCase):
@@ -14,13 +18,21 @@ class TestConfig(unittest.TestCase):
             "counter_servers": 1,
             "kitchen_queue_size": 5,
             "counter_queue_size": 3,
+            "admission_control": False,
+            "patience": math.inf,
             "warm_up_time": 60,
+            "warm_up_method": "fixed",
             "sim_duration": 480,
             "num_runs": 50,
             "mean_order_time": 2,
             "mean_cook_time": 5,
             "mean_service_time": 4,
             "driver_capacity": 10,
+            "interarrival_distribution": "exponential",
+            "order_time_distribution": "uniform",
+            "cook_time_distribution": "uniform",
+            "service_time_distribution": "uniform",
+            "variate_block_size": 1024,
         }
         self.assertEqual(len(config_values), len(expected_config))
         for key, value in expected_config.items():
@@ -28,6 +40,82 @@ class TestConfig(unittest.TestCase):
             self.assertTrue(key in config_values)
             self.assertEqual(config_values[key], value)
 
+    def test_settings_are_the_run_config_fields(self):
+        self.assertEqual(tuple(Config.__annotations__), CONFIG_KEYS)
+
+    def test_config_values_include_instance_overrides(self):
+        config = Config()
+        config.kitchen_servers = 7
+        values = config_values(config)
+        self.assertEqual(values["kitchen_servers"], 7)
+        self.assertEqual(set(values), set(Config.get_config()))
+
+    def test_freeze_validates_current_values(self):
+        config = Config(kitchen_servers=3)
+        frozen = config.freeze()
+        self.assertEqual(frozen, RunConfig(kitchen_servers=3))
+        config.kitchen_servers = 0
+        with self.assertRaises(ValueError):
+            config.freeze()
+
+    def test_freeze_rejects_unknown_settings(self):
+        config = Config()
+        setattr(config, "kitchen_server", 3)
+        with self.assertRaises(ValueError):
+            config.freeze()
+
+
+class TestRunConfig(unittest.TestCase):
+    def test_defaults_match_config(self):
+        self.assertEqual(RunConfig().as_dict(), Config.get_config())
+
+    def test_is_frozen_and_slotted(self):
+        config = RunConfig()
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            setattr(config, "kitchen_servers", 3)
+        self.assertFalse(hasattr(config, "__dict__"))
+
+    def test_equal_values_hash_alike_and_survive_pickling(self):
+        config = RunConfig(interarrival_time=3)
+        copy = pickle.loads(pickle.dumps(config))
+        self.assertEqual(copy, config)
+        self.assertEqual(hash(copy), hash(config))
+        self.assertEqual(copy.digest(), config.digest())
+        self.assertNotEqual(config.digest(), RunConfig().digest())
+
+    def test_replace_derives_a_validated_copy(self):
+        base = RunConfig()
+        derived = base.replace(kitchen_servers=4)
+        self.assertEqual(derived.kitchen_servers, 4)
+        self.assertEqual(base.kitchen_servers, 2)
+        with self.assertRaises(ValueError):
+            base.replace(kitchen_server=4)
+        with self.assertRaises(ValueError):
+            base.replace(warm_up_method="guess")
+
+    def test_rejects_invalid_values(self):
+        values: Dict[str, Any]
+        for values in (
+            {"interarrival_time": 0},
+            {"counter_servers": 1.5},
+            {"driver_capacity": 0},
+            {"kitchen_queue_size": -1},
+            {"patience": 0},
+            {"cook_time_distribution": "weibull"},
+            {"kitchen_servers": math.inf},
+            {"admission_control": []},
+            {"admission_control": 1},
+            {"service_time_distribution": 5},
+            {"sim_duration": "480"},
+        ):
+            with self.subTest(values=values), self.assertRaises(ValueError):
+                RunConfig(**values)
+
+    def test_run_config_accepts_any_config(self):
+        frozen = RunConfig(num_runs=5)
+        self.assertIs(run_config(frozen), frozen)
+        self.assertEqual(run_config(Config(num_runs=5)), frozen)
+
 
 if __name__ == "__main__":
     unittest.main()
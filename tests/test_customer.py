@@ -5,6 +5,7 @@ from simpy import Environment
 from src.config import Config
 from src.customer import FoodAppCustomer, InHouseCustomer
 from src.driver import Driver
+from src.instrumentation import CountingEnvironment
 from src.restaurant import Restaurant
 
 
@@ -12,7 +13,7 @@ class TestInHouseCustomer(unittest.TestCase):
     def setUp(self):
         self.env = Environment()
         self.config = Config()
-        self.restaurant = Restaurant(self.env, self.config)
+        self.restaurant = Restaurant(self.env, self.config, keep_customers=True)
         self.customer = InHouseCustomer(self.env, 1, self.restaurant, 0, self.config)
 
     def test_place_order(self):
@@ -48,12 +49,28 @@ class TestInHouseCustomer(unittest.TestCase):
         self.customer.leave()
         self.assertTrue(len(self.restaurant.metrics.customers) == 1)
 
+    def test_customer_shares_env_and_config_through_restaurant(self):
+        self.assertFalse(hasattr(self.customer, "__dict__"))
+        self.assertIs(self.customer.env, self.env)
+        self.assertIs(self.customer.config, self.config)
+
+    def test_customer_rejects_foreign_env(self):
+        with self.assertRaises(ValueError):
+            InHouseCustomer(Environment(), 2, self.restaurant, 0, self.config)
+
+    def test_journey(self):
+        self.env.process(self.customer.journey())
+        self.env.run()
+
+        self.assertIsNotNone(self.customer.service_time)
+        self.assertEqual(self.restaurant.metrics.customers, [self.customer])
+
 
 class TestFoodAppCustomer(unittest.TestCase):
     def setUp(self):
         self.env = Environment()
         self.config = Config()
-        self.restaurant = Restaurant(self.env, self.config)
+        self.restaurant = Restaurant(self.env, self.config, keep_customers=True)
         self.driver = Driver(self.env, self.config)
         self.customer = FoodAppCustomer(
             self.env, 1, self.restaurant, 0, self.config, self.driver
@@ -111,6 +128,32 @@ class TestFoodAppCustomer(unittest.TestCase):
         self.assertTrue(customer.pickup_time >= customer.cook_time)
         self.assertTrue(customer.pickup_time == pickup_time)
 
+    def test_schedule_pickup_waits_for_cook_without_polling(self):
+        env = CountingEnvironment()
+        restaurant = Restaurant(env, self.config)
+        customer = FoodAppCustomer(
+            env, 1, restaurant, 0, self.config, Driver(env, self.config)
+        )
+        customer.cook_time = 50
+
+        env.process(customer.schedule_pickup(60))
+        env.run()
+
+        self.assertEqual(env.now, 60)
+        # Polling once a minute would schedule fifty timeouts to reach t=50
+        self.assertLess(env.events_scheduled, 10)
+
+    def test_journey(self):
+        self.env.process(self.customer.journey())
+        self.env.run()
+
+        self.assertEqual(self.customer.pickup_time, self.env.now)
+        self.assertGreaterEqual(
+            self.customer.pickup_time,
+            self.customer.cook_time + self.customer.pickup_delay,
+        )
+        self.assertEqual(self.restaurant.metrics.customers, [self.customer])
+
     def test_leave(self):
         # create a customer instance
         customer = self.customer
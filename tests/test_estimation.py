@@ -0,0 +1,90 @@
+import math
+import unittest
+
+from src.estimation import (
+    RunningStatistic,
+    confidence_interval,
+    lag1_autocorrelation,
+    lag1_test,
+    mser_truncation,
+    sample_variance,
+    t_quantile,
+)
+
+
+class TestTQuantile(unittest.TestCase):
+    def test_matches_tabulated_values(self):
+        # Two-sided 95% critical values from standard t tables
+        for df, expected in [(1, 12.706), (2, 4.303), (5, 2.571), (30, 2.042)]:
+            self.assertAlmostEqual(t_quantile(0.975, df), expected, places=2)
+
+    def test_is_symmetric(self):
+        self.assertAlmostEqual(t_quantile(0.025, 10), -t_quantile(0.975, 10))
+
+    def test_rejects_zero_degrees_of_freedom(self):
+        with self.assertRaises(ValueError):
+            t_quantile(0.975, 0)
+
+
+class TestConfidenceInterval(unittest.TestCase):
+    def test_mean_and_half_width(self):
+        values = [1.0, 2.0, 3.0, 4.0]
+        mean, half_width = confidence_interval(values, 0.95)
+        self.assertEqual(mean, 2.5)
+        expected = t_quantile(0.975, 3) * math.sqrt(sample_variance(values) / 4)
+        self.assertAlmostEqual(half_width, expected)
+
+    def test_single_value_has_infinite_half_width(self):
+        self.assertEqual(confidence_interval([5.0]), (5.0, math.inf))
+
+    def test_empty_values_are_rejected(self):
+        with self.assertRaises(ValueError):
+            confidence_interval([])
+
+
+class TestMserTruncation(unittest.TestCase):
+    def test_deletes_initial_transient(self):
+        ramp = [50.0 - i for i in range(50)]
+        steady = [1.0 + 0.1 * math.sin(i) for i in range(200)]
+        self.assertEqual(mser_truncation(ramp + steady), 50)
+
+    def test_keeps_stationary_series(self):
+        self.assertEqual(mser_truncation([1.0, 2.0] * 50), 0)
+
+    def test_short_series_is_not_truncated(self):
+        self.assertEqual(mser_truncation([5.0, 1.0, 1.0]), 0)
+
+
+class TestLag1Autocorrelation(unittest.TestCase):
+    def test_alternating_series_is_negatively_correlated(self):
+        self.assertAlmostEqual(lag1_autocorrelation([1.0, -1.0] * 10), -0.95)
+
+    def test_constant_series_has_zero_correlation(self):
+        self.assertEqual(lag1_autocorrelation([3.0] * 5), 0.0)
+
+    def test_trend_fails_independence_test(self):
+        self.assertFalse(lag1_test([float(i) for i in range(20)]))
+        self.assertTrue(lag1_test([1.0, -1.0] * 10))
+
+
+class TestRunningStatistic(unittest.TestCase):
+    def test_matches_batch_statistics(self):
+        values = [4.0, 7.0, 13.0, 16.0, 2.5]
+        statistic = RunningStatistic()
+        for value in values:
+            statistic.add(value)
+
+        self.assertEqual(statistic.count, 5)
+        self.assertAlmostEqual(statistic.mean, sum(values) / 5)
+        self.assertAlmostEqual(statistic.variance, sample_variance(values))
+        self.assertEqual(statistic.minimum, 2.5)
+        self.assertEqual(statistic.maximum, 16.0)
+
+    def test_empty_statistic(self):
+        statistic = RunningStatistic()
+        self.assertEqual(statistic.mean, 0.0)
+        self.assertEqual(statistic.variance, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
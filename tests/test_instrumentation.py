@@ -0,0 +1,65 @@
+import unittest
+
+import simpy
+
+from src.instrumentation import CountingEnvironment, MonitoredResource
+
+
+def use(env, resource, arrive, hold):
+    yield env.timeout(arrive)
+    with resource.request() as request:
+        yield request
+        yield env.timeout(hold)
+
+
+class TestCountingEnvironment(unittest.TestCase):
+    def test_counts_scheduled_events(self):
+        env = CountingEnvironment()
+        env.timeout(1)
+        env.timeout(2)
+        self.assertEqual(env.events_scheduled, 2)
+
+
+class TestMonitoredResource(unittest.TestCase):
+    def setUp(self):
+        # One server: A holds it over [0, 4), B queues over [1, 4) and holds
+        # it over [4, 6), C queues over [2, 6) and holds it over [6, 7)
+        self.env = simpy.Environment()
+        self.resource = MonitoredResource(self.env, capacity=1, name="till")
+        for arrive, hold in [(0, 4), (1, 2), (2, 1)]:
+            self.env.process(use(self.env, self.resource, arrive, hold))
+
+    def test_time_weighted_integrals(self):
+        self.env.run(until=10)
+        statistics = self.resource.statistics()
+        self.assertEqual(statistics["busy_time"], 7)
+        self.assertEqual(statistics["queue_time"], 3 + 4)
+        self.assertEqual(statistics["max_queue"], 2)
+
+    def test_integrals_run_up_to_now(self):
+        self.env.run(until=3)
+        statistics = self.resource.statistics()
+        self.assertEqual(statistics["busy_time"], 3)
+        self.assertEqual(statistics["queue_time"], 2 + 1)
+
+    def test_reset_restarts_integrals(self):
+        self.env.run(until=5)
+        self.resource.reset_monitor()
+        self.env.run(until=10)
+        statistics = self.resource.statistics()
+        self.assertEqual(statistics["busy_time"], 2)
+        self.assertEqual(statistics["queue_time"], 1)
+        self.assertEqual(statistics["max_queue"], 1)
+
+    def test_statistics_since_checkpoint(self):
+        self.env.run(until=4.5)
+        self.resource.checkpoint()
+        self.env.run(until=10)
+        statistics = self.resource.statistics(since=4.5)
+        self.assertEqual(statistics["busy_time"], 2.5)
+        self.assertEqual(statistics["queue_time"], 1.5)
+        self.assertEqual(statistics["max_queue"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
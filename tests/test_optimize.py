@@ -0,0 +1,68 @@
+import unittest
+
+from src.config import Config
+from src.optimize import FEASIBLE, NOT_RUN, StaffingOptimizer
+
+
+class TestStaffingOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.config = Config()
+        self.config.sim_duration = 240
+        self.config.interarrival_time = 3
+
+    def optimizer(self, max_wait, **kwargs):
+        return StaffingOptimizer(
+            {"kitchen_servers": [1, 2, 3], "counter_servers": [1, 2]},
+            {"kitchen_servers": 1.0, "counter_servers": 1.5},
+            max_wait,
+            self.config,
+            initial_runs=5,
+            max_runs=40,
+            **kwargs,
+        )
+
+    def test_candidates_are_in_cost_order(self):
+        costs = [
+            c["kitchen_servers"] + 1.5 * c["counter_servers"]
+            for c in self.optimizer(10).candidates()
+        ]
+        self.assertEqual(costs, sorted(costs))
+        self.assertEqual(len(costs), 6)
+
+    def test_finds_cheapest_feasible_staffing(self):
+        result = self.optimizer(20).optimize(seed=3)
+        best = result["best"]
+        self.assertIsNotNone(best)
+        self.assertEqual(best["status"], FEASIBLE)
+        for outcome in result["candidates"]:
+            if outcome["cost"] < best["cost"]:
+                self.assertFalse(outcome["feasible"])
+
+    def test_skips_candidates_dearer_than_the_answer(self):
+        result = self.optimizer(20).optimize(seed=3)
+        self.assertIn(NOT_RUN, [c["status"] for c in result["candidates"]])
+        self.assertLess(result["replications"], result["brute_force_replications"])
+        self.assertGreater(result["savings"], 0)
+
+    def test_brute_force_budget_is_what_screening_needed(self):
+        result = self.optimizer(20).optimize(seed=3)
+        runs = [c["runs"] for c in result["candidates"]]
+        self.assertEqual(result["brute_force_budget"], max(runs))
+        self.assertLessEqual(result["brute_force_budget"], 40)
+        self.assertEqual(result["brute_force_replications"], len(runs) * max(runs))
+
+    def test_reports_when_nothing_is_feasible(self):
+        result = self.optimizer(0.5).optimize(seed=3)
+        self.assertIsNone(result["best"])
+
+    def test_rejects_unknown_staff_key(self):
+        with self.assertRaises(ValueError):
+            StaffingOptimizer({"chefs": [1]}, {}, 10)
+
+    def test_rejects_too_few_pilot_runs(self):
+        with self.assertRaises(ValueError):
+            StaffingOptimizer({}, {}, 10, initial_runs=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from typing import List
+
+import simpy
+
+from src.profiling import ProfilingEnvironment, StageTimer, event_kind
+
+
+class Kitchen:
+    def shift(self, env, log):
+        yield env.timeout(1)
+        log.append((yield from self.cook(env)))
+
+    def cook(self, env):
+        time.sleep(0.01)
+        yield env.timeout(2)
+        return "done"
+
+
+class TestProfilingEnvironment(unittest.TestCase):
+    def test_counts_events_by_kind(self):
+        env = ProfilingEnvironment()
+        resource = simpy.Resource(env)
+
+        def use():
+            with resource.request() as request:
+                yield request
+                yield env.timeout(1)
+
+        env.process(use())
+        env.run()
+        counts = env.event_counts
+        self.assertEqual(counts["process_start"], 1)
+        self.assertEqual(counts["request"], 1)
+        self.assertEqual(counts["release"], 1)
+        self.assertEqual(counts["timeout"], 1)
+        self.assertEqual(counts["process_end"], 1)
+        self.assertEqual(sum(counts.values()), env.events_scheduled)
+
+    def test_event_kind_of_plain_event(self):
+        self.assertEqual(event_kind(simpy.Event), "other")
+        self.assertEqual(event_kind(simpy.events.AnyOf), "condition")
+
+
+class TestStageTimer(unittest.TestCase):
+    def test_charges_delegated_stages_exclusively(self):
+        timer = StageTimer()
+        env = simpy.Environment()
+        log: List[str] = []
+        with timer.instrument([(Kitchen, "shift"), (Kitchen, "cook")]):
+            env.process(Kitchen().shift(env, log))
+            env.run()
+
+        self.assertEqual(log, ["done"])
+        self.assertGreaterEqual(timer.seconds["Kitchen.cook"], 0.01)
+        self.assertLess(timer.seconds["Kitchen.shift"], 0.01)
+        self.assertEqual(timer.calls, {"Kitchen.shift": 1, "Kitchen.cook": 1})
+
+    def test_other_threads_are_not_timed(self):
+        timer = StageTimer()
+        log: List[str] = []
+
+        def run_kitchen():
+            env = simpy.Environment()
+            env.process(Kitchen().shift(env, log))
+            env.run()
+
+        with timer.instrument([(Kitchen, "shift"), (Kitchen, "cook")]):
+            thread = threading.Thread(target=run_kitchen)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(log, ["done"])
+        self.assertEqual(timer.calls, {})
+
+    def test_restores_the_methods(self):
+        original = Kitchen.__dict__["cook"]
+        with StageTimer().instrument([(Kitchen, "cook")]):
+            self.assertIsNot(Kitchen.__dict__["cook"], original)
+        self.assertIs(Kitchen.__dict__["cook"], original)
+
+    def test_rejects_plain_methods(self):
+        class Till:
+            def total(self):
+                return 0
+
+        with self.assertRaises(ValueError):
+            with StageTimer().instrument([(Till, "total")]):
+                pass
+        self.assertEqual(Till().total(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from simpy import Environment
+
+from src.config import Config
+from src.customer import InHouseCustomer
+from src.random_streams import STREAM_NAMES, RandomStreams, derive_seed
+from src.restaurant import Restaurant
+
+
+class TestRandomStreams(unittest.TestCase):
+    def test_same_seed_gives_same_sequences(self):
+        streams1 = RandomStreams(123)
+        streams2 = RandomStreams(123)
+        for name in STREAM_NAMES:
+            self.assertEqual(
+                [streams1.stream(name).random() for _ in range(5)],
+                [streams2.stream(name).random() for _ in range(5)],
+            )
+
+    def test_sources_are_independent_streams(self):
+        streams = RandomStreams(123)
+        first_draws = {streams.stream(name).random() for name in STREAM_NAMES}
+        self.assertEqual(len(first_draws), len(STREAM_NAMES))
+
+    def test_drawing_from_one_source_does_not_shift_another(self):
+        streams1 = RandomStreams(5)
+        streams2 = RandomStreams(5)
+        for _ in range(100):
+            streams1.arrival.random()
+        self.assertEqual(streams1.cook.random(), streams2.cook.random())
+
+    def test_spawn_is_deterministic_per_run(self):
+        master = RandomStreams(99)
+        self.assertEqual(master.spawn(3).seed, RandomStreams(99).spawn(3).seed)
+        self.assertNotEqual(master.spawn(3).seed, master.spawn(4).seed)
+
+    def test_antithetic_twin_draws_complementary_uniforms(self):
+        streams = RandomStreams(11)
+        twin = streams.antithetic_twin()
+        for _ in range(10):
+            self.assertAlmostEqual(streams.order.random() + twin.order.random(), 1.0)
+        self.assertTrue(twin.spawn(1).antithetic)
+
+    def test_unseeded_streams_draw_a_master_seed(self):
+        self.assertIsInstance(RandomStreams().seed, int)
+
+    def test_derive_seed_is_stable(self):
+        self.assertEqual(derive_seed(1, "run", 2), derive_seed(1, "run", 2))
+        self.assertLess(derive_seed(1, "cook"), 2**64)
+
+
+class TestCustomerStreams(unittest.TestCase):
+    def order_time_for_seed(self, seed):
+        env = Environment()
+        config = Config()
+        restaurant = Restaurant(env, config, RandomStreams(seed))
+        customer = InHouseCustomer(env, 1, restaurant, 0, config)
+        env.process(customer.place_order())
+        env.run()
+        return env.now
+
+    def test_customer_draws_from_restaurant_streams(self):
+        self.assertEqual(self.order_time_for_seed(8), self.order_time_for_seed(8))
+        self.assertNotEqual(self.order_time_for_seed(8), self.order_time_for_seed(9))
+
+
+if __name__ == "__main__":
+    unittest.main()
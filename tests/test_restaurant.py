@@ -0,0 +1,119 @@
+import unittest
+from types import SimpleNamespace
+
+from src.restaurant import BALKED, RENEGED, Metrics
+
+
+def finished_customer(customer_type, arrival_time, service_time):
+    return SimpleNamespace(
+        customer_type=customer_type,
+        arrival_time=arrival_time,
+        service_time=service_time,
+    )
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics()
+        self.metrics.add_customer(finished_customer("inhouse", 0.0, 10.0))
+        self.metrics.add_customer(finished_customer("inhouse", 5.0, 9.0))
+        self.metrics.add_customer(finished_customer("foodapp", 2.0, None))
+
+    def test_customers_are_not_kept_by_default(self):
+        self.assertEqual(self.metrics.customers, [])
+        self.assertEqual(self.metrics.get_customer_count(), 3)
+
+    def test_customers_are_kept_on_request(self):
+        metrics = Metrics(keep_customers=True)
+        customer = finished_customer("inhouse", 0.0, 1.0)
+        metrics.add_customer(customer)
+        self.assertEqual(metrics.customers, [customer])
+
+    def test_breakdown_counts_customer_types(self):
+        self.assertEqual(
+            self.metrics.get_customer_breakdown(),
+            {"inhouse_customers": 2, "foodapp_customers": 1, "total_customers": 3},
+        )
+
+    def test_wait_time_covers_served_customers_only(self):
+        self.assertEqual(self.metrics.get_average_wait_time(), 7.0)
+        summary = self.metrics.get_wait_time_summary()
+        self.assertEqual(summary["min_wait_time"], 4.0)
+        self.assertEqual(summary["max_wait_time"], 10.0)
+        self.assertAlmostEqual(summary["wait_time_std"], 18**0.5)
+
+    def test_reset_clears_accumulators(self):
+        self.metrics.reset()
+        self.assertEqual(self.metrics.get_customer_count(), 0)
+        self.assertEqual(self.metrics.get_average_wait_time(), 0.0)
+        self.assertEqual(self.metrics.get_wait_time_summary()["max_wait_time"], 0.0)
+
+    def test_lost_customers_are_counted_by_reason_and_type(self):
+        self.metrics.add_lost(finished_customer("inhouse", 1.0, None), BALKED)
+        self.metrics.add_lost(finished_customer("foodapp", 2.0, None), BALKED)
+        self.metrics.add_lost(finished_customer("inhouse", 3.0, None), RENEGED)
+        self.assertEqual(
+            self.metrics.get_lost_breakdown(),
+            {
+                "balked_customers": 2,
+                "reneged_customers": 1,
+                "lost_inhouse_customers": 2,
+                "lost_foodapp_customers": 1,
+                "lost_customers": 3,
+            },
+        )
+        # Lost customers are not served customers
+        self.assertEqual(self.metrics.get_customer_count(), 3)
+
+    def test_unknown_loss_reason_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.metrics.add_lost(finished_customer("inhouse", 1.0, None), "bored")
+
+
+class TestMetricsTruncation(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics(keep_customers=True, record_series=True)
+        self.early = finished_customer("inhouse", 0.0, 30.0)
+        self.late = finished_customer("inhouse", 40.0, 42.0)
+        self.metrics.add_customer(self.early, 31.0)
+        self.metrics.add_customer(finished_customer("foodapp", 10.0, None), 35.0)
+        self.metrics.add_customer(self.late, 43.0)
+
+    def test_truncate_keeps_departures_after_cutoff(self):
+        self.metrics.truncate(33.0)
+        self.assertEqual(
+            self.metrics.get_customer_breakdown(),
+            {"inhouse_customers": 1, "foodapp_customers": 1, "total_customers": 2},
+        )
+        self.assertEqual(self.metrics.get_average_wait_time(), 2.0)
+        self.assertEqual(self.metrics.customers[-1], self.late)
+        self.assertEqual(len(self.metrics.customers), 2)
+
+    def test_wait_series_skips_unserved_customers(self):
+        self.assertEqual(self.metrics.wait_series(), ([31.0, 43.0], [30.0, 2.0]))
+
+    def test_mser_cutoff_drops_long_early_waits(self):
+        metrics = Metrics(record_series=True)
+        for i in range(100):
+            wait = 60.0 - 2 * i if i < 30 else 1.0 + (i % 3)
+            metrics.add_customer(finished_customer("inhouse", i - wait, i), i)
+        cutoff = metrics.mser_cutoff()
+        metrics.truncate(cutoff)
+        self.assertGreater(cutoff, 0.0)
+        self.assertLess(metrics.get_average_wait_time(), 4.0)
+
+    def test_truncate_drops_early_losses(self):
+        self.metrics.add_lost(finished_customer("inhouse", 20.0, None), BALKED, 20.0)
+        self.metrics.add_lost(finished_customer("foodapp", 36.0, None), RENEGED, 38.0)
+        self.metrics.truncate(33.0)
+        lost = self.metrics.get_lost_breakdown()
+        self.assertEqual((lost["balked_customers"], lost["reneged_customers"]), (0, 1))
+        self.assertEqual(lost["lost_foodapp_customers"], 1)
+
+    def test_truncate_needs_series(self):
+        with self.assertRaises(ValueError):
+            Metrics().truncate(10.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
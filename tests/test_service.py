@@ -0,0 +1,168 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, ClassVar, Dict, List, Tuple, TypeVar
+
+from src.cache import ResultCache
+from src.config import RunConfig
+from src.service import (
+    DEFAULT_HOST,
+    SimulationServer,
+    SimulationService,
+    parse_request,
+)
+from src.simulation import SimulationRunner
+
+CONFIG: Dict[str, Any] = {"sim_duration": 120}
+
+T = TypeVar("T")
+
+
+class ManualExecutor(Executor):
+    """Executor whose tasks run only when the test says so."""
+
+    def __init__(self) -> None:
+        self.pending: List[Tuple[Future, Callable[..., Any], Tuple[Any, ...]]] = []
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        future: Future[T] = Future()
+        self.pending.append((future, fn, args))
+        return future
+
+    def run_pending(self):
+        for future, fn, args in self.pending:
+            future.set_result(fn(*args))
+        self.pending = []
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.01)
+
+
+class TestParseRequest(unittest.TestCase):
+    def test_defaults(self):
+        config, replications, seed, confidence = parse_request({})
+        self.assertEqual(config, RunConfig())
+        self.assertEqual(replications, 1)
+        self.assertIsInstance(seed, int)
+        self.assertEqual(confidence, 0.95)
+
+    def test_rejects_bad_requests(self):
+        request: Any
+        for request in (
+            [],
+            {"size": 1},
+            {"config": {"no_such_setting": 1}},
+            {"config": {"kitchen_servers": 0}},
+            {"config": {"admission_control": []}},
+            {"config": {"interarrival_distribution": 5}},
+            {"replications": 0},
+            {"replications": "3"},
+            {"replications": True},
+            {"seed": False},
+            {"seed": 1.5},
+            {"confidence": 1},
+        ):
+            with self.subTest(request=request):
+                with self.assertRaises(ValueError):
+                    parse_request(request)
+
+
+class TestSimulationService(unittest.TestCase):
+    def test_identical_requests_in_flight_share_replications(self):
+        executor = ManualExecutor()
+        service = SimulationService(executor=executor)
+        request = {"config": CONFIG, "replications": 3, "seed": 5}
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(service.simulate(request)))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: service.replications_shared == 3)
+        executor.run_pending()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(service.replications_run, 3)
+        self.assertEqual(responses[0], responses[1])
+        self.assertEqual(service.stats()["in_flight"], 0)
+
+    def test_cached_replications_are_not_run_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            executor = ManualExecutor()
+            service = SimulationService(cache=ResultCache(directory), executor=executor)
+            request = {"config": CONFIG, "replications": 2, "seed": 5}
+            thread = threading.Thread(target=service.simulate, args=(request,))
+            thread.start()
+            wait_for(lambda: len(executor.pending) == 2)
+            executor.run_pending()
+            thread.join()
+
+            service.simulate(request)
+            self.assertEqual(service.replications_run, 2)
+            self.assertEqual(service.stats()["cache"]["hits"], 2)
+
+
+class TestSimulationServer(unittest.TestCase):
+    service: ClassVar[SimulationService]
+    server: ClassVar[SimulationServer]
+    thread: ClassVar[threading.Thread]
+    url: ClassVar[str]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.service = SimulationService(workers=1)
+        cls.server = SimulationServer(cls.service, port=0)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.url = f"http://{DEFAULT_HOST}:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+
+    def post(self, body):
+        request = urllib.request.Request(
+            f"{self.url}/simulate", data=json.dumps(body).encode(), method="POST"
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.load(response)
+
+    def test_simulate_matches_the_runner(self):
+        response = self.post({"config": CONFIG, "replications": 2, "seed": 11})
+        expected = SimulationRunner(RunConfig(**CONFIG)).run_multiple_simulations(
+            2, seed=11
+        )
+        self.assertEqual(response["seed"], 11)
+        self.assertEqual(response["metrics"], expected)
+        mean = sum(m["average_wait_time"] for m in expected) / 2
+        self.assertAlmostEqual(response["summary"]["average_wait_time"]["mean"], mean)
+
+    def test_bad_request_is_rejected(self):
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            self.post({"replications": -1})
+        self.assertEqual(raised.exception.code, 400)
+        self.assertIn("replications", json.load(raised.exception)["error"])
+
+    def test_health(self):
+        with urllib.request.urlopen(f"{self.url}/health") as response:
+            health = json.load(response)
+        self.assertEqual(health["status"], "ok")
+        self.assertEqual(health["workers"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
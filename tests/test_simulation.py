@@ -2,10 +2,18 @@
 Tests for the simulation runner and related functionality.
 """
 
+import inspect
+import math
+import os
+import pstats
+import tempfile
+import tracemalloc
 import unittest
 from unittest.mock import patch
 
-from src.config import Config
+from src.config import Config, RunConfig
+from src.customer import InHouseCustomer
+from src.estimation import confidence_interval
 from src.restaurant import Restaurant
 from src.simulation import SimulationConfig, SimulationRunner
 
@@ -39,6 +47,13 @@ class TestSimulationConfig(unittest.TestCase):
         self.assertEqual(config.counter_servers, 2)
         self.assertEqual(config.num_runs, 5)
 
+    def test_freezes_to_a_run_config(self):
+        """Test that SimulationConfig adapts to the frozen run configuration."""
+        frozen = SimulationConfig(duration=120, kitchen_servers=3).freeze()
+        self.assertEqual(frozen.sim_duration, 120)
+        self.assertEqual(frozen.kitchen_servers, 3)
+        self.assertEqual(frozen.warm_up_time, 0)
+
 
 class TestSimulationRunner(unittest.TestCase):
     """Test the SimulationRunner class."""
@@ -121,6 +136,290 @@ class TestSimulationRunner(unittest.TestCase):
             self.assertEqual(metrics["run_number"], i + 1)
             self.assertIn("total_customers_served", metrics)
 
+    def test_run_simulation_is_reproducible_with_seed(self):
+        """Test that the same seed gives the same metrics."""
+        _, metrics1 = self.runner.run_simulation(duration=60, seed=42)
+        _, metrics2 = self.runner.run_simulation(duration=60, seed=42)
+        self.assertEqual(metrics1, metrics2)
+
+    def test_run_multiple_simulations_parallel_matches_serial(self):
+        """Test that worker processes give the same results as a serial run."""
+        serial = self.runner.run_multiple_simulations(num_runs=4, seed=7)
+        parallel = self.runner.run_multiple_simulations(num_runs=4, workers=2, seed=7)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual([m["run_number"] for m in parallel], [1, 2, 3, 4])
+
+    def test_run_config_gives_the_same_results(self):
+        """Test that a frozen RunConfig runs like the equivalent Config."""
+        frozen = SimulationRunner(RunConfig(sim_duration=120))
+        self.config.sim_duration = 120
+        self.assertEqual(
+            frozen.run_multiple_simulations(num_runs=2, seed=7),
+            self.runner.run_multiple_simulations(num_runs=2, seed=7),
+        )
+
+    def test_profile_simulation_counts_events_and_stage_time(self):
+        """Test that a profiled run reports its cost without changing results."""
+        _, metrics = self.runner.run_simulation(duration=240, seed=4)
+        profile = self.runner.profile_simulation(duration=240, seed=4)
+
+        self.assertEqual(profile["metrics"], metrics)
+        self.assertEqual(
+            sum(profile["event_counts"].values()), profile["scheduled_events"]
+        )
+        self.assertGreater(profile["events_per_customer"]["timeout"], 1)
+        self.assertGreater(profile["generator_time"], 0)
+        self.assertGreater(profile["stage_time"]["InHouseCustomer.place_order"], 0)
+        self.assertGreater(profile["peak_memory"], 0)
+        self.assertTrue(inspect.isgeneratorfunction(InHouseCustomer.place_order))
+
+    def test_profile_simulation_writes_dumps(self):
+        """Test that cProfile and tracemalloc dumps are written on request."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cprofile_path = os.path.join(tmpdir, "run.prof")
+            tracemalloc_path = os.path.join(tmpdir, "run.snapshot")
+            profile = self.runner.profile_simulation(
+                duration=60,
+                seed=4,
+                cprofile_path=cprofile_path,
+                tracemalloc_path=tracemalloc_path,
+            )
+            stats = pstats.Stats(cprofile_path)
+            snapshot = tracemalloc.Snapshot.load(tracemalloc_path)
+        self.assertTrue(stats.get_stats_profile().func_profiles)
+        self.assertTrue(snapshot.traces)
+        self.assertGreater(profile["traced_peak_memory"], 0)
+
+    def test_run_multiple_simulations_rejects_invalid_workers(self):
+        """Test that a worker count below one is rejected."""
+        with self.assertRaises(ValueError):
+            self.runner.run_multiple_simulations(num_runs=2, workers=0)
+
+    def test_run_multiple_simulations_until_precision(self):
+        """Test that precision mode stops once the half-width target is met."""
+        target = 1.0
+        all_metrics = self.runner.run_multiple_simulations(
+            seed=5, target_half_width=target, metric="average_wait_time"
+        )
+
+        _, half_width = confidence_interval(
+            [m["average_wait_time"] for m in all_metrics]
+        )
+        self.assertLessEqual(half_width, target)
+        self.assertEqual(
+            [m["run_number"] for m in all_metrics],
+            list(range(1, len(all_metrics) + 1)),
+        )
+
+    def test_run_multiple_simulations_precision_respects_run_cap(self):
+        """Test that precision mode stops at the run cap."""
+        all_metrics = self.runner.run_multiple_simulations(
+            seed=5, target_half_width=1e-9, max_runs=7
+        )
+        self.assertEqual(len(all_metrics), 7)
+
+    def test_run_multiple_simulations_precision_with_one_run(self):
+        """Test that a one-run cap stops before projecting from no interval."""
+        all_metrics = self.runner.run_multiple_simulations(
+            seed=1, target_half_width=0.5, max_runs=1
+        )
+        self.assertEqual(len(all_metrics), 1)
+
+    def test_run_multiple_simulations_precision_rejects_zero_run_cap(self):
+        """Test that precision mode needs room for at least one run."""
+        with self.assertRaises(ValueError):
+            self.runner.run_multiple_simulations(
+                seed=1, target_half_width=0.5, max_runs=0
+            )
+
+    def test_run_multiple_simulations_rejects_unknown_metric(self):
+        """Test that precision mode needs a metric from the metrics dict."""
+        with self.assertRaises(ValueError):
+            self.runner.run_multiple_simulations(
+                seed=5, target_half_width=1.0, metric="no_such_metric"
+            )
+
+    def test_compare_configs_pairs_replications(self):
+        """Test that config comparison reports paired differences."""
+        other = Config()
+        other.kitchen_servers = 3
+        comparison = self.runner.compare_configs(
+            [self.config, other], num_runs=5, seed=3
+        )
+
+        self.assertEqual(len(comparison["configs"]), 2)
+        self.assertEqual(len(comparison["differences"]), 1)
+        difference = comparison["differences"][0]
+        self.assertAlmostEqual(
+            difference["mean"],
+            comparison["configs"][1]["mean"] - comparison["configs"][0]["mean"],
+        )
+        self.assertLessEqual(difference["lower"], difference["upper"])
+
+    def test_compare_identical_configs_has_zero_difference(self):
+        """Test that common random numbers make identical configs agree exactly."""
+        comparison = self.runner.compare_configs(
+            [self.config, self.config], num_runs=3, antithetic=True, seed=3
+        )
+
+        difference = comparison["differences"][0]
+        self.assertEqual(difference["mean"], 0.0)
+        self.assertEqual(difference["half_width"], 0.0)
+
+    def test_compare_configs_requires_two_configs(self):
+        """Test that a comparison needs a baseline and an alternative."""
+        with self.assertRaises(ValueError):
+            self.runner.compare_configs([self.config], num_runs=2)
+
+    def test_fused_journeys_match_stage_processes(self):
+        """Test that fused journeys agree with per-stage processes at lower cost."""
+        fused = self.runner.run_multiple_simulations(num_runs=10, seed=4)
+        staged = SimulationRunner(
+            self.config, fused_journeys=False
+        ).run_multiple_simulations(num_runs=10, seed=4)
+
+        for key in ("total_customers_served", "average_wait_time"):
+            fused_mean, half_width = confidence_interval([m[key] for m in fused])
+            staged_mean, _ = confidence_interval([m[key] for m in staged])
+            self.assertAlmostEqual(fused_mean, staged_mean, delta=half_width)
+
+        fused_events = sum(m["events_per_customer"] for m in fused)
+        staged_events = sum(m["events_per_customer"] for m in staged)
+        self.assertLess(fused_events, staged_events)
+
+    def test_warm_up_deletes_early_customers(self):
+        """Test that customers leaving before the warm-up are not counted."""
+        self.config.warm_up_time = 0
+        _, full = self.runner.run_simulation(duration=240, seed=2)
+        self.config.warm_up_time = 120
+        _, warmed = self.runner.run_simulation(duration=240, seed=2)
+
+        self.assertEqual(warmed["warm_up_time"], 120)
+        self.assertLess(
+            warmed["total_customers_served"], full["total_customers_served"]
+        )
+        self.assertAlmostEqual(
+            warmed["customers_per_hour"],
+            warmed["total_customers_served"] / 120 * 60,
+        )
+
+    def test_mser_warm_up_is_chosen_per_run(self):
+        """Test that MSER-5 mode reports the cut-off it picked."""
+        self.config.warm_up_method = "mser5"
+        self.config.interarrival_time = 3
+        all_metrics = self.runner.run_multiple_simulations(num_runs=4, seed=6)
+        cutoffs = [m["warm_up_time"] for m in all_metrics]
+        self.assertTrue(all(0 <= cutoff < 480 for cutoff in cutoffs))
+        self.assertGreater(max(cutoffs), 0)
+
+    def test_rejects_unknown_warm_up_method(self):
+        """Test that an unknown warm-up method is an error."""
+        self.config.warm_up_method = "guess"
+        with self.assertRaises(ValueError):
+            self.runner.run_simulation(duration=120)
+
+    def test_batch_means_estimates_from_one_run(self):
+        """Test that batch means splits one long run after a single warm-up."""
+        result = self.runner.run_batch_means(num_batches=10, seed=3)
+
+        self.assertEqual(result["simulation_duration"], 60 + 10 * 420)
+        self.assertEqual(result["warm_up_time"], 60)
+        self.assertEqual(result["num_batches"], 10)
+        served = sum(batch["total_customers_served"] for batch in result["batches"])
+        self.assertGreater(served, 0)
+        mean, half_width = result["estimates"]["average_wait_time"]
+        self.assertTrue(math.isfinite(half_width))
+
+    def test_batch_means_agrees_with_replications(self):
+        """Test that batch-means intervals cover the replication estimate."""
+        batch_mean, batch_hw = self.runner.run_batch_means(seed=5)["estimates"][
+            "customers_per_hour"
+        ]
+        replications = self.runner.run_multiple_simulations(num_runs=20, seed=5)
+        mean, half_width = confidence_interval(
+            [m["customers_per_hour"] for m in replications]
+        )
+        self.assertLess(abs(batch_mean - mean), batch_hw + half_width)
+
+    def test_correlated_batches_are_merged(self):
+        """Test that batches failing the lag-1 test are merged pairwise."""
+        with patch("src.simulation.lag1_test", return_value=False):
+            result = self.runner.run_batch_means(num_batches=40, seed=3)
+        self.assertEqual(result["num_batches"], 10)
+        self.assertEqual(result["batch_duration"], 4 * 420)
+        self.assertFalse(result["independent"])
+
+    def test_batch_means_rejects_too_few_batches(self):
+        """Test that batch means needs enough batches for the interval."""
+        with self.assertRaises(ValueError):
+            self.runner.run_batch_means(num_batches=3)
+
+    def test_resource_use_is_measured(self):
+        """Test that utilisation and queue statistics come from the monitors."""
+        restaurant, metrics = self.runner.run_simulation(seed=8)
+        self.assertGreater(metrics["kitchen_utilization"], 0)
+        self.assertGreater(metrics["counter_utilization"], 0)
+        self.assertLessEqual(metrics["kitchen_utilization"], 100)
+        for name in ("order_taker", "cook", "server", "driver"):
+            self.assertGreaterEqual(metrics[f"{name}_average_queue"], 0)
+            self.assertLessEqual(
+                metrics[f"{name}_average_queue"], metrics[f"{name}_max_queue"]
+            )
+        self.assertEqual(
+            [monitor.name for monitor in restaurant.monitors],
+            ["order_taker", "cook", "server", "driver"],
+        )
+
+    def test_admission_control_bounds_the_queues(self):
+        """Test that customers balk at full queues when admission is controlled."""
+        self.config.interarrival_time = 0.5
+        _, open_door = self.runner.run_simulation(duration=240, seed=8)
+        self.config.admission_control = True
+        _, controlled = self.runner.run_simulation(duration=240, seed=8)
+
+        self.assertEqual(open_door["lost_customers"], 0)
+        self.assertGreater(controlled["balked_customers"], 0)
+        self.assertEqual(
+            controlled["lost_customers"],
+            controlled["lost_inhouse_customers"] + controlled["lost_foodapp_customers"],
+        )
+        self.assertLess(controlled["cook_max_queue"], open_door["cook_max_queue"])
+
+    def test_admission_control_bounds_every_queue_joined(self):
+        """Test that no queue outgrows its limit, not only on arrival."""
+        self.config.interarrival_time = 0.3
+        self.config.warm_up_time = 0
+        self.config.admission_control = True
+        for fused in (True, False):
+            with self.subTest(fused_journeys=fused):
+                runner = SimulationRunner(self.config, fused_journeys=fused)
+                _, metrics = runner.run_simulation(duration=240, seed=3)
+                limits = {
+                    "order_taker": self.config.counter_queue_size,
+                    "cook": self.config.kitchen_queue_size,
+                    "server": self.config.counter_queue_size,
+                }
+                for name, limit in limits.items():
+                    self.assertLessEqual(metrics[f"{name}_max_queue"], limit)
+
+    def test_impatient_customers_renege(self):
+        """Test that customers leave the queue once their patience runs out."""
+        self.config.interarrival_time = 0.5
+        self.config.patience = 3.0
+        _, metrics = self.runner.run_simulation(duration=240, seed=8)
+        self.assertGreater(metrics["reneged_customers"], 0)
+        self.assertEqual(metrics["balked_customers"], 0)
+
+    def test_patience_applies_to_every_queue(self):
+        """Test that customers renege from the kitchen queue, not only the order queue."""
+        self.config.interarrival_time = 0.3
+        _, unbounded = self.runner.run_simulation(duration=240, seed=3)
+        self.config.patience = 2.0
+        _, impatient = self.runner.run_simulation(duration=240, seed=3)
+        self.assertLess(impatient["cook_max_queue"], unbounded["cook_max_queue"] / 10)
+        self.assertLess(impatient["server_max_queue"], 10)
+
     def test_calculate_utilization(self):
         """Test the utilization calculation method."""
         # Test normal case
@@ -0,0 +1,108 @@
+import io
+import json
+import unittest
+
+from src.config import Config
+from src.sweep import (
+    ParameterSweep,
+    RowWriter,
+    expand_grid,
+    output_format_for,
+    parse_axis,
+    point_config,
+)
+
+
+class TestParseAxis(unittest.TestCase):
+    def test_list_of_values(self):
+        self.assertEqual(
+            parse_axis("kitchen_servers=1,2,4"), ("kitchen_servers", [1, 2, 4])
+        )
+
+    def test_inclusive_range(self):
+        self.assertEqual(
+            parse_axis("counter_servers=1:3"), ("counter_servers", [1, 2, 3])
+        )
+
+    def test_fractional_range_step(self):
+        key, values = parse_axis("interarrival-time=2:3:0.5")
+        self.assertEqual(key, "interarrival_time")
+        self.assertEqual(values, [2, 2.5, 3])
+
+    def test_string_keys_take_distribution_specs(self):
+        _, values = parse_axis("cook_time_distribution=uniform,lognormal:1.5")
+        self.assertEqual(values, ["uniform", "lognormal:1.5"])
+
+    def test_rejects_unknown_key(self):
+        with self.assertRaises(ValueError):
+            parse_axis("chefs=1,2")
+
+    def test_rejects_backwards_range(self):
+        with self.assertRaises(ValueError):
+            parse_axis("kitchen_servers=3:1")
+
+
+class TestGrid(unittest.TestCase):
+    def test_expand_grid_is_cartesian_product(self):
+        points = expand_grid({"a": [1, 2], "b": ["x", "y", "z"]})
+        self.assertEqual(len(points), 6)
+        self.assertEqual(points[1], {"a": 1, "b": "y"})
+
+    def test_point_config_overrides_without_touching_base(self):
+        base = Config()
+        base.sim_duration = 120
+        config = point_config(base, {"kitchen_servers": 4})
+        self.assertEqual(config.kitchen_servers, 4)
+        self.assertEqual(config.sim_duration, 120)
+        self.assertEqual(base.kitchen_servers, Config.kitchen_servers)
+
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        self.base = Config()
+        self.base.sim_duration = 120
+        self.sweep = ParameterSweep(
+            {"kitchen_servers": [1, 2], "driver_capacity": [1, 5]},
+            self.base,
+            num_runs=3,
+        )
+
+    def test_one_row_per_grid_point(self):
+        rows = list(self.sweep.run(seed=4))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[2]["kitchen_servers"], 2)
+        self.assertEqual(rows[2]["runs"], 3)
+        self.assertIn("average_wait_time_mean", rows[2])
+        self.assertIn("average_wait_time_half_width", rows[2])
+
+    def test_parallel_sweep_matches_serial(self):
+        self.assertEqual(
+            list(self.sweep.run(workers=2, seed=4)), list(self.sweep.run(seed=4))
+        )
+
+    def test_rejects_unknown_metric(self):
+        sweep = ParameterSweep({"kitchen_servers": [1]}, self.base, 2, ["speed"])
+        with self.assertRaises(ValueError):
+            list(sweep.run(seed=1))
+
+
+class TestRowWriter(unittest.TestCase):
+    def test_csv_has_one_header(self):
+        stream = io.StringIO()
+        writer = RowWriter(stream, "csv")
+        writer.write({"a": 1, "b": 2.5})
+        writer.write({"a": 2, "b": 3.5})
+        self.assertEqual(stream.getvalue().splitlines(), ["a,b", "1,2.5", "2,3.5"])
+
+    def test_jsonl_writes_one_object_per_line(self):
+        stream = io.StringIO()
+        RowWriter(stream, "jsonl").write({"a": 1})
+        self.assertEqual(json.loads(stream.getvalue()), {"a": 1})
+
+    def test_format_follows_file_name(self):
+        self.assertEqual(output_format_for("out.jsonl"), "jsonl")
+        self.assertEqual(output_format_for("out.csv"), "csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
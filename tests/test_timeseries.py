@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from src.config import Config
+from src.simulation import SimulationRunner
+from src.timeseries import TimeSeries
+
+
+class TestTimeSeries(unittest.TestCase):
+    def test_buckets_hold_min_max_and_time_weighted_mean(self):
+        series = TimeSeries(["queue"], capacity=8, bucket_width=2.0)
+        series.record(0.5, 3)
+        series.record(1.5, 1)
+        arrays = series.to_arrays(until=4.0)
+        np.testing.assert_array_equal(arrays["time"], [0.0, 2.0, 4.0])
+        np.testing.assert_array_equal(arrays["queue_min"], [0, 1, 1])
+        np.testing.assert_array_equal(arrays["queue_max"], [3, 1, 1])
+        self.assertAlmostEqual(arrays["queue_mean"][0], (3 * 1.0 + 1 * 0.5) / 2)
+        self.assertAlmostEqual(arrays["queue_mean"][1], 1.0)
+
+    def test_downsampling_keeps_memory_bounded(self):
+        series = TimeSeries(["queue"], capacity=4, bucket_width=1.0)
+        for time in range(100):
+            series.record(time + 0.5, time % 3)
+        self.assertLessEqual(len(series), 4)
+        self.assertEqual(series.bucket_width, 32.0)
+        arrays = series.to_arrays()
+        self.assertEqual(arrays["queue_max"].max(), 2)
+        self.assertEqual(arrays["queue_min"].min(), 0)
+
+    def test_merged_means_are_time_weighted(self):
+        series = TimeSeries(["queue"], capacity=2, bucket_width=1.0)
+        series.record(0.0, 4)
+        series.record(1.0, 0)
+        series.record(3.0, 0)
+        self.assertEqual(series.bucket_width, 2.0)
+        self.assertAlmostEqual(series.to_arrays()["queue_mean"][0], 2.0)
+
+    def test_rejects_time_going_backwards(self):
+        series = TimeSeries(["queue"])
+        series.record(5.0, 1)
+        with self.assertRaises(ValueError):
+            series.record(4.0, 0)
+
+    def test_runner_records_every_station(self):
+        config = Config()
+        config.sim_duration = 4000
+        restaurant, _ = SimulationRunner(config).run_simulation(
+            seed=2, time_series_capacity=64
+        )
+        series = restaurant.get_time_series()
+        self.assertEqual(set(series), {"order_taker", "cook", "server", "driver"})
+        cook = series["cook"]
+        self.assertLessEqual(len(cook["time"]), 64)
+        self.assertTrue(np.all(cook["queue_min"] <= cook["queue_mean"] + 1e-9))
+        self.assertTrue(np.all(cook["in_system_mean"] <= cook["in_system_max"] + 1e-9))
+        self.assertTrue(np.all(cook["queue_max"] <= cook["in_system_max"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
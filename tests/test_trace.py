@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.config import Config
+from src.simulation import SimulationRunner
+from src.trace import TraceReader, TraceRecorder, open_run_traces
+
+
+def finished_customer(id, customer_type, service_time):
+    return SimpleNamespace(
+        id=id,
+        customer_type=customer_type,
+        arrival_time=1.0,
+        order_time=2.0,
+        cook_time=3.0,
+        service_time=service_time,
+        pickup_time=None,
+    )
+
+
+class TestTrace(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "trace")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        with TraceRecorder(self.path, run_number=4, buffer_size=2) as trace:
+            trace.record(finished_customer(1, "inhouse", 9.0))
+            trace.record(finished_customer(2, "foodapp", None))
+            trace.record(finished_customer(3, "inhouse", 12.0))
+
+        reader = TraceReader(self.path)
+        self.assertEqual(len(reader), 3)
+        self.assertEqual(list(reader["customer_id"]), [1, 2, 3])
+        self.assertEqual(list(reader["run_number"]), [4, 4, 4])
+        self.assertEqual(list(reader["customer_type"]), [0, 1, 0])
+        self.assertTrue(np.isnan(reader["service_time"][1]))
+        self.assertTrue(np.isnan(reader["pickup_time"]).all())
+        self.assertEqual(np.nanmean(reader.wait_times()), 9.5)
+
+    def test_columns_are_memory_mapped(self):
+        with TraceRecorder(self.path) as trace:
+            trace.record(finished_customer(1, "inhouse", 9.0))
+
+        self.assertIsInstance(TraceReader(self.path)["arrival_time"], np.memmap)
+
+    def test_recorder_replaces_existing_trace(self):
+        for run_number in (1, 2):
+            with TraceRecorder(self.path, run_number=run_number) as trace:
+                trace.record(finished_customer(1, "inhouse", 9.0))
+
+        self.assertEqual(list(TraceReader(self.path)["run_number"]), [2])
+
+    def test_simulation_traced_twice_is_not_doubled(self):
+        runner = SimulationRunner(Config())
+        for _ in range(2):
+            runner.run_multiple_simulations(num_runs=2, seed=1, trace_dir=self.path)
+        for run_number, reader in enumerate(open_run_traces(self.path), 1):
+            self.assertEqual(set(reader["run_number"]), {run_number})
+            self.assertEqual(len(set(reader["customer_id"])), len(reader))
+
+    def test_empty_trace(self):
+        TraceRecorder(self.path).close()
+        self.assertEqual(len(TraceReader(self.path)), 0)
+
+    def test_simulation_writes_one_trace_per_run(self):
+        # The trace keeps warm-up customers, so compare a run without one
+        config = Config()
+        config.warm_up_time = 0
+        runner = SimulationRunner(config)
+        all_metrics = runner.run_multiple_simulations(
+            num_runs=2, seed=1, trace_dir=self.path
+        )
+
+        traces = open_run_traces(self.path)
+        self.assertEqual(len(traces), 2)
+        for metrics, reader in zip(all_metrics, traces):
+            self.assertEqual(len(reader), metrics["total_customers_served"])
+            self.assertAlmostEqual(
+                float(np.nanmean(reader.wait_times())), metrics["average_wait_time"]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
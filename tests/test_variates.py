@@ -0,0 +1,97 @@
+import math
+import random
+import unittest
+
+import numpy as np
+
+from src.config import Config
+from src.random_streams import RandomStreams
+from src.variates import BlockSupply, Variates, parse_distribution, scalar_supply
+
+
+def mean_of(supply, draws=20000):
+    return sum(supply() for _ in range(draws)) / draws
+
+
+class TestParseDistribution(unittest.TestCase):
+    def test_default_uniform_matches_original_model(self):
+        distribution = parse_distribution("uniform", 5, 2 / math.sqrt(3))
+        self.assertEqual(distribution.half_width, 2.0)
+
+    def test_explicit_sd(self):
+        self.assertEqual(parse_distribution("gamma:1.5", 5, 1.0).sd, 1.5)
+
+    def test_exponential_sd_is_its_mean(self):
+        self.assertEqual(parse_distribution("exponential", 5, 1.0).sd, 5)
+
+    def test_rejects_unknown_distribution(self):
+        with self.assertRaises(ValueError):
+            parse_distribution("weibull", 5, 1.0)
+
+    def test_rejects_uniform_with_negative_durations(self):
+        with self.assertRaises(ValueError):
+            parse_distribution("uniform:3", 1, 1.0)
+
+
+class TestScalarSupply(unittest.TestCase):
+    def test_uniform_matches_random_uniform(self):
+        distribution = parse_distribution("uniform", 5, 2 / math.sqrt(3))
+        supply = scalar_supply(random.Random(3), distribution)
+        rng = random.Random(3)
+        for _ in range(5):
+            self.assertEqual(supply(), rng.uniform(3, 7))
+
+    def test_lognormal_and_gamma_have_the_configured_mean(self):
+        for spec in ("lognormal:2", "gamma:2"):
+            supply = scalar_supply(random.Random(3), parse_distribution(spec, 5, 1))
+            self.assertAlmostEqual(mean_of(supply), 5, delta=0.1)
+
+
+class TestBlockSupply(unittest.TestCase):
+    def supply(self, spec, block_size=64, antithetic=False, seed=5):
+        distribution = parse_distribution(spec, 5, 2 / math.sqrt(3))
+        generator = np.random.default_rng(seed)
+        return BlockSupply(generator, distribution, block_size, antithetic)
+
+    def test_refills_across_block_boundaries(self):
+        small = self.supply("exponential", block_size=3)
+        large = self.supply("exponential", block_size=100)
+        self.assertEqual([small() for _ in range(10)], [large() for _ in range(10)])
+
+    def test_distributions_have_the_configured_mean(self):
+        for spec in ("uniform", "exponential", "lognormal:2", "gamma:2"):
+            self.assertAlmostEqual(mean_of(self.supply(spec)), 5, delta=0.15)
+
+    def test_uniform_stays_in_range(self):
+        supply = self.supply("uniform")
+        self.assertTrue(all(3 <= supply() <= 7 for _ in range(1000)))
+
+    def test_antithetic_uniforms_mirror_the_mean(self):
+        plain = self.supply("uniform")
+        twin = self.supply("uniform", antithetic=True)
+        for _ in range(10):
+            self.assertAlmostEqual(plain() + twin(), 10)
+
+
+class TestVariates(unittest.TestCase):
+    def test_scalar_mode_draws_from_the_streams(self):
+        config = Config()
+        config.variate_block_size = 0
+        variates = Variates(RandomStreams(2), config)
+        self.assertEqual(variates.order_time(), RandomStreams(2).order.uniform(0, 4))
+
+    def test_same_seed_gives_same_variates(self):
+        first = Variates(RandomStreams(2), Config())
+        second = Variates(RandomStreams(2), Config())
+        self.assertEqual(first.cook_time(), second.cook_time())
+        self.assertEqual(first.interarrival(), second.interarrival())
+
+    def test_distribution_is_chosen_in_config(self):
+        config = Config()
+        config.cook_time_distribution = "gamma:1"
+        variates = Variates(RandomStreams(2), config)
+        self.assertAlmostEqual(mean_of(variates.cook_time), 5, delta=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import math
+import unittest
+
+import numpy as np
+
+from src.config import Config
+from src.estimation import confidence_interval
+from src.simulation import SimulationRunner
+from src.vectorized import VectorizedEngine, _fifo_station
+
+CROSS_CHECK_METRICS = [
+    "total_customers_served",
+    "average_wait_time",
+    "inhouse_customers",
+    "foodapp_customers",
+    "max_wait_time",
+    "kitchen_utilization",
+    "counter_utilization",
+    "driver_utilization",
+    "cook_average_queue",
+    "server_max_queue",
+]
+
+
+class TestFifoStation(unittest.TestCase):
+    def test_single_server_matches_lindley_recursion(self):
+        arrivals = np.array([[0.0, 1.0, 2.0, 10.0]])
+        durations = np.array([[3.0, 3.0, 3.0, 1.0]])
+        starts, ends = _fifo_station(arrivals, durations, 1)
+        np.testing.assert_allclose(starts, [[0.0, 3.0, 6.0, 10.0]])
+        np.testing.assert_allclose(ends, [[3.0, 6.0, 9.0, 11.0]])
+
+    def test_unsorted_arrivals_are_served_in_arrival_order(self):
+        arrivals = np.array([[2.0, 0.0, np.inf, 1.0]])
+        durations = np.array([[1.0, 4.0, 1.0, 1.0]])
+        starts, _ = _fifo_station(arrivals, durations, 2)
+        np.testing.assert_allclose(starts, [[2.0, 0.0, np.inf, 1.0]])
+
+    def test_release_holds_the_server(self):
+        arrivals = np.array([[0.0, 1.0]])
+        release = np.array([[5.0, 6.0]])
+        _, ends = _fifo_station(arrivals, np.zeros((1, 2)), 1, release=release)
+        np.testing.assert_allclose(ends, [[5.0, 6.0]])
+
+
+class TestVectorizedEngine(unittest.TestCase):
+    def test_metrics_have_the_simpy_keys(self):
+        config = Config()
+        simpy_metrics = SimulationRunner(config).run_multiple_simulations(1, seed=3)
+        vector_metrics = VectorizedEngine(config).run_replications(3, [1])
+        self.assertEqual(set(vector_metrics[0]), set(simpy_metrics[0]))
+
+    def test_same_seed_gives_same_results(self):
+        engine = VectorizedEngine(Config())
+        self.assertEqual(
+            engine.run_replications(8, [1, 2, 3]),
+            engine.run_replications(8, [1, 2, 3]),
+        )
+
+    def test_runs_do_not_depend_on_the_batch(self):
+        engine = VectorizedEngine(Config())
+        together = engine.run_replications(8, [1, 2, 3])
+        alone = engine.run_replications(8, [2])
+        self.assertEqual(together[1], alone[0])
+
+    def test_warm_up_matches_simpy_counts(self):
+        # Arrivals are identical in block mode, so are the customers counted
+        config = Config()
+        config.interarrival_time = 20
+        config.warm_up_time = 200
+        simpy_metrics = SimulationRunner(config).run_multiple_simulations(1, seed=4)
+        vector_metrics = VectorizedEngine(config).run_replications(4, [1])
+        self.assertEqual(vector_metrics[0]["warm_up_time"], 200)
+        self.assertLess(
+            abs(
+                vector_metrics[0]["total_customers_served"]
+                - simpy_metrics[0]["total_customers_served"]
+            ),
+            3,
+        )
+
+    def test_runner_engine_option(self):
+        runner = SimulationRunner(Config(), engine="vectorized")
+        all_metrics = runner.run_multiple_simulations(4, seed=1)
+        self.assertEqual([m["run_number"] for m in all_metrics], [1, 2, 3, 4])
+
+    def test_rejects_admission_control(self):
+        config = Config()
+        config.admission_control = True
+        with self.assertRaises(ValueError):
+            VectorizedEngine(config).run_replications(1, [1])
+        config = Config()
+        config.patience = 5
+        with self.assertRaises(ValueError):
+            VectorizedEngine(config).run_replications(1, [1])
+
+    def test_runner_rejects_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            SimulationRunner(Config(), engine="warp")
+
+
+class TestCrossValidation(unittest.TestCase):
+    """The vectorized engine agrees statistically with the SimPy model."""
+
+    def assert_engines_agree(self, config, simpy_runs=60, vector_runs=600):
+        simpy_metrics = SimulationRunner(config).run_multiple_simulations(
+            simpy_runs, seed=11
+        )
+        vector_metrics = VectorizedEngine(config).run_replications(
+            12, range(1, vector_runs + 1)
+        )
+        for metric in CROSS_CHECK_METRICS:
+            simpy_mean, simpy_hw = confidence_interval(
+                [m[metric] for m in simpy_metrics], 0.999
+            )
+            vector_mean, vector_hw = confidence_interval(
+                [m[metric] for m in vector_metrics], 0.999
+            )
+            self.assertLess(
+                abs(simpy_mean - vector_mean),
+                math.hypot(simpy_hw, vector_hw),
+                f"{metric}: simpy {simpy_mean:.3f}, vectorized {vector_mean:.3f}",
+            )
+
+    def test_default_config(self):
+        self.assert_engines_agree(Config())
+
+    def test_busy_kitchen_with_extra_staff(self):
+        config = Config()
+        config.interarrival_time = 2.5
+        config.kitchen_servers = 3
+        config.counter_servers = 2
+        self.assert_engines_agree(config)
+
+    def test_scarce_drivers_and_exponential_cooking(self):
+        config = Config()
+        config.interarrival_time = 3
+        config.driver_capacity = 1
+        config.cook_time_distribution = "exponential"
+        self.assert_engines_agree(config)
+
+
+if __name__ == "__main__":
+    unittest.main()